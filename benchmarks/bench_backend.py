@@ -0,0 +1,53 @@
+"""Created on Sat Oct 17 2026 09:33.
+
+@author: Nathan Budd
+
+Benchmark the numba backend against the NumPy code paths of the row-wise
+kernels. Requires numba.
+
+Run from the directory containing the package:
+    python -m orbital_mechanics.benchmarks.bench_backend
+"""
+import timeit
+import numpy as np
+import numpy.random as npr
+from .. import orbit as orb
+from ..dynamics.utilities import GaussVariationalEqns
+
+
+def main(m=100000, repeat=5):
+    """Print the states per second of each kernel under both backends."""
+    p = npr.rand(m, 1) * 10 + .5
+    e = npr.rand(m, 1) * .9
+    i = npr.rand(m, 1) * np.pi
+    angles = npr.rand(m, 3) * 2*np.pi
+    COE = np.concatenate((p, e, i, angles), 1)
+    MEE = orb.coe2mee(COE)
+    RV = orb.coe2rv(COE)
+    A = npr.randn(m, 3)
+
+    cases = [('rv2mee', lambda: orb.rv2mee(RV)),
+             ('mee2rv', lambda: orb.mee2rv(MEE)),
+             ('euler_sequence', lambda: orb.euler_sequence(
+                 [3, 1, 3], COE[0:, 3:4], COE[0:, 2:3], COE[0:, 4:5]))]
+    for element_set, X in [('coe', COE), ('mee', MEE), ('rv', RV)]:
+        gve = GaussVariationalEqns(1., element_set)
+        cases += [('gve ' + element_set, lambda gve=gve, X=X: gve(X)),
+                  ('gve rates ' + element_set,
+                   lambda gve=gve, X=X: gve.rates(X, A))]
+
+    print('batch size: {}'.format(m))
+    print('{:>16} {:>12} {:>12} {:>8}'.format(
+        'kernel', 'numpy/s', 'numba/s', 'speedup'))
+    for name, func in cases:
+        times = []
+        for backend in ['numpy', 'numba']:
+            orb.set_backend(backend)
+            func()
+            times.append(min(timeit.repeat(func, number=1, repeat=repeat)))
+        print('{:>16} {:>12.0f} {:>12.0f} {:>8.2f}'.format(
+            name, m/times[0], m/times[1], times[0]/times[1]))
+
+
+if __name__ == '__main__':
+    main()
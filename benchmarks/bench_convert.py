@@ -0,0 +1,62 @@
+"""Created on Sat Oct 17 2026 09:23.
+
+@author: Nathan Budd
+
+Benchmark the fused element conversions against the chains they replace,
+and ElementBatch storage against mx6 arrays.
+
+Run from the directory containing the package:
+    python -m orbital_mechanics.benchmarks.bench_convert
+"""
+import timeit
+import numpy as np
+import numpy.random as npr
+from .. import orbit as orb
+
+
+def main(m=100000, repeat=5):
+    """Print the states per second of fused and chained conversions."""
+    p = npr.rand(m, 1) * 10 + .5
+    e = npr.rand(m, 1) * .9
+    i = npr.rand(m, 1) * np.pi
+    angles = npr.rand(m, 3) * 2*np.pi
+    COE = np.concatenate((p, e, i, angles), 1)
+
+    cases = [('coe -> rv', lambda: orb.coe2rv(COE),
+              lambda: orb.mee2rv(orb.coe2mee(COE))),
+             ('f -> M', lambda: orb.f2M(COE),
+              lambda: orb.E2M(orb.f2E(COE))),
+             ('M -> f', lambda: orb.M2f(COE),
+              lambda: orb.E2f(orb.M2E(COE))),
+             ('convert coe -> rv', lambda: orb.convert(COE, 'coe', 'rv'),
+              lambda: orb.mee2rv(orb.coe2mee(COE)))]
+
+    print('batch size: {}'.format(m))
+    print('{:>18} {:>14} {:>14} {:>8}'.format('conversion', 'fused/s',
+                                              'chained/s', 'speedup'))
+    for name, fused, chained in cases:
+        t_fused = min(timeit.repeat(fused, number=3, repeat=repeat)) / 3
+        t_chained = min(timeit.repeat(chained, number=3, repeat=repeat)) / 3
+        print('{:>18} {:>14.0f} {:>14.0f} {:>8.2f}'.format(
+            name, m/t_fused, m/t_chained, t_chained/t_fused))
+
+    batch = orb.ElementBatch.from_array(COE, 'coe')
+    RV = np.empty(COE.shape)
+    RV_batch = orb.ElementBatch.empty(m, 'rv')
+    cases = [('coe -> rv', lambda: batch.convert('rv', out=RV_batch),
+              lambda: orb.coe2rv(COE, out=RV)),
+             ('coe -> mee', lambda: orb.coe2mee(batch),
+              lambda: orb.coe2mee(COE)),
+             ('M -> f', lambda: orb.M2f(batch), lambda: orb.M2f(COE))]
+
+    print('\n{:>18} {:>14} {:>14} {:>8}'.format('conversion', 'batch/s',
+                                                'array/s', 'speedup'))
+    for name, soa, aos in cases:
+        t_soa = min(timeit.repeat(soa, number=3, repeat=repeat)) / 3
+        t_aos = min(timeit.repeat(aos, number=3, repeat=repeat)) / 3
+        print('{:>18} {:>14.0f} {:>14.0f} {:>8.2f}'.format(
+            name, m/t_soa, m/t_aos, t_aos/t_soa))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Created on Sat Oct 17 2026 09:35.
+
+@author: Nathan Budd
+
+Benchmark out-of-core conversion of a .npy catalog: throughput and peak
+traced memory for several chunk sizes, against converting in memory.
+
+Run from the directory containing the package:
+    python -m orbital_mechanics.benchmarks.bench_convert_npy
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import numpy.random as npr
+from .. import orbit as orb
+
+
+def main(m=2000000, src='coe', dst='rv'):
+    """Print rows per second and peak memory of each chunk size."""
+    p = npr.rand(m, 1) * 10 + .5
+    e = npr.rand(m, 1) * .9
+    i = npr.rand(m, 1) * np.pi
+    angles = npr.rand(m, 3) * 2*np.pi
+    X = orb.convert(np.concatenate((p, e, i, angles), 1), 'coe', src)
+    del p, e, i, angles
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src_path = os.path.join(tmp, src + '.npy')
+        dst_path = os.path.join(tmp, dst + '.npy')
+        np.save(src_path, X)
+        catalog_MB = X.nbytes / 1e6
+        del X
+
+        print('catalog: {} rows, {:.0f} MB, {} -> {}'.format(
+            m, catalog_MB, src, dst))
+        print('{:>12} {:>12} {:>14}'.format(
+            'chunk rows', 'rows/s', 'peak MB'))
+        for chunk_rows in [None, 1000000, 100000, 10000]:
+            tracemalloc.start()
+            t = time.perf_counter()
+            if chunk_rows is None:
+                Y = orb.convert(np.load(src_path), src, dst)
+                np.save(dst_path, Y)
+            else:
+                Y = orb.convert_npy(src_path, dst_path, src, dst,
+                                    chunk_rows=chunk_rows)
+            t = time.perf_counter() - t
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del Y
+
+            print('{:>12} {:>12.0f} {:>14.1f}'.format(
+                'in memory' if chunk_rows is None else chunk_rows,
+                m/t, peak/1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Created on Sat Oct 17 2026 09:29.
+
+@author: Nathan Budd
+
+Benchmark element conversions in float32 against float64: throughput, the
+memory of the input and output arrays, and the largest float32 error.
+
+Run from the directory containing the package:
+    python -m orbital_mechanics.benchmarks.bench_precision
+"""
+import timeit
+import numpy as np
+import numpy.random as npr
+from .. import orbit as orb
+
+
+def sample(m):
+    """Random elliptic COE away from the MEE and COE singularities."""
+    p = npr.rand(m, 1) * 10 + .5
+    e = npr.rand(m, 1) * .85 + .05
+    i = npr.rand(m, 1) * (np.pi - .2) + .1
+    angles = npr.rand(m, 3) * 2*np.pi
+    return np.concatenate((p, e, i, angles), 1)
+
+
+def error(Y32, Y64, element_set):
+    """Largest float32 error: relative for rv, absolute (rad) for angles."""
+    dY = Y32.astype(np.float64) - Y64
+    if element_set == 'rv':
+        r = np.linalg.norm(Y64[0:, 0:3], axis=1)
+        v = np.linalg.norm(Y64[0:, 3:6], axis=1)
+        return max(np.max(np.linalg.norm(dY[0:, 0:3], axis=1) / r),
+                   np.max(np.linalg.norm(dY[0:, 3:6], axis=1) / v))
+    angle_idx = [5] if element_set == 'mee' else [2, 3, 4, 5]
+    dY[0:, angle_idx] = np.mod(dY[0:, angle_idx] + np.pi, 2*np.pi) - np.pi
+    dY[0:, 0] /= Y64[0:, 0]
+    return np.max(np.fabs(dY))
+
+
+def main(m=1000000, repeat=3):
+    """Print throughput, memory and accuracy of each conversion path."""
+    COE = sample(m)
+    paths = [('coe', 'mee'), ('mee', 'coe'), ('mee', 'rv'), ('rv', 'mee'),
+             ('coe', 'rv'), ('rv', 'coe'), ('coe', 'coe_E'),
+             ('coe_E', 'coe'), ('coe', 'coe_M'), ('coe_M', 'coe')]
+
+    print('batch size: {}'.format(m))
+    print('{:>16} {:>12} {:>12} {:>8} {:>10} {:>10}'.format(
+        'path', 'f64 rows/s', 'f32 rows/s', 'speedup', 'MB f64/f32',
+        'f32 error'))
+    for src, dst in paths:
+        X64 = orb.convert(COE, 'coe', src)
+        X32 = X64.astype(np.float32)
+        Y64 = orb.convert(X64, src, dst)
+        Y32 = orb.convert(X32, src, dst)
+
+        t64 = min(timeit.repeat(lambda: orb.convert(X64, src, dst),
+                                number=1, repeat=repeat))
+        t32 = min(timeit.repeat(lambda: orb.convert(X32, src, dst),
+                                number=1, repeat=repeat))
+        MB = '{:.0f}/{:.0f}'.format((X64.nbytes + Y64.nbytes)/1e6,
+                                    (X32.nbytes + Y32.nbytes)/1e6)
+        print('{:>16} {:>12.0f} {:>12.0f} {:>8.2f} {:>10} {:>10.1e}'.format(
+            src + ' -> ' + dst, m/t64, m/t32, t64/t32, MB,
+            error(Y32, Y64, dst)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Created on Sat Oct 17 2026 07:48.
+
+@author: Nathan Budd
+
+Benchmark SphericalHarmonicGravity evaluations per second against degree.
+
+Run from the directory containing the package:
+    python -m orbital_mechanics.benchmarks.bench_spherical_harmonic_gravity
+"""
+import timeit
+import numpy as np
+import numpy.random as npr
+from ..dynamics import SphericalHarmonicGravity
+
+
+def kaula_field(degree):
+    """Random normalized coefficients following Kaula's rule, 1e-5/n**2."""
+    n = np.arange(degree+1).reshape((-1, 1))
+    sigma = 1e-5 / np.maximum(n, 1)**2
+    C = np.tril(npr.randn(degree+1, degree+1)) * sigma
+    S = np.tril(npr.randn(degree+1, degree+1)) * sigma
+    S[0:, 0] = 0.
+    C[0, 0] = 1.
+    return C, S
+
+
+def main(m=1000, degrees=(2, 4, 8, 16, 32, 64, 128), repeat=5):
+    """Print the evaluations per second of an mx3 batch of positions."""
+    R = npr.randn(m, 3)
+    R = R / np.linalg.norm(R, axis=1, keepdims=True) * (1. + .2*npr.rand(
+        m, 1))
+
+    print('batch size: {}'.format(m))
+    print('{:>8} {:>14} {:>16}'.format('degree', 'calls/s', 'states/s'))
+    for degree in degrees:
+        harmonic = SphericalHarmonicGravity(*kaula_field(degree))
+        number = max(1, 200 // degree)
+        t = min(timeit.repeat(lambda: harmonic.body_acceleration(R),
+                              number=number, repeat=repeat)) / number
+        print('{:>8} {:>14.1f} {:>16.0f}'.format(degree, 1./t, m/t))
+
+
+if __name__ == '__main__':
+    main()
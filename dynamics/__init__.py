@@ -1,5 +1,8 @@
+from .encke import Encke
+from .gravity_grid import GravityGrid
 from .lyapunov_element_steering import LyapunovElementSteering
 from .proportional_element_control import ProportionalElementControl
+from .spherical_harmonic_gravity import SphericalHarmonicGravity
 from .thrust_constant import ThrustConstant
 from .two_body import TwoBody
 from .zonal_gravity import ZonalGravity
@@ -0,0 +1,162 @@
+"""Created on Sat Oct 17 2026 08:12.
+
+@author: Nathan Budd
+"""
+import numpy as np
+import numpy.linalg as npl
+from ..orbit import propagate_rv
+
+
+class Encke():
+    """
+    Encke deviation dynamics about osculating two-body conics.
+
+    Every row of the state, Y = [dr dv r0 v0 t0] (mx13), holds the deviation
+    of the true inertial state from the two-body conic through the reference
+    state [r0 v0] at the epoch t0. Only the deviation has nonzero rates, so
+    rows are independent of each other and may be propagated by any batched
+    integrator. The deviation obeys
+
+        dr'' = mu/rho**3 * (F(q)*r - dr) + a_p
+
+    where rho is the reference and r = rho + dr the true position, a_p is the
+    perturbing acceleration and F(q) = 1 - rho**3/r**3 is evaluated with
+    Battin's series-free form to avoid cancellation.
+
+    Members
+    -------
+    mu : float
+        Standard gravitational parameter
+    perturbations : callable or list of callables
+        Evaluated in RV elements, e.g. ZonalGravity(elements='rv'); their
+        last three rates are the inertial perturbing accelerations.
+    tol : float
+        Deviation, relative to the reference radius, beyond which propagate
+        rectifies a row onto a new osculating conic.
+    rectifications : int
+        Rectifications of all rows during the most recent propagate.
+    Ydot : ndarray
+        The most recently computed call output
+    """
+
+    def __init__(self, mu, perturbations=None, tol=1e-2):
+        """."""
+        self.mu = mu
+        self.perturbations = perturbations
+        self.tol = tol
+        self.rectifications = 0
+        self.Ydot = np.array([[]])
+
+    def state(self, T, RV):
+        """Encke states with zero deviation from the conics through RV.
+
+        Parameters
+        ----------
+        T : ndarray
+            An mx1 column array of epochs.
+        RV : ndarray
+            An mx6 array of inertial states.
+
+        Returns
+        -------
+        Y : ndarray
+            An mx13 array of Encke states.
+        """
+        return np.concatenate((np.zeros(RV.shape), RV, T), 1)
+
+    def reference(self, T, Y):
+        """Reference conic states, mx6, at the times T."""
+        return propagate_rv(Y[0:, 6:12], T - Y[0:, 12:13], self.mu)
+
+    def rv(self, T, Y):
+        """True inertial states, mx6, at the times T."""
+        return self.reference(T, Y) + Y[0:, 0:6]
+
+    def deviation(self, T, Y):
+        """Position deviations relative to the reference radius, mx1."""
+        rho = npl.norm(self.reference(T, Y)[0:, 0:3], ord=2, axis=1)
+        return (npl.norm(Y[0:, 0:3], ord=2, axis=1) / rho).reshape((-1, 1))
+
+    def __call__(self, T, Y):
+        """Evaluate the Encke state derivatives.
+
+        Parameters
+        ----------
+        T : ndarray
+            An mx1 column array of times.
+        Y : ndarray
+            An mx13 array of Encke states.
+
+        Returns
+        -------
+        Ydot : ndarray
+            An mx13 array of Encke state derivatives.
+        """
+        RV_ref = self.reference(T, Y)
+        D = Y[0:, 0:3]
+        RV = RV_ref + Y[0:, 0:6]
+        R = RV[0:, 0:3]
+
+        rho = npl.norm(RV_ref[0:, 0:3], ord=2, axis=1).reshape((-1, 1))
+        r2 = np.einsum('ij,ij->i', R, R).reshape((-1, 1))
+        q = np.einsum('ij,ij->i', D, D - 2.*R).reshape((-1, 1)) / r2
+        F = -q*(3. + 3.*q + q**2) / (1. + (1. + q)**1.5)
+
+        Ydot = np.zeros(Y.shape)
+        Ydot[0:, 0:3] = Y[0:, 3:6]
+        Ydot[0:, 3:6] = self.mu/rho**3 * (F*R - D)
+
+        if self.perturbations is not None:
+            if isinstance(self.perturbations, list):
+                for perturb in self.perturbations:
+                    Ydot[0:, 3:6] += perturb(T, RV)[0:, 3:6]
+            else:
+                Ydot[0:, 3:6] += self.perturbations(T, RV)[0:, 3:6]
+
+        self.Ydot = Ydot
+        return Ydot
+
+    def propagate(self, integrator, T0, RV0, tf):
+        """Propagate inertial states, rectifying large deviations.
+
+        After every accepted step, rows whose deviation exceeds tol continue
+        from a new osculating conic through their true state.
+
+        Parameters
+        ----------
+        integrator : object
+            A batched integrator of these dynamics, e.g. DormandPrince(self),
+            whose propagate(T0, X0, tf, reset=...) behaves as DormandPrince's.
+        T0 : ndarray
+            An mx1 column array of initial times, or a scalar.
+        RV0 : ndarray
+            An mx6 array of initial inertial states.
+        tf : ndarray
+            An mx1 column array of final times, or a scalar.
+
+        Returns
+        -------
+        RV : ndarray
+            An mx6 array of inertial states at tf.
+        """
+        RV0 = np.array(RV0, dtype=float)
+        T0 = np.array(np.broadcast_to(T0, (RV0.shape[0], 1)), dtype=float)
+        self.rectifications = 0
+
+        def rectify(T, Y):
+            mask = self.deviation(T, Y)[0:, 0] > self.tol
+            self.rectifications += np.count_nonzero(mask)
+            return mask, self.state(T[mask], self.rv(T[mask], Y[mask]))
+
+        Y = integrator.propagate(T0, self.state(T0, RV0), tf, reset=rectify)
+        return self.rv(integrator.T, Y)
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'Encke({}, {}, {})'.format(self.mu, self.perturbations,
+                                          self.tol)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'Encke(mu={}, perturbations={}, tol={})'.format(
+            self.mu, self.perturbations, self.tol)
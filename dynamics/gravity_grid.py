@@ -0,0 +1,388 @@
+"""Created on Sat Oct 17 2026 07:53.
+
+@author: Nathan Budd
+"""
+import json
+import warnings
+import numpy as np
+import numpy.random as npr
+from ..orbit import coe2rv
+from ..orbit import mee2rv
+from ..orbit import euler_rotate
+from .utilities import GaussVariationalEqns
+from .utilities import perturbation_rates
+
+
+class GravityGrid():
+    """
+    Gravity perturbations interpolated from a precomputed acceleration grid.
+
+    Accelerations of a gravity model are tabulated on spherical shells, with
+    nodes uniform in log radius, latitude and longitude, and are interpolated
+    trilinearly. They are stored in local up, east, north components, which
+    do not vary with longitude for a zonal field, and scaled by
+    (r/r_min)**4 to remove the radial falloff of the degree 2 terms. The grid
+    can be written to a .npy file and memory-mapped by any number of
+    processes. Interpolation costs about as much as a degree 6 field, so the
+    grid pays off for high degree models.
+
+    Members
+    -------
+    values : ndarray
+        (n_r)x(n_lat)x(n_lon)x3 array of scaled local up, east, north
+        accelerations, read-only when built or loaded.
+    r_min : float
+        Radius of the innermost shell.
+    r_max : float
+        Radius of the outermost shell.
+    mu : float
+        Standard gravitational parameter.
+    elements : string
+        Indicates the element set being used as input and output. Allowable
+        values include: 'coe', 'mee', 'rv'.
+    omega : float
+        Rotation rate of the body-fixed frame.
+    theta0 : float
+        Rotation angle of the body-fixed frame at T = 0.
+    sampled_error : float
+        Largest difference from the model found at random check points when
+        the grid was built. An estimate of the interpolation error, not a
+        bound.
+    model : object or None
+        Gravity model used for positions outside the shells, if any.
+    Xdot : ndarray
+        The most recently computed call output
+    """
+
+    toRV = {'coe': coe2rv, 'mee': mee2rv, 'rv': np.asarray}
+    uses_context = True
+    accepts_out = True
+
+    def __init__(self, values, r_min, r_max, mu=1., elements='coe', omega=0.,
+                 theta0=0., sampled_error=np.nan, model=None):
+        """."""
+        self.values = values
+        self.r_min = r_min
+        self.r_max = r_max
+        self.mu = mu
+        self.elements = elements
+        self.omega = omega
+        self.theta0 = theta0
+        self.sampled_error = sampled_error
+        self.model = model
+        self.gve = GaussVariationalEqns(mu, elements)
+        self.Xdot = np.array([[]])
+
+    @classmethod
+    def build(cls, model, r_min, r_max, shape=(16, 91, 180), tol=None,
+              max_refine=4, max_nodes=2**23, path=None, samples=1000):
+        """
+        Tabulate a gravity model on spherical shells.
+
+        If tol is given, the number of nodes along each of the radial,
+        latitude and longitude axes is doubled until the interpolation error
+        along that axis, estimated at the midpoints of random cells, is below
+        tol/3. Refinement stops with a RuntimeWarning if max_refine doublings
+        have been made or the next grid would exceed max_nodes nodes. The
+        estimates are sampled, so tol is not a guaranteed bound.
+
+        Parameters
+        ----------
+        model : object
+            Gravity model with a body_acceleration(R) method, and mu and
+            elements members, e.g. ZonalGravity or SphericalHarmonicGravity.
+        r_min, r_max : float
+            Radii of the innermost and outermost shells.
+        shape : tuple of ints
+            Initial number of radial, latitude and longitude nodes.
+        tol : float, optional
+            Target for the sampled interpolation error of the acceleration.
+        max_refine : int
+            Maximum number of doublings of each axis.
+        max_nodes : int
+            Maximum number of grid nodes, each taking 24 bytes.
+        path : string, optional
+            .npy file to write the grid to, see save.
+        samples : int
+            Number of random check points for the error estimates.
+
+        Returns
+        -------
+        GravityGrid
+        """
+        shape = list(shape)
+        for _ in range(max_refine + 1):
+            grid = cls(cls._tabulate(model, r_min, r_max, shape), r_min,
+                       r_max, model.mu, model.elements,
+                       getattr(model, 'omega', 0.),
+                       getattr(model, 'theta0', 0.), model=model)
+            if tol is None:
+                break
+            refine = np.flatnonzero(grid._axis_error(samples) > tol/3.)
+            if not refine.size:
+                break
+            for axis in refine:
+                shape[axis] = 2*shape[axis] - (axis < 2)
+            if np.prod(shape) > max_nodes:
+                break
+
+        R = grid._random_positions(samples)
+        grid.sampled_error = np.max(np.absolute(grid.body_acceleration(R) -
+                                                model.body_acceleration(R)))
+        if tol is not None and refine.size:
+            warnings.warn('GravityGrid: sampled error {} above tol {} on a '
+                          '{} grid'.format(grid.sampled_error, tol,
+                                           grid.values.shape[0:3]),
+                          RuntimeWarning)
+
+        if path is not None:
+            grid.save(path)
+            grid = cls.load(path, model)
+        return grid
+
+    @classmethod
+    def load(cls, path, model=None):
+        """
+        Memory-map a grid written by save.
+
+        Parameters
+        ----------
+        path : string
+            .npy file of the grid. Its metadata is read from path + '.json'.
+        model : object, optional
+            Gravity model used for positions outside the shells.
+
+        Returns
+        -------
+        GravityGrid
+        """
+        with open(path + '.json') as metadata_file:
+            metadata = json.load(metadata_file)
+        values = np.load(path, mmap_mode='r')
+        return cls(values, model=model, **metadata)
+
+    def save(self, path):
+        """
+        Write the grid to a .npy file and its metadata to path + '.json'.
+
+        Parameters
+        ----------
+        path : string
+            .npy file to write.
+        """
+        values = np.lib.format.open_memmap(path, mode='w+',
+                                           shape=self.values.shape)
+        values[...] = self.values
+        values.flush()
+        del values
+
+        metadata = dict(r_min=self.r_min, r_max=self.r_max, mu=self.mu,
+                        elements=self.elements, omega=self.omega,
+                        theta0=self.theta0,
+                        sampled_error=float(self.sampled_error))
+        with open(path + '.json', 'w') as metadata_file:
+            json.dump(metadata, metadata_file)
+
+    @staticmethod
+    def _tabulate(model, r_min, r_max, shape):
+        """Evaluate the model at the grid nodes, one shell at a time."""
+        n_r, n_lat, n_lon = shape
+        r = np.exp(np.linspace(np.log(r_min), np.log(r_max), n_r))
+        lat = np.linspace(-np.pi/2, np.pi/2, n_lat).reshape((-1, 1))
+        lon = np.linspace(0., 2*np.pi, n_lon, endpoint=False)
+        unit = np.stack((np.cos(lat)*np.cos(lon),
+                         np.cos(lat)*np.sin(lon),
+                         np.sin(lat)*np.ones(lon.shape)), 2).reshape((-1, 3))
+
+        values = np.zeros((n_r, n_lat, n_lon, 3))
+        for i, r_i in enumerate(r):
+            a = model.body_acceleration(r_i*unit) * (r_i/r_min)**4
+            values[i] = GravityGrid._to_local(unit, a).reshape(
+                (n_lat, n_lon, 3))
+        values.flags.writeable = False
+        return values
+
+    @staticmethod
+    def _local_basis(R):
+        """Local up, east and north unit vectors of mx3 positions."""
+        rho = np.hypot(R[0:, 0], R[0:, 1])
+        r = np.hypot(rho, R[0:, 2])
+        lon = np.arctan2(R[0:, 1], R[0:, 0])
+        c_lon = np.cos(lon)
+        s_lon = np.sin(lon)
+        c_lat = (rho/r).reshape((-1, 1))
+        s_lat = (R[0:, 2]/r).reshape((-1, 1))
+
+        up = R / r.reshape((-1, 1))
+        east = np.stack((-s_lon, c_lon, np.zeros(lon.shape)), 1)
+        north = np.concatenate((-s_lat*c_lon.reshape((-1, 1)),
+                                -s_lat*s_lon.reshape((-1, 1)), c_lat), 1)
+        return up, east, north
+
+    @staticmethod
+    def _to_local(R, a):
+        """Rotate mx3 body-fixed vectors into local up, east, north."""
+        up, east, north = GravityGrid._local_basis(R)
+        return np.stack((np.einsum('ij,ij->i', up, a),
+                         np.einsum('ij,ij->i', east, a),
+                         np.einsum('ij,ij->i', north, a)), 1)
+
+    @staticmethod
+    def _from_local(R, a):
+        """Rotate mx3 local up, east, north vectors into the body frame."""
+        up, east, north = GravityGrid._local_basis(R)
+        return up*a[0:, 0:1] + east*a[0:, 1:2] + north*a[0:, 2:3]
+
+    def _random_positions(self, samples):
+        """Random body-fixed positions between the innermost and outer
+        shells."""
+        R = npr.randn(samples, 3)
+        r = np.exp(npr.uniform(np.log(self.r_min), np.log(self.r_max),
+                               (samples, 1)))
+        return R / np.linalg.norm(R, axis=1, keepdims=True) * r
+
+    def _coordinates(self, R):
+        """Fractional grid indices of body-fixed positions, each length m."""
+        n_r, n_lat, n_lon = self.values.shape[0:3]
+        r = np.linalg.norm(R, axis=1)
+        u_r = ((np.log(r) - np.log(self.r_min)) /
+               (np.log(self.r_max) - np.log(self.r_min)) * (n_r - 1))
+        u_lat = (np.arcsin(np.clip(R[0:, 2]/r, -1., 1.)) + np.pi/2) / (
+            np.pi / (n_lat - 1))
+        u_lon = np.mod(np.arctan2(R[0:, 1], R[0:, 0]), 2*np.pi) / (
+            2*np.pi / n_lon)
+        return u_r, u_lat, u_lon
+
+    def _interpolate(self, u_r, u_lat, u_lon):
+        """Trilinear interpolation of the stored values at fractional grid
+        indices."""
+        n_r, n_lat, n_lon = self.values.shape[0:3]
+        i = np.clip(np.floor(u_r).astype(int), 0, n_r - 2)
+        j = np.clip(np.floor(u_lat).astype(int), 0, n_lat - 2)
+        k = np.floor(u_lon).astype(int)
+        t_r = (u_r - i).reshape((-1, 1))
+        t_lat = (u_lat - j).reshape((-1, 1))
+        t_lon = (u_lon - k).reshape((-1, 1))
+        k = k % n_lon
+        k1 = (k + 1) % n_lon
+
+        flat = self.values.reshape((-1, 3))
+        a = np.zeros((u_r.size, 3))
+        for di, w_r in ((0, 1. - t_r), (1, t_r)):
+            for dj, w_lat in ((0, 1. - t_lat), (1, t_lat)):
+                w = w_r * w_lat
+                row = ((i + di)*n_lat + j + dj)*n_lon
+                a += w*(1. - t_lon) * flat[row + k] + w*t_lon * flat[row + k1]
+        return a
+
+    def _unscale(self, R, a):
+        """Rotate interpolated values into the body frame and undo the
+        radial scaling."""
+        r = np.linalg.norm(R, axis=1, keepdims=True)
+        return self._from_local(R, a) * (self.r_min/r)**4
+
+    def _axis_error(self, samples):
+        """Interpolation error at midpoints along each axis of random
+        cells."""
+        n = np.array(self.values.shape[0:3])
+        cells = [npr.randint(0, n_d - (d < 2), samples)
+                 for d, n_d in enumerate(n)]
+
+        axis_error = np.zeros(3)
+        for d in range(3):
+            u = [c.astype(float) for c in cells]
+            u[d] = u[d] + .5
+            log_r = np.log(self.r_min) + u[0] / (n[0] - 1) * (
+                np.log(self.r_max) - np.log(self.r_min))
+            lat = u[1] * np.pi / (n[1] - 1) - np.pi/2
+            lon = u[2] * 2*np.pi / n[2]
+            R = np.exp(log_r).reshape((-1, 1)) * np.stack(
+                (np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon),
+                 np.sin(lat)), 1)
+            axis_error[d] = np.max(np.absolute(
+                self._unscale(R, self._interpolate(*u)) -
+                self.model.body_acceleration(R)))
+        return axis_error
+
+    def body_acceleration(self, R):
+        """
+        Interpolate the perturbing acceleration in the body-fixed frame.
+
+        Positions outside the shells are passed to the model, if one is
+        attached.
+
+        Parameters
+        ----------
+        R : ndarray
+            mx3 array of body-fixed positions.
+
+        Returns
+        -------
+        a_body : ndarray
+            mx3 array of body-fixed accelerations.
+        """
+        a = self._unscale(R, self._interpolate(*self._coordinates(R)))
+
+        r = np.linalg.norm(R, axis=1)
+        outside = (r < self.r_min) | (r > self.r_max)
+        if outside.any():
+            if self.model is None:
+                raise ValueError('GravityGrid: {} positions lie outside the '
+                                 'shells and no model is attached'.format(
+                                     np.count_nonzero(outside)))
+            a[outside] = self.model.body_acceleration(R[outside])
+        return a
+
+    def acceleration(self, T, R):
+        """
+        Interpolate the perturbing acceleration in the inertial frame.
+
+        Parameters
+        ----------
+        T : ndarray
+            mx1 array of times.
+        R : ndarray
+            mx3 array of inertial positions.
+
+        Returns
+        -------
+        a_eci : ndarray
+            mx3 array of inertial accelerations.
+        """
+        if self.omega == 0. and self.theta0 == 0.:
+            return self.body_acceleration(R)
+
+        theta = self.theta0 + self.omega*T
+        R_body = euler_rotate([3], R, theta)
+        a_body = self.body_acceleration(R_body)
+        return euler_rotate([3], a_body, -theta, out=a_body)
+
+    def __call__(self, T, X, ctx=None, out=None):
+        """Output indicated element derivatives resulting from the grid.
+
+        See dynamics_abstract.py for more details. The inertial state and
+        LVLH basis are taken from ctx, a shared StateContext, when given. The
+        result is placed in out, an mxn array, when given.
+        """
+        if ctx is None:
+            RV = self.toRV[self.elements](X)
+            a_eci = self.acceleration(T, RV[0:, 0:3])
+            self.Xdot = perturbation_rates(self.gve, X, RV, a_eci, out=out)
+        else:
+            a_eci = self.acceleration(T, ctx.RV[0:, 0:3])
+            self.Xdot = ctx.perturbation_rates(a_eci, out=out)
+        return self.Xdot
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'GravityGrid({}, {}, {}, {}, {}, {}, {}, {}, {})'.format(
+            self.values.shape, self.r_min, self.r_max, self.mu,
+            self.elements, self.omega, self.theta0, self.sampled_error,
+            self.model)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return ('GravityGrid(shape={}, r_min={}, r_max={}, mu={}, '
+                'elements={}, sampled_error={})'.format(
+                    self.values.shape, self.r_min, self.r_max, self.mu,
+                    self.elements, self.sampled_error))
@@ -4,10 +4,10 @@
 """
 import numpy as np
 import numpy.linalg as npl
-from math import sin, cos, atan2
 from ..orbit import diff_elements
 from .two_body import TwoBody
 from .utilities import GaussVariationalEqns
+from .utilities import ReferenceCache
 
 
 class LyapunovElementSteering():
@@ -24,10 +24,11 @@ class LyapunovElementSteering():
         Diagonal nxn weight array, where n is the state dimension.
     a_t : float
         Thrust magnitude
-    Xref : callable
+    Xref : ReferenceCache
         Can be called with input T (an mx1 ndarray) to produce a reference
         trajectory, X (mxn ndarray), where n is the state dimension defined by
-        the Xref.model attribute.
+        the Xref.model attribute. Repeated times are read from its cache, and
+        Xref.densify replaces the Kepler solves over a span by interpolation.
     model : callable
         Can be called with input T (an mx1 ndarray) and X (mxn ndarray)
         to produce state derivatives for this element set.
@@ -48,7 +49,10 @@ class LyapunovElementSteering():
         The most recently computed call output
     """
 
-    def __init__(self, mu, W, a_t, element_set, X0):
+    uses_context = True
+    accepts_out = True
+
+    def __init__(self, mu, W, a_t, element_set, X0, T0=None):
         """.
 
         Parameters
@@ -57,11 +61,14 @@ class LyapunovElementSteering():
             See two_body.py for more details.
         X0 : ndarray
             See two_body.py for more details.
+        T0 : float or None
+            See two_body.py for more details.
         """
         self.mu = mu
         self.W = W
         self.a_t = a_t
-        self.Xref = TwoBody(mu, element_set, X0=X0)
+        self.Xref = ReferenceCache(TwoBody(mu, element_set, X0=X0, T0=T0),
+                                   **TwoBody.reference_angles[element_set])
         self.model = TwoBody(mu, element_set)
         self.gve = GaussVariationalEqns(mu, element_set)
         self.u = np.zeros(())
@@ -69,47 +76,52 @@ class LyapunovElementSteering():
         self.Vdot = np.zeros(())
         self.Xdot = np.array([[]])
 
-    def __call__(self, T, X):
+    def __call__(self, T, X, ctx=None, out=None):
         """Evaluate the control at the given times.
 
         X = [e1 e2 e3 e4 e5 e_phase]
 
-        See dynamics_abstract.py for more details.
+        See dynamics_abstract.py for more details. The GVE matrices are taken
+        from ctx, a shared StateContext, when given, and the result is placed
+        in out, an mxn array, when given.
         """
-        G = self.gve(X)
+        G = self.gve(X) if ctx is None else ctx.G
         Xref = self.Xref(T)
         Eta = diff_elements(X, Xref, angle_idx=[2, 3, 4, 5])
 
-        Xdot = self.model(T, X)
+        Xdot = self.model(T, X, ctx=ctx)
         Xrefdot = self.model(T, Xref)
         Etadot = Xdot - Xrefdot
 
-        U = np.zeros(X.shape)
-        self.u = np.zeros((X.shape[0], 3))
-        self.V = np.zeros((X.shape[0], 1))
-        self.Vdot = np.zeros((X.shape[0], 1))
-        for i, eta in enumerate(Eta):
-            # Vdot = c'*u, where u is a unit vector
-            c = (eta @ self.W @ G[i]).reshape((1, 3))
-            u = - c.T / npl.norm(c)
-
-            self.u[i] = u.T
-            self.V[i] = eta @ self.W @ eta.T
-            self.Vdot[i] = eta @ self.W @ (Etadot[i:i+1, 0:].T + self.a_t *
-                                           G[i] @ u)
-            U[i:i+1] = (self.a_t * G[i] @ u).T
+        m = X.shape[0]
+        if self.u.shape != (m, 3):
+            self.u = np.empty((m, 3))
+            self.V = np.empty((m, 1))
+            self.Vdot = np.empty((m, 1))
+
+        # Vdot = c'*u is minimized by u = -c/|c|, with c = eta W G
+        EtaW = Eta @ self.W
+        c = np.einsum('ij,ijk->ik', EtaW, G, out=self.u)
+        c_norm = npl.norm(c, axis=1, keepdims=True)
+        np.divide(c, -c_norm, out=self.u, where=c_norm > 0.)
+        self.u[c_norm[0:, 0] == 0.] = 0.
+
+        U = np.einsum('ijk,ik->ij', G, self.u, out=out)
+        U *= self.a_t
+        np.einsum('ij,ij->i', EtaW, Eta, out=self.V[0:, 0])
+        np.einsum('ij,ij->i', EtaW, Etadot + U, out=self.Vdot[0:, 0])
 
         self.Xdot = U
         return U
 
-        def __repr__(self):
-            """Printable represenation of the object."""
-            return 'LyapunovElementSteering({}, {}, {}, {}, {})'.format(
-                self.mu, self.W, self.a_t, self.Xref, self.gve)
-
-        def __str__(self):
-            """Human readable represenation of the object."""
-            output = 'LyapunovElementSteering'
-            output += '(mu={}, W={}, a_t={}, Xref={}, glpe={})'.format(
-                self.mu, self.W, self.a_t, self.Xref, self.gve)
-            return output
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'LyapunovElementSteering({}, {}, {}, {}, {})'.format(
+            self.mu, self.W, self.a_t, self.Xref, self.gve)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        output = 'LyapunovElementSteering'
+        output += '(mu={}, W={}, a_t={}, Xref={}, glpe={})'.format(
+            self.mu, self.W, self.a_t, self.Xref, self.gve)
+        return output
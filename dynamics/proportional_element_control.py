@@ -5,9 +5,10 @@
 import numpy as np
 from numpy import dot
 import numpy.linalg as npl
-from orbital_mechanics.orbit import diff_elements
+from ..orbit import diff_elements
 from .utilities import diff_elements_theta_into_p
 from .utilities import GaussVariationalEqns
+from .utilities import ReferenceCache
 from .two_body import TwoBody
 
 
@@ -25,10 +26,11 @@ class ProportionalElementControl():
         Diagonal nxn gain array, where n is the state dimension.
     a_t : float
         Thrust magnitude
-    Xref : callable
+    Xref : ReferenceCache
         Can be called with input T (an mx1 ndarray) to produce a reference
         trajectory, X (mxn ndarray), where n is the state dimension defined by
-        the Xref.model attribute.
+        the Xref.model attribute. Repeated times are read from its cache, and
+        Xref.densify replaces the Kepler solves over a span by interpolation.
     gve : callable
         Can be called with input X (mxn ndarray) to produce a list of ndarrays
         representing the Gauss's form of Lagrange's Planetary Equations for
@@ -40,7 +42,13 @@ class ProportionalElementControl():
         The most recently computed call output
     """
 
-    def __init__(self, mu, K, a_t, element_set, X0):  # Xref, gve):
+    uses_context = True
+    accepts_out = True
+
+    # rows whose G'G is worse conditioned are solved by the pseudoinverse of G
+    max_cond = 1e8
+
+    def __init__(self, mu, K, a_t, element_set, X0, T0=None):  # Xref, gve):
         """.
 
         Parameters
@@ -49,62 +57,74 @@ class ProportionalElementControl():
             See two_body.py for more details.
         X0 : ndarray
             See two_body.py for more details.
+        T0 : float or None
+            See two_body.py for more details.
         """
         self.mu = mu
         self.K = K
         self.a_t = a_t
-        self.Xref = TwoBody(mu, element_set, X0=X0)
+        self.Xref = ReferenceCache(TwoBody(mu, element_set, X0=X0, T0=T0),
+                                   **TwoBody.reference_angles[element_set])
         self.gve = GaussVariationalEqns(mu, element_set)
         self.u = np.zeros(())
         self.Xdot = np.array([[]])
 
-    def __call__(self, T, X):
+    def __call__(self, T, X, ctx=None, out=None):
         """Evaluate the control at the given times.
 
         X = [e1 e2 e3 e4 e5 e_phase]
 
-        See dynamics_abstract.py for more details.
+        See dynamics_abstract.py for more details. The GVE matrices are taken
+        from ctx, a shared StateContext, when given, and the result is placed
+        in out, an mxn array, when given.
         """
-        G = self.gve(X)
+        G = self.gve(X) if ctx is None else ctx.G
         Xref = self.Xref(T)
         Eta = diff_elements(X, Xref, angle_idx=[2, 3, 4, 5])
         # k = 100.
         # Eta = diff_elements_theta_into_p(self.mu, k,
         #                                  X, Xref, angle_idx=[2, 3, 4, 5])
 
-        U = np.zeros(X.shape)
-        self.u = np.zeros((X.shape[0], 3))
-        for i, eta in enumerate(Eta):
-            K = np.eye(6)
-            eta_trimmed = np.trim_zeros(np.sort(np.absolute(eta[0:5])))
-            max_exponent = np.max(np.log10(eta_trimmed))
-            try:
-                exponent_5 = max_exponent  # - np.log10(eta[5])
-            except RuntimeWarning:  # if eta[5] is zero
-                exponent_5 = max_exponent
-            K[5, 5] = np.power(10., exponent_5+1)
-
-            # u = (-1./self.a_t * npl.inv(G[i].T @ G[i]) @ G[i].T @ self.K @ eta)
-            u = (-1./self.a_t * npl.inv(G[i].T @ G[i]) @ G[i].T @ K @ eta)
-            u_norm = npl.norm(u)
-            if u_norm > 1.:
-                self.u[i] = u / u_norm
-            else:
-                self.u[i] = u
-
-            U[i] = (self.a_t * G[i] @ self.u[i]).T
-
+        # The phase gain is scheduled an order of magnitude above the largest
+        # nonzero error in the other five elements
+        eta_max = np.max(np.absolute(Eta[0:, 0:5]), axis=1)
+        KEta = Eta.copy()
+        KEta[0:, 5] *= np.where(eta_max > 0., 10. * eta_max, 0.)
+
+        # Least squares u = -1/a_t (G'G)^-1 G' K eta, solved per row. Rank
+        # deficient or ill conditioned rows fall back to the pseudoinverse,
+        # rows that are not finite give nan.
+        Gt = np.swapaxes(G, 1, 2)
+        GtG = Gt @ G
+        GtKEta = Gt @ KEta[..., np.newaxis]
+        finite = (np.isfinite(GtG).all(axis=(1, 2)) &
+                  np.isfinite(GtKEta).all(axis=(1, 2)))
+        well = finite.copy()
+        well[finite] = npl.cond(GtG[finite]) <= self.max_cond
+        ill = finite & ~well
+
+        u = np.full(G.shape[0:1] + G.shape[2:], np.nan)
+        u[well] = npl.solve(GtG[well], GtKEta[well])[..., 0]
+        u[ill] = (npl.pinv(G[ill]) @ KEta[ill, 0:, np.newaxis])[..., 0]
+        u *= -1./self.a_t
+
+        u_norm = npl.norm(u, axis=1, keepdims=True)
+        np.divide(u, u_norm, out=u, where=u_norm > 1.)
+        self.u = u
+
+        U = np.einsum('ijk,ik->ij', G, u, out=out)
+        U *= self.a_t
         self.Xdot = U
         return U
 
-        def __repr__(self):
-            """Printable represenation of the object."""
-            return 'ProportionalElementControl({}, {}, {}, {}, {})'.format(
-                self.mu, self.K, self.a_t, self.Xref, self.gve)
-
-        def __str__(self):
-            """Human readable represenation of the object."""
-            output = 'ProportionalElementControl'
-            output += '(mu={}, K={}, a_t={}, Xref={}, gve={})'.format(
-                self.mu, self.K, self.a_t, self.Xref, self.gve)
-            return output
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'ProportionalElementControl({}, {}, {}, {}, {})'.format(
+            self.mu, self.K, self.a_t, self.Xref, self.gve)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        output = 'ProportionalElementControl'
+        output += '(mu={}, K={}, a_t={}, Xref={}, gve={})'.format(
+            self.mu, self.K, self.a_t, self.Xref, self.gve)
+        return output
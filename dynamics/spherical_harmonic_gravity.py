@@ -0,0 +1,309 @@
+"""Created on Sat Oct 17 2026 07:48.
+
+@author: Nathan Budd
+"""
+import numpy as np
+from ..orbit import coe2rv
+from ..orbit import mee2rv
+from ..orbit import euler_rotate
+from .utilities import GaussVariationalEqns
+from .utilities import perturbation_rates
+from .utilities import read_gravity_coefficients
+
+
+class SphericalHarmonicGravity():
+    """
+    Spherical harmonic gravity perturbations of degree n and order m.
+
+    Accelerations are computed with the Cunningham recursion of the
+    normalized V_nm, W_nm harmonics in Cartesian coordinates, which has no
+    singularity at the poles. The recursion and acceleration factors are
+    combined with the coefficients once, at construction. The central term,
+    C_00, is left to the plant.
+
+    The coefficients are defined in a body-fixed frame that rotates about the
+    inertial z axis through theta0 + omega*T.
+
+    Members
+    -------
+    C : ndarray
+        (n+1)x(n+1) array of fully normalized cosine coefficients, [n, m].
+    S : ndarray
+        (n+1)x(n+1) array of fully normalized sine coefficients, [n, m].
+    Re : float
+        Reference radius. Defaults to canonical units.
+    mu : float
+        Standard gravitational parameter. Defaults to canonical units.
+    elements : string
+        Indicates the element set being used as input and output. Allowable
+        values include: 'coe', 'mee', 'rv'. Defaults to 'coe'.
+    omega : float
+        Rotation rate of the body-fixed frame. Defaults to 0.
+    theta0 : float
+        Rotation angle of the body-fixed frame at T = 0. Defaults to 0.
+    Xdot : ndarray
+        The most recently computed call output
+    """
+
+    toRV = {'coe': coe2rv, 'mee': mee2rv, 'rv': np.asarray}
+    uses_context = True
+    accepts_out = True
+
+    def __init__(self, C, S, Re=1., mu=1., elements='coe', omega=0.,
+                 theta0=0.):
+        """."""
+        self.C = np.array(C, dtype=float)
+        self.S = np.array(S, dtype=float)
+        self.Re = Re
+        self.mu = mu
+        self.elements = elements
+        self.omega = omega
+        self.theta0 = theta0
+        self.gve = GaussVariationalEqns(mu, elements)
+        self.Xdot = np.array([[]])
+        self._cache_factors()
+
+    @classmethod
+    def from_file(cls, path, degree, order=None, **kwargs):
+        """
+        Create a SphericalHarmonicGravity from a coefficient file.
+
+        See read_gravity_coefficients for the supported formats. Re and mu
+        default to the values in the file header, if any.
+
+        Parameters
+        ----------
+        path : string
+            Path to the coefficient file.
+        degree : int
+            Maximum degree.
+        order : int, optional
+            Maximum order. Defaults to degree.
+        kwargs
+            Passed on to SphericalHarmonicGravity.
+
+        Returns
+        -------
+        SphericalHarmonicGravity
+        """
+        C, S, mu, Re = read_gravity_coefficients(path, degree, order)
+        if mu is not None:
+            kwargs.setdefault('mu', mu)
+        if Re is not None:
+            kwargs.setdefault('Re', Re)
+        return cls(C, S, **kwargs)
+
+    @property
+    def degree(self):
+        """Maximum degree of the field."""
+        return self.C.shape[0] - 1
+
+    def _cache_factors(self):
+        """Precompute the recursion factors and coefficient products."""
+        N = self.degree
+        n = np.arange(N+2).reshape((-1, 1)).astype(float)
+        m = np.arange(N+2).reshape((1, -1)).astype(float)
+
+        # zonal and tesseral recursion, V_nm from V_n-1,m and V_n-2,m
+        with np.errstate(divide='ignore', invalid='ignore'):
+            alpha = ((2*n+1)*(2*n-1) / ((n-m)*(n+m)))**.5
+            beta = ((2*n+1)*(n+m-1)*(n-m-1) /
+                    ((2*n-3)*(n+m)*(n-m)))**.5
+        below = m < n
+        self._alpha = np.where(below, alpha, 0.)
+        self._beta = np.where(below & (m < n-1), beta, 0.)
+
+        # sectoral recursion, V_nn from V_n-1,n-1
+        n = n[0:, 0]
+        self._gamma = np.zeros(N+2)
+        self._gamma[1:] = ((1. + (n[1:] == 1)) * (2*n[1:]+1) / (2*n[1:]))**.5
+
+        # acceleration factors of degree n, order m, applied to the degree
+        # n+1 harmonics, combined with the coefficients. The central term is
+        # left to the plant.
+        n = n[0:N+1].reshape((-1, 1))
+        m = m[0:, 0:N+1]
+        C = self.C.copy()
+        C[0, 0] = 0.
+        S = self.S
+        tri = m <= n
+        f_a = np.where(tri, (2*n+1)*(n+m+2)*(n+m+1)/(2*n+3), 0.)**.5
+        f_a[0:, 0] *= 2.**.5
+        with np.errstate(invalid='ignore'):
+            f_b = np.where(tri & (m > 0),
+                           2*(2*n+1)*(n-m+2)*(n-m+1) /
+                           ((1. + (m != 1))*(2*n+3)), 0.)**.5
+        f_z = np.where(tri, (n-m+1)*(n+m+1)*(2*n+1)/(2*n+3), 0.)**.5
+        self._a_C = f_a * C
+        self._a_S = f_a * S
+        self._b_C = f_b * C
+        self._b_S = f_b * S
+        self._z_C = f_z * C
+        self._z_S = f_z * S
+
+        # read-only, so that replicas in SystemDynamics share the tables
+        for table in (self._alpha, self._beta, self._gamma, self._a_C,
+                      self._a_S, self._b_C, self._b_S, self._z_C, self._z_S):
+            table.flags.writeable = False
+
+    def _harmonics(self, R, n_max):
+        """
+        Generate the normalized V_nm and W_nm harmonics one degree at a time.
+
+        Parameters
+        ----------
+        R : ndarray
+            mx3 array of body-fixed positions.
+        n_max : int
+            Maximum degree.
+
+        Yields
+        ------
+        V, W : ndarray
+            (degree+2)xm arrays of the harmonics of each degree, 0 to n_max,
+            indexed [m, sample]. Only valid until the next iteration.
+        """
+        x = R[0:, 0]
+        y = R[0:, 1]
+        z = R[0:, 2]
+        r2 = x**2 + y**2 + z**2
+        u_x = x * self.Re/r2
+        u_y = y * self.Re/r2
+        u_z = z * self.Re/r2
+        u_r = self.Re**2/r2
+
+        rows = self.degree + 2
+        V = np.zeros((rows, x.size))
+        W = np.zeros((rows, x.size))
+        V1 = np.zeros((rows, x.size))
+        W1 = np.zeros((rows, x.size))
+        V2 = np.zeros((rows, x.size))
+        W2 = np.zeros((rows, x.size))
+
+        V[0] = self.Re / r2**.5
+        yield V, W
+
+        for n in range(1, n_max+1):
+            V, V1, V2 = V2, V, V1
+            W, W1, W2 = W2, W, W1
+
+            alpha = self._alpha[n, 0:n].reshape((-1, 1))
+            beta = self._beta[n, 0:n].reshape((-1, 1))
+            V[0:n] = alpha*u_z*V1[0:n] - beta*u_r*V2[0:n]
+            W[0:n] = alpha*u_z*W1[0:n] - beta*u_r*W2[0:n]
+
+            gamma = self._gamma[n]
+            V[n] = gamma * (u_x*V1[n-1] - u_y*W1[n-1])
+            W[n] = gamma * (u_x*W1[n-1] + u_y*V1[n-1])
+            yield V, W
+
+    def body_acceleration(self, R):
+        """
+        Calculate the perturbing acceleration in the body-fixed frame.
+
+        Parameters
+        ----------
+        R : ndarray
+            mx3 array of body-fixed positions.
+
+        Returns
+        -------
+        a_body : ndarray
+            mx3 array of body-fixed accelerations.
+        """
+        a = np.zeros(R.shape)
+        a_x = a[0:, 0]
+        a_y = a[0:, 1]
+        a_z = a[0:, 2]
+
+        harmonics = self._harmonics(R, self.degree + 1)
+        next(harmonics)
+        for n, (V, W) in enumerate(harmonics):
+            # degree n terms from the degree n+1 harmonics
+            a_C = self._a_C[n, 0:n+1]
+            a_S = self._a_S[n, 0:n+1]
+            b_C = self._b_C[n, 1:n+1]
+            b_S = self._b_S[n, 1:n+1]
+            a_x += .5 * (-a_C @ V[1:n+2] - a_S @ W[1:n+2] +
+                         b_C @ V[0:n] + b_S @ W[0:n])
+            a_y += .5 * (-a_C @ W[1:n+2] + a_S @ V[1:n+2] -
+                         b_C @ W[0:n] + b_S @ V[0:n])
+            a_z -= self._z_C[n, 0:n+1] @ V[0:n+1] + (
+                self._z_S[n, 0:n+1] @ W[0:n+1])
+
+        a *= self.mu / self.Re**2
+        return a
+
+    def body_potential(self, R):
+        """
+        Calculate the potential energy per unit mass in the body-fixed frame.
+
+        Parameters
+        ----------
+        R : ndarray
+            mx3 array of body-fixed positions.
+
+        Returns
+        -------
+        V : ndarray
+            mx1 array of potential energies, including the central term.
+        """
+        U = np.zeros(R.shape[0])
+        for n, (V, W) in enumerate(self._harmonics(R, self.degree)):
+            U += self.C[n, 0:n+1] @ V[0:n+1] + self.S[n, 0:n+1] @ W[0:n+1]
+        U += (1. - self.C[0, 0]) * self.Re / np.sum(R**2, axis=1)**.5
+
+        return (-self.mu/self.Re * U).reshape((-1, 1))
+
+    def acceleration(self, T, R):
+        """
+        Calculate the perturbing acceleration in the inertial frame.
+
+        Parameters
+        ----------
+        T : ndarray
+            mx1 array of times.
+        R : ndarray
+            mx3 array of inertial positions.
+
+        Returns
+        -------
+        a_eci : ndarray
+            mx3 array of inertial accelerations.
+        """
+        if self.omega == 0. and self.theta0 == 0.:
+            return self.body_acceleration(R)
+
+        theta = self.theta0 + self.omega*T
+        R_body = euler_rotate([3], R, theta)
+        a_body = self.body_acceleration(R_body)
+        return euler_rotate([3], a_body, -theta, out=a_body)
+
+    def __call__(self, T, X, ctx=None, out=None):
+        """Output indicated element derivatives resulting from the field.
+
+        See dynamics_abstract.py for more details. The inertial state and
+        LVLH basis are taken from ctx, a shared StateContext, when given. The
+        result is placed in out, an mxn array, when given.
+        """
+        if ctx is None:
+            RV = self.toRV[self.elements](X)
+            a_eci = self.acceleration(T, RV[0:, 0:3])
+            self.Xdot = perturbation_rates(self.gve, X, RV, a_eci, out=out)
+        else:
+            a_eci = self.acceleration(T, ctx.RV[0:, 0:3])
+            self.Xdot = ctx.perturbation_rates(a_eci, out=out)
+        return self.Xdot
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'SphericalHarmonicGravity({}, {}, {}, {}, {}, {}, {})'.format(
+            self.C, self.S, self.Re, self.mu, self.elements, self.omega,
+            self.theta0)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return ('SphericalHarmonicGravity(degree={}, Re={}, mu={}, '
+                'elements={}, omega={}, theta0={})'.format(
+                    self.degree, self.Re, self.mu, self.elements, self.omega,
+                    self.theta0))
@@ -0,0 +1,158 @@
+"""Created on Sat Oct 17 2026 08:20.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from .. import LyapunovElementSteering
+from .. import ProportionalElementControl
+
+
+def sample_mee(m):
+    """Random elliptic MEE states and sample times."""
+    p = npr.rand(m, 1) * 5 + 1.
+    e = npr.rand(m, 1) * .8 + .05
+    i = npr.rand(m, 1) * np.pi*.9 + .05
+    W = npr.rand(m, 1) * 2*np.pi
+    w = npr.rand(m, 1) * 2*np.pi
+    f = npr.rand(m, 1) * 2*np.pi
+    T = np.arange(m).reshape((m, 1)) * .1
+    return T, orb.coe2mee(np.concatenate((p, e, i, W, w, f), 1))
+
+
+class TestLyapunovElementSteering(unittest.TestCase):
+    """Test the batched Lyapunov steering law against a per-row loop."""
+
+    def setUp(self):
+        """."""
+        self.T, self.X = sample_mee(50)
+        X0 = orb.coe2mee(np.array([[2., .3, .5, .1, .2, 0.]]))
+        self.W = np.diag([1., 2., 3., 4., 5., 0.])
+        self.a_t = 1e-3
+        self.control = LyapunovElementSteering(1., self.W, self.a_t, 'mee',
+                                               X0)
+
+    def loop(self, T, X):
+        """Per-row evaluation of the control law."""
+        G = self.control.gve(X)
+        Xref = self.control.Xref(T)
+        Eta = orb.diff_elements(X, Xref, angle_idx=[2, 3, 4, 5])
+        Etadot = self.control.model(T, X) - self.control.model(T, Xref)
+        U = np.zeros(X.shape)
+        u = np.zeros((X.shape[0], 3))
+        V = np.zeros((X.shape[0], 1))
+        Vdot = np.zeros((X.shape[0], 1))
+        for i, eta in enumerate(Eta):
+            c = (eta @ self.W @ G[i]).reshape((1, 3))
+            u_i = - c.T / np.linalg.norm(c)
+            u[i] = u_i.T
+            V[i] = eta @ self.W @ eta.T
+            Vdot[i] = eta @ self.W @ (Etadot[i:i+1, 0:].T +
+                                      self.a_t * G[i] @ u_i)
+            U[i:i+1] = (self.a_t * G[i] @ u_i).T
+        return U, u, V, Vdot
+
+    def test_matches_loop(self):
+        tol = 1e-12
+        U, u, V, Vdot = self.loop(self.T, self.X)
+        Xdot = self.control(self.T, self.X)
+        self.assertLess(np.max(np.abs(Xdot - U)), tol)
+        self.assertLess(np.max(np.abs(self.control.u - u)), tol)
+        self.assertLess(np.max(np.abs(self.control.V - V) / V), tol)
+        self.assertLess(np.max(np.abs(self.control.Vdot - Vdot)),
+                        tol * np.max(np.abs(Vdot)))
+
+    def test_buffers(self):
+        self.control(self.T, self.X)
+        u, V, Vdot = self.control.u, self.control.V, self.control.Vdot
+        self.control(self.T + 1., self.X)
+        self.assertIs(self.control.u, u)
+        self.assertIs(self.control.V, V)
+        self.assertIs(self.control.Vdot, Vdot)
+
+        self.control(self.T[0:3], self.X[0:3])
+        self.assertEqual(self.control.u.shape, (3, 3))
+        self.assertEqual(self.control.V.shape, (3, 1))
+
+    def test_zero_error(self):
+        T = np.zeros((1, 1))
+        X = self.control.Xref(T)
+        U = self.control(T, X)
+        self.assertTrue(np.all(np.isfinite(U)))
+        self.assertEqual(np.max(np.abs(U)), 0.)
+
+    def test_repr(self):
+        self.assertIn('LyapunovElementSteering', repr(self.control))
+        self.assertIn('a_t=', str(self.control))
+
+
+class TestProportionalElementControl(unittest.TestCase):
+    """Test the batched proportional control law against a per-row loop."""
+
+    def setUp(self):
+        """."""
+        self.T, self.X = sample_mee(50)
+        X0 = orb.coe2mee(np.array([[2., .3, .5, .1, .2, 0.]]))
+        self.control = ProportionalElementControl(1., np.eye(6), .05, 'mee',
+                                                  X0, T0=0.)
+
+    def loop(self, T, X, G, pinv=False):
+        """Per-row evaluation of the control law, optionally by pinv."""
+        Xref = self.control.Xref(T)
+        Eta = orb.diff_elements(X, Xref, angle_idx=[2, 3, 4, 5])
+        U = np.zeros(X.shape)
+        u = np.zeros((X.shape[0], 3))
+        for i, eta in enumerate(Eta):
+            K = np.eye(6)
+            eta_trimmed = np.trim_zeros(np.sort(np.absolute(eta[0:5])))
+            K[5, 5] = np.power(10., np.max(np.log10(eta_trimmed))+1)
+            if pinv:
+                u_i = -1./self.control.a_t * np.linalg.pinv(G[i]) @ K @ eta
+            else:
+                u_i = (-1./self.control.a_t * np.linalg.inv(G[i].T @ G[i]) @
+                       G[i].T @ K @ eta)
+            u_norm = np.linalg.norm(u_i)
+            u[i] = u_i / u_norm if u_norm > 1. else u_i
+            U[i] = self.control.a_t * G[i] @ u[i]
+        return U, u
+
+    def test_matches_loop(self):
+        tol = 1e-12
+        U, u = self.loop(self.T, self.X, self.control.gve(self.X))
+        Xdot = self.control(self.T, self.X)
+        u_norm = np.linalg.norm(u, axis=1)
+        self.assertTrue(np.any(u_norm < 1.) and np.any(u_norm > 1. - tol))
+        self.assertLess(np.max(np.abs(Xdot - U)), tol)
+        self.assertLess(np.max(np.abs(self.control.u - u)), tol)
+
+    def test_degenerate_rows(self):
+        tol = 1e-12
+        G = self.control.gve(self.X)
+        G[0, 0:, 2] = 0.
+        G[1, 0:, 2] = G[1, 0:, 1] * (1. + 1e-7)
+        G[2, 3, 0] = np.nan
+        gve = self.control.gve
+        self.control.gve = lambda X: G
+        U = self.control(self.T, self.X)
+        self.control.gve = gve
+
+        # the zero column and the near-singular row are solved by pinv
+        self.assertTrue(np.all(np.isfinite(U[0:2])))
+        self.assertEqual(self.control.u[0, 2], 0.)
+        U_pinv = self.loop(self.T[0:2], self.X[0:2], G[0:2], pinv=True)[0]
+        self.assertLess(np.max(np.abs(U[0:2] - U_pinv)), tol)
+
+        # only the non-finite row is lost
+        self.assertTrue(np.all(np.isnan(self.control.u[2])))
+        U_loop = self.loop(self.T[3:], self.X[3:], G[3:])[0]
+        self.assertLess(np.max(np.abs(U[3:] - U_loop)), tol)
+
+    def test_repr(self):
+        self.assertIn('ProportionalElementControl', repr(self.control))
+        self.assertIn('a_t=', str(self.control))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Created on Sat Oct 17 2026 08:12.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from .. import Encke
+from .. import TwoBody
+from .. import ZonalGravity
+from ..utilities import SystemDynamics
+from ...integrators import DormandPrince
+
+
+class TestEncke(unittest.TestCase):
+    """Test class for Encke."""
+
+    def setUp(self):
+        """."""
+        m = 20
+        p = npr.rand(m, 1) * 2 + 1.2
+        e = npr.rand(m, 1) * .3
+        i = npr.rand(m, 1) * np.pi
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        self.RV0 = orb.coe2rv(np.concatenate((p, e, i, W, w, f), 1))
+        self.zonal = ZonalGravity(ord=2, elements='rv')
+
+    def test_two_body(self):
+        tol = 1e-12
+
+        encke = Encke(1.)
+        RV = encke.propagate(DormandPrince(encke), 0., self.RV0, 30.)
+
+        self.assertTrue((np.fabs(RV - orb.propagate_rv(self.RV0, 30.)) <
+                         tol).all())
+
+    def test_deviation(self):
+        tol = 1e-12
+
+        T = npr.rand(20, 1)
+        encke = Encke(1., [self.zonal])
+        Y = encke.state(T, self.RV0)
+        Y[0:, 0:6] = npr.randn(20, 6) * 1e-3
+
+        Xdot = SystemDynamics(TwoBody(1., 'rv'), perturbations=[self.zonal])(
+            T, encke.rv(T, Y))
+        Ydot = encke(T, Y)
+        Xdot_ref = SystemDynamics(TwoBody(1., 'rv'))(T, encke.reference(T, Y))
+
+        self.assertTrue((np.fabs(Ydot[0:, 0:6] - (Xdot - Xdot_ref)) <
+                         tol).all())
+        self.assertTrue((Ydot[0:, 6:13] == 0.).all())
+
+    def test_zonal(self):
+        atol = 1e-9
+
+        cowell = DormandPrince(SystemDynamics(TwoBody(1., 'rv'),
+                                              perturbations=[self.zonal]),
+                               rtol=1e-13, atol=1e-14)
+        RV_cowell = cowell.propagate(0., self.RV0, 30.)
+
+        encke = Encke(1., [self.zonal], tol=1e-2)
+        dp = DormandPrince(encke, rtol=0., atol=atol)
+        RV = encke.propagate(dp, 0., self.RV0, 30.)
+
+        cowell = DormandPrince(cowell.dynamics, rtol=0., atol=atol)
+        cowell.propagate(0., self.RV0, 30.)
+
+        self.assertGreater(encke.rectifications, 0)
+        self.assertTrue((np.fabs(RV - RV_cowell) < 1e3*atol).all())
+        self.assertLess(dp.steps.sum(), cowell.steps.sum() / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Created on Sat Oct 17 2026 07:45.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from ..utilities import GaussVariationalEqns
+
+
+class TestGaussVariationalEqns(unittest.TestCase):
+    """Test class for GaussVariationalEqns."""
+
+    backend = 'numpy'
+
+    def setUp(self):
+        """."""
+        self.saved_backend = orb.get_backend()
+        orb.set_backend(self.backend)
+        m = 1000
+        p = npr.rand(m, 1) * 10 + 1.
+        e = npr.rand(m, 1) * .9 + .05
+        i = npr.rand(m, 1) * np.pi*.9 + .05
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        self.COE = np.concatenate((p, e, i, W, w, f), 1)
+        self.A = npr.randn(m, 3)
+
+    def states(self, element_set):
+        """Sample states in the given element set."""
+        to_set = dict(coe=lambda X: X, mee=orb.coe2mee, rv=orb.coe2rv)
+        return to_set[element_set](self.COE)
+
+    def tearDown(self):
+        """."""
+        orb.set_backend(self.saved_backend)
+
+    def test_shape(self):
+        for element_set in ['coe', 'mee', 'rv']:
+            X = self.states(element_set)
+            G = GaussVariationalEqns(1., element_set)(X)
+            self.assertEqual(G.shape, (X.shape[0], 6, 3))
+
+    def test_rows(self):
+        tol = 1e-12
+
+        X = self.states('mee')
+        gve = GaussVariationalEqns(1., 'mee')
+        G = gve(X)
+        G_rows = np.concatenate([gve(X[j:j+1]) for j in range(10)])
+
+        self.assertTrue((np.fabs(G[0:10] - G_rows) < tol).all())
+
+    def test_rates(self):
+        tol = 1e-12
+
+        for element_set in ['coe', 'mee', 'rv']:
+            X = self.states(element_set)
+            gve = GaussVariationalEqns(1., element_set)
+            G = gve(X)
+
+            Xdot = gve.rates(X, self.A)
+            Xdot_G = (G @ self.A[0:, 0:, np.newaxis])[0:, 0:, 0]
+
+            scale = np.fabs(Xdot_G).max(axis=1, keepdims=True)
+            self.assertTrue((np.fabs(Xdot - Xdot_G) < tol*scale).all())
+
+    def test_rv_basis(self):
+        tol = 1e-12
+
+        X = self.states('rv')
+        G = GaussVariationalEqns(1., 'rv')(X)
+        C = G[0:, 3:6, 0:]
+
+        CtC = C.transpose((0, 2, 1)) @ C
+        self.assertTrue((np.fabs(CtC - np.eye(3)) < tol).all())
+        self.assertTrue((G[0:, 0:3, 0:] == 0.).all())
+
+
+@unittest.skipIf(orb.backend.numba is None, 'numba is not installed')
+class TestGaussVariationalEqnsNumba(TestGaussVariationalEqns):
+    """Test class for GaussVariationalEqns, with the numba backend."""
+
+    backend = 'numba'
+
+    def test_backends_agree(self):
+        tol = 1e-12
+
+        for element_set in ['coe', 'mee', 'rv']:
+            X = self.states(element_set)
+            gve = GaussVariationalEqns(1., element_set)
+            G, Xdot = gve(X), gve.rates(X, self.A)
+            orb.set_backend('numpy')
+            G_numpy, Xdot_numpy = gve(X), gve.rates(X, self.A)
+            orb.set_backend('numba')
+
+            scale = np.fabs(G_numpy).max(axis=(1, 2), keepdims=True)
+            self.assertTrue((np.fabs(G - G_numpy) < tol*scale).all())
+            scale = np.fabs(Xdot_numpy).max(axis=1, keepdims=True)
+            self.assertTrue((np.fabs(Xdot - Xdot_numpy) < tol*scale).all())
@@ -0,0 +1,70 @@
+"""Created on Sat Oct 17 2026 07:53.
+
+@author: Nathan Budd
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+import numpy.random as npr
+from ..gravity_grid import GravityGrid
+from ..spherical_harmonic_gravity import SphericalHarmonicGravity
+from ..zonal_gravity import ZonalGravity
+
+
+class TestGravityGrid(unittest.TestCase):
+    """Test class for GravityGrid."""
+
+    def setUp(self):
+        """."""
+        self.zonal = ZonalGravity(6)
+        self.grid = GravityGrid.build(self.zonal, 1., 2., shape=(8, 91, 8),
+                                      tol=1e-7)
+
+    def test_sampled_error(self):
+        R = self.grid._random_positions(1000)
+        a_diff = self.grid.body_acceleration(R) - self.zonal.acceleration(R)
+
+        self.assertLess(self.grid.sampled_error, 1e-7)
+        self.assertTrue((np.fabs(a_diff) < 2*self.grid.sampled_error).all())
+
+    def test_max_nodes(self):
+        with self.assertWarns(RuntimeWarning):
+            grid = GravityGrid.build(self.zonal, 1., 2., shape=(8, 91, 8),
+                                     tol=1e-30, max_nodes=20000)
+        self.assertLessEqual(np.prod(grid.values.shape[0:3]), 20000)
+
+    def test_outside(self):
+        R = np.array([[0., 0., 3.], [.9, 0., 0.]])
+        a_diff = self.grid.body_acceleration(R) - self.zonal.acceleration(R)
+        self.assertTrue((a_diff == 0.).all())
+
+        self.grid.model = None
+        with self.assertRaises(ValueError):
+            self.grid.body_acceleration(R)
+
+    def test_save_load(self):
+        R = self.grid._random_positions(100)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'grid.npy')
+            self.grid.save(path)
+            grid = GravityGrid.load(path)
+
+            self.assertIsInstance(grid.values, np.memmap)
+            self.assertEqual(grid.sampled_error, self.grid.sampled_error)
+            self.assertTrue((grid.body_acceleration(R) ==
+                             self.grid.body_acceleration(R)).all())
+            del grid
+
+    def test_rotating(self):
+        C = np.tril(npr.randn(5, 5)) * 1e-4
+        S = np.tril(npr.randn(5, 5)) * 1e-4
+        S[0:, 0] = 0.
+        harmonic = SphericalHarmonicGravity(C, S, omega=.1, theta0=.2)
+        grid = GravityGrid.build(harmonic, 1., 2., shape=(16, 91, 180))
+
+        R = grid._random_positions(100)
+        T = npr.rand(100, 1)
+        a_diff = grid.acceleration(T, R) - harmonic.acceleration(T, R)
+        self.assertTrue((np.fabs(a_diff) < 2*grid.sampled_error).all())
@@ -0,0 +1,124 @@
+"""Created on Sat Oct 17 2026 08:15.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+from ... import orbit as orb
+from ...integrators import DormandPrince
+from .. import LyapunovElementSteering
+from .. import TwoBody
+from ..utilities import ReferenceCache
+from ..utilities import SystemDynamics
+
+
+class TestReferenceCache(unittest.TestCase):
+    """Test class for ReferenceCache."""
+
+    def setUp(self):
+        """."""
+        self.COE0 = np.array([[1.5, .3, 1., .2, .3, 1.]])
+        self.T = np.linspace(0., 30., 50).reshape((50, 1))
+
+    def cache(self, element_set, **kwargs):
+        """ReferenceCache of a TwoBody reference."""
+        to_set = dict(coe=lambda X: X, mee=orb.coe2mee, rv=orb.coe2rv)
+        reference = TwoBody(1., element_set, X0=to_set[element_set](
+            self.COE0), T0=0.)
+        return ReferenceCache(reference,
+                              **TwoBody.reference_angles[element_set],
+                              **kwargs)
+
+    def test_memoized(self):
+        cache = self.cache('coe', maxsize=2)
+        X = cache(self.T)
+
+        self.assertIs(cache(self.T.copy()), X)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertFalse(X.flags.writeable)
+
+        cache(self.T + 1.)
+        cache(self.T + 2.)
+        self.assertIsNot(cache(self.T), X)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_maxbytes(self):
+        nbytes = self.T.nbytes * 7
+        cache = self.cache('coe', maxsize=100, maxbytes=2*nbytes)
+        X = cache(self.T)
+        cache(self.T + 1.)
+        cache(self.T + 2.)
+
+        self.assertEqual(len(cache._cache), 2)
+        self.assertEqual(cache._nbytes, 2*nbytes)
+        self.assertIsNot(cache(self.T), X)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+    def test_integrator(self):
+        X0 = np.tile(self.COE0, (20, 1)) + .01
+        for densify in [False, True]:
+            control = LyapunovElementSteering(1., np.eye(6), 1e-3, 'coe',
+                                              self.COE0, T0=0.)
+            if densify:
+                control.Xref.densify(0., 30., segments=10, N=24)
+            integrator = DormandPrince(SystemDynamics(TwoBody(1., 'coe'),
+                                                      control))
+            integrator.propagate(0., X0, 30.)
+            attempts = integrator.steps[0] + integrator.rejected[0]
+
+            self.assertLessEqual(len(control.Xref._cache),
+                                 control.Xref.maxsize)
+            if densify:
+                self.assertEqual((control.Xref.hits, control.Xref.misses),
+                                 (0, 0))
+            else:
+                # only the last two stages of an attempt share their times
+                self.assertEqual(control.Xref.hits, attempts)
+                self.assertGreaterEqual(control.Xref.misses, 5*attempts)
+
+    def test_constant_angle(self):
+        def reference(T):
+            return np.concatenate((T, np.full(T.shape, 7.)), 1)
+
+        cache = ReferenceCache(reference, angle_idx=[0, 1], angle_min=0.)
+        cache.densify(0., 10., segments=2, N=8)
+        X = cache(self.T[0:10])
+
+        self.assertTrue((X[0:, 1] == 7.).all())
+        self.assertTrue((np.fabs(X[0:, 0] - np.mod(self.T[0:10, 0],
+                                                   2*np.pi)) < 1e-12).all())
+
+    def test_densify(self):
+        tol = 1e-10
+
+        for element_set in ['coe', 'mee', 'rv']:
+            cache = self.cache(element_set)
+            error = cache.densify(0., 30., segments=10, N=24)
+            T = np.linspace(0., 30., 777).reshape((777, 1))
+
+            X = cache(T)
+            X_ref = cache.reference(T)
+
+            self.assertLess(error, tol)
+            self.assertEqual(cache.misses, 0)
+            self.assertTrue((np.fabs(X - X_ref) < tol).all())
+
+    def test_controller(self):
+        tol = 1e-9
+
+        X = np.tile(self.COE0, (50, 1)) + .01
+        control = LyapunovElementSteering(1., np.eye(6), 1e-3, 'coe',
+                                          self.COE0, T0=0.)
+        control.Xref = control.Xref.reference
+        U_ref = control(self.T, X)
+
+        control = LyapunovElementSteering(1., np.eye(6), 1e-3, 'coe',
+                                          self.COE0, T0=0.)
+        control.Xref.densify(0., 30., segments=10, N=24)
+        U = control(self.T, X)
+
+        self.assertTrue((np.fabs(U - U_ref) < tol*np.fabs(U_ref).max()).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
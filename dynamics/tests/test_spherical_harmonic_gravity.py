@@ -0,0 +1,132 @@
+"""Created on Sat Oct 17 2026 07:48.
+
+@author: Nathan Budd
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+import numpy.random as npr
+from ..spherical_harmonic_gravity import SphericalHarmonicGravity
+from ..zonal_gravity import ZonalGravity
+
+
+class TestSphericalHarmonicGravity(unittest.TestCase):
+    """Test class for SphericalHarmonicGravity."""
+
+    def setUp(self):
+        """."""
+        m = 100
+        R = npr.randn(m, 3)
+        self.R = R / np.linalg.norm(R, axis=1, keepdims=True) * (
+            1. + npr.rand(m, 1))
+        self.R[0] = [0., 0., 1.5]
+
+        N = 12
+        self.C = np.tril(npr.randn(N+1, N+1)) * 1e-3
+        self.S = np.tril(npr.randn(N+1, N+1)) * 1e-3
+        self.C[0, 0] = 1.
+        self.S[0:, 0] = 0.
+
+    def test_zonal(self):
+        tol = 1e-15
+
+        J = (npr.randn(11) * 1e-3).tolist()
+        zonal = ZonalGravity(12, J=J)
+        C = np.zeros((13, 13))
+        C[2:, 0] = -np.array(J) / (2*np.arange(2, 13) + 1)**.5
+        harmonic = SphericalHarmonicGravity(C, np.zeros((13, 13)))
+
+        a_diff = zonal.acceleration(self.R) - harmonic.body_acceleration(
+            self.R)
+        self.assertTrue((np.fabs(a_diff) < tol).all())
+
+    def test_gradient(self):
+        tol = 1e-8
+        dx = 1e-5
+
+        harmonic = SphericalHarmonicGravity(self.C, self.S)
+        a = harmonic.body_acceleration(self.R)
+        r = np.linalg.norm(self.R, axis=1)
+
+        for j in range(3):
+            dR = np.zeros(3)
+            dR[j] = dx
+            dV = (harmonic.body_potential(self.R + dR) -
+                  harmonic.body_potential(self.R - dR))
+            a_j = -dV[0:, 0] / (2*dx) + self.R[0:, j]/r**3
+            self.assertTrue((np.fabs(a[0:, j] - a_j) < tol).all())
+
+    def test_rotation(self):
+        tol = 1e-15
+
+        harmonic = SphericalHarmonicGravity(self.C, self.S, omega=.1,
+                                            theta0=.2)
+        T = npr.rand(self.R.shape[0], 1) * 10
+        a = harmonic.acceleration(T, self.R)
+
+        self.assertTrue((np.fabs(np.linalg.norm(a, axis=1) - np.linalg.norm(
+            harmonic.body_acceleration(self.R), axis=1)) > tol).any())
+        self.assertTrue((np.fabs(a[0:, 2] - harmonic.body_acceleration(
+            self.R)[0:, 2]) > tol).any())
+
+        # the field is fixed in the rotating frame
+        harmonic.theta0 = 0.
+        harmonic.omega = 0.
+        theta = .2 + .1*T
+        c = np.cos(theta)[0:, 0]
+        s = np.sin(theta)[0:, 0]
+        R_body = np.stack((c*self.R[0:, 0] + s*self.R[0:, 1],
+                           -s*self.R[0:, 0] + c*self.R[0:, 1],
+                           self.R[0:, 2]), 1)
+        a_body = harmonic.body_acceleration(R_body)
+        a_z_diff = a[0:, 2] - a_body[0:, 2]
+        self.assertTrue((np.fabs(a_z_diff) < tol).all())
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'field.gfc')
+            with open(path, 'w') as coefficients:
+                coefficients.write('product_type gravity_field\n'
+                                   'earth_gravity_constant 3.986004415E+14\n'
+                                   'radius 6.3781363D+06\n'
+                                   'max_degree 3\n'
+                                   'norm fully_normalized\n'
+                                   'end_of_head ======\n'
+                                   'gfc 0 0 1.0 0.0 0.0 0.0\n'
+                                   'gfc 2 0 -4.84165D-04 0.0 0.0 0.0\n'
+                                   'gfc 2 2 2.4393D-06 -1.4003D-06 0 0\n'
+                                   'gfc 3 1 2.0304D-06 2.4820D-07 0 0\n')
+
+            harmonic = SphericalHarmonicGravity.from_file(path, 2)
+
+        self.assertEqual(harmonic.degree, 2)
+        self.assertEqual(harmonic.mu, 3.986004415e14)
+        self.assertEqual(harmonic.Re, 6.3781363e6)
+        self.assertEqual(harmonic.C[2, 0], -4.84165e-4)
+        self.assertEqual(harmonic.S[2, 2], -1.4003e-6)
+
+    def test_from_file_unnormalized(self):
+        tol = 1e-12
+
+        # 180! alone is beyond the float range
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'field.gfc')
+            with open(path, 'w') as coefficients:
+                coefficients.write('norm unnormalized\n'
+                                   'end_of_head ======\n'
+                                   'gfc 2 0 -1.08263D-03 0.0 0.0 0.0\n'
+                                   'gfc 90 90 1.0D-170 2.0D-170 0 0\n')
+
+            harmonic = SphericalHarmonicGravity.from_file(path, 90)
+
+        # N_nm = sqrt((2 - delta_m0) (2n+1) (n-m)! / (n+m)!)
+        N_20 = 5**.5
+        log_N = .5*(np.log(2*181) - np.sum(np.log(np.arange(1, 181))))
+        self.assertTrue(np.isfinite(harmonic.C).all())
+        self.assertTrue(abs(harmonic.C[2, 0] + 1.08263e-3/N_20) <
+                        tol*1e-3)
+        self.assertTrue(abs(harmonic.C[90, 90] /
+                            np.exp(np.log(1e-170) - log_N) - 1) < tol)
+        self.assertTrue(abs(harmonic.S[90, 90] / harmonic.C[90, 90] - 2) <
+                        tol)
@@ -0,0 +1,114 @@
+"""Created on Sat Oct 17 2026 08:03.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from .. import LyapunovElementSteering
+from .. import ThrustConstant
+from .. import TwoBody
+from .. import ZonalGravity
+from ..utilities import StateContext
+from ..utilities import SystemDynamics
+
+
+class TestStateContext(unittest.TestCase):
+    """Test class for StateContext."""
+
+    backend = 'numpy'
+
+    def setUp(self):
+        """."""
+        self.saved_backend = orb.get_backend()
+        orb.set_backend(self.backend)
+        m = 200
+        p = npr.rand(m, 1) * 10 + 1.
+        e = npr.rand(m, 1) * .9 + .05
+        i = npr.rand(m, 1) * np.pi*.9 + .05
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        self.COE = np.concatenate((p, e, i, W, w, f), 1)
+        self.T = np.arange(m).reshape((m, 1)) * .1
+        self.A = npr.randn(m, 3)
+
+    def states(self, element_set):
+        """Sample states in the given element set."""
+        to_set = dict(coe=lambda X: X, mee=orb.coe2mee, rv=orb.coe2rv)
+        return to_set[element_set](self.COE)
+
+    def tearDown(self):
+        """."""
+        orb.set_backend(self.saved_backend)
+
+    def test_memoized(self):
+        ctx = StateContext(self.T, self.COE, 1., 'coe')
+        self.assertIs(ctx.RV, ctx.RV)
+        self.assertIs(ctx.G, ctx.G)
+        self.assertIs(ctx.terms, ctx.terms)
+
+    def test_quantities(self):
+        tol = 1e-10
+
+        RV = self.states('rv')
+        r = np.linalg.norm(RV[0:, 0:3], axis=1, keepdims=True)
+        h = np.linalg.norm(np.cross(RV[0:, 0:3], RV[0:, 3:6]), axis=1,
+                           keepdims=True)
+        for element_set in ['coe', 'mee', 'rv']:
+            ctx = StateContext(self.T, self.states(element_set), 1.,
+                               element_set)
+            self.assertTrue((np.fabs(ctx.RV - RV) < tol).all())
+            self.assertTrue((np.fabs(ctx.r - r) < tol*r).all())
+            self.assertTrue((np.fabs(ctx.h - h) < tol*h).all())
+
+    def test_rates(self):
+        tol = 1e-12
+
+        for element_set in ['coe', 'mee', 'rv']:
+            X = self.states(element_set)
+            Xdot = StateContext(self.T, X, 1., element_set).rates(self.A)
+
+            ctx = StateContext(self.T, X, 1., element_set)
+            ctx.G
+            Xdot_G = ctx.rates(self.A)
+
+            scale = np.fabs(Xdot_G).max(axis=1, keepdims=True)
+            self.assertTrue((np.fabs(Xdot - Xdot_G) < tol*scale).all())
+
+    def test_system_dynamics(self):
+        tol = 1e-12
+
+        X = self.COE
+        plant = TwoBody(1., 'coe')
+        control = LyapunovElementSteering(1., np.eye(6), 1e-3, 'coe',
+                                          X[0:1] + .01)
+        perturbations = [ZonalGravity(ord=4),
+                         ThrustConstant(1., np.array([1e-4, 0, 1e-4]), 'coe')]
+
+        sys = SystemDynamics(plant, control, perturbations)
+        Xdot = sys(self.T, X)
+
+        Xdot_expected = plant(self.T, X) + control(self.T, X)
+        for perturb in perturbations:
+            Xdot_expected += perturb(self.T, X)
+
+        scale = np.fabs(Xdot_expected).max(axis=1, keepdims=True)
+        self.assertTrue((np.fabs(Xdot - Xdot_expected) < tol*scale).all())
+
+    def test_plant_without_context(self):
+        sys = SystemDynamics(lambda T, X: np.zeros(X.shape))
+        self.assertIsNone(sys.context(self.T, self.COE))
+        self.assertEqual(sys(self.T, self.COE).shape, self.COE.shape)
+
+
+@unittest.skipIf(orb.backend.numba is None, 'numba is not installed')
+class TestStateContextNumba(TestStateContext):
+    """Test class for StateContext, with the numba backend."""
+
+    backend = 'numba'
+
+
+if __name__ == '__main__':
+    unittest.main()
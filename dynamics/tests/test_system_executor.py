@@ -0,0 +1,138 @@
+"""Created on Sat Oct 17 2026 09:21.
+
+@author: Nathan Budd
+"""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from .. import GravityGrid
+from .. import LyapunovElementSteering
+from .. import ThrustConstant
+from .. import TwoBody
+from .. import ZonalGravity
+from ..utilities import SystemDynamics
+
+
+class TestSystemExecutor(unittest.TestCase):
+    """Test class for concurrent evaluation in SystemDynamics."""
+
+    def setUp(self):
+        """."""
+        m = 203
+        p = npr.rand(m, 1) * 5 + 1.5
+        e = npr.rand(m, 1) * .5 + .05
+        i = npr.rand(m, 1) * np.pi*.9 + .05
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        self.COE = np.concatenate((p, e, i, W, w, f), 1)
+        self.T = np.arange(m).reshape((m, 1)) * .1
+        self.executor = ThreadPoolExecutor(4)
+
+    def tearDown(self):
+        """."""
+        self.executor.shutdown()
+
+    def states(self, element_set):
+        """Sample states in the given element set."""
+        to_set = dict(coe=lambda X: X, mee=orb.coe2mee, rv=orb.coe2rv)
+        return to_set[element_set](self.COE)
+
+    def system(self, element_set, **kwargs):
+        """Plant, control and perturbations in the given element set."""
+        X0 = self.states(element_set)[0:1] + .01
+        control = LyapunovElementSteering(1., np.eye(6), 1e-3, element_set,
+                                          X0, T0=0.)
+        perturbations = [ZonalGravity(ord=4, elements=element_set),
+                         ThrustConstant(1., np.array([1e-4, 0, 1e-4]),
+                                        element_set)]
+        return SystemDynamics(TwoBody(1., element_set), control,
+                              perturbations, **kwargs)
+
+    def test_terms(self):
+        tol = 1e-14
+        for element_set in ['coe', 'mee']:
+            X = self.states(element_set)
+            Xdot = self.system(element_set)(self.T, X)
+            scale = np.fabs(Xdot).max(axis=1, keepdims=True)
+            for workspace in [False, True]:
+                sys = self.system(element_set, workspace=workspace,
+                                  executor=self.executor)
+                Xdot_terms = sys(self.T, X).copy()
+
+                self.assertTrue((np.fabs(Xdot_terms - Xdot) <=
+                                 tol*scale).all())
+                for k in range(10):
+                    np.testing.assert_array_equal(sys(self.T, X),
+                                                  Xdot_terms)
+
+    def test_chunks(self):
+        tol = 1e-14
+        X = self.states('mee')
+        Xdot = self.system('mee')(self.T, X)
+        scale = np.fabs(Xdot).max(axis=1, keepdims=True)
+        for workspace in [False, True]:
+            sys = self.system('mee', workspace=workspace,
+                              executor=self.executor, chunk_rows=50)
+            Xdot_chunks = sys(self.T, X).copy()
+
+            self.assertEqual(len(sys._replicas), 5)
+            self.assertTrue((np.fabs(Xdot_chunks - Xdot) <= tol*scale).all())
+            np.testing.assert_array_equal(sys(self.T, X), Xdot_chunks)
+
+    def test_small_batch(self):
+        tol = 1e-14
+        X = self.states('coe')[0:10]
+        sys = self.system('coe', executor=self.executor, chunk_rows=50)
+        Xdot = self.system('coe')(self.T[0:10], X)
+        scale = np.fabs(Xdot).max(axis=1, keepdims=True)
+
+        self.assertTrue((np.fabs(sys(self.T[0:10], X) - Xdot) <=
+                         tol*scale).all())
+        self.assertEqual(len(sys._replicas), 0)
+
+    def test_members_changed(self):
+        tol = 1e-14
+        X = self.states('mee')
+        sys = self.system('mee', executor=self.executor, chunk_rows=50)
+        Xdot = sys(self.T, X).copy()
+        replicas = list(sys._replicas)
+        sys(self.T, X)
+        self.assertIs(sys._replicas[0], replicas[0])
+
+        for change in ['a_t', 'perturbations']:
+            if change == 'a_t':
+                sys.control.a_t = 2e-3
+            else:
+                sys.perturbations.pop()
+            Xdot_new = sys(self.T, X).copy()
+            sys.executor = None
+            Xdot_ref = sys(self.T, X)
+            sys.executor = self.executor
+            scale = np.fabs(Xdot_ref).max(axis=1, keepdims=True)
+
+            self.assertIsNot(sys._replicas[0], replicas[0])
+            self.assertFalse((Xdot_new == Xdot).all())
+            self.assertTrue((np.fabs(Xdot_new - Xdot_ref) <=
+                             tol*scale).all())
+            replicas = list(sys._replicas)
+            Xdot = Xdot_new
+
+    def test_shared_grid(self):
+        X = self.states('mee')
+        grid = GravityGrid.build(ZonalGravity(ord=4, elements='mee'), 1., 8.,
+                                 shape=(4, 9, 8))
+        sys = SystemDynamics(TwoBody(1., 'mee'), None, [grid],
+                             executor=self.executor, chunk_rows=50)
+        sys(self.T, X)
+
+        self.assertEqual(len(sys._replicas), 5)
+        for replica in sys._replicas:
+            self.assertIsNot(replica.perturbations[0], grid)
+            self.assertIs(replica.perturbations[0].values, grid.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
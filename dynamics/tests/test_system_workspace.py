@@ -0,0 +1,118 @@
+"""Created on Sat Oct 17 2026 09:08.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from ...integrators import DormandPrince
+from .. import LyapunovElementSteering
+from .. import ProportionalElementControl
+from .. import ThrustConstant
+from .. import TwoBody
+from .. import ZonalGravity
+from ..utilities import SystemDynamics
+
+
+class TestSystemWorkspace(unittest.TestCase):
+    """Test class for the workspace mode of SystemDynamics."""
+
+    def setUp(self):
+        """."""
+        m = 40
+        p = npr.rand(m, 1) * 5 + 1.5
+        e = npr.rand(m, 1) * .5 + .05
+        i = npr.rand(m, 1) * np.pi*.9 + .05
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        self.COE = np.concatenate((p, e, i, W, w, f), 1)
+        self.T = np.arange(m).reshape((m, 1)) * .1
+
+    def system(self, element_set, **kwargs):
+        """Plant, control and perturbations in the given element set."""
+        X0 = self.states(element_set)[0:1]
+        plant = TwoBody(1., element_set)
+        control = None
+        if element_set != 'rv':
+            control = LyapunovElementSteering(1., np.eye(6), 1e-3,
+                                              element_set, X0)
+        perturbations = [ZonalGravity(ord=4, elements=element_set),
+                         ThrustConstant(1., np.array([1e-4, 0, 1e-4]),
+                                        element_set)]
+        return SystemDynamics(plant, control, perturbations, **kwargs)
+
+    def states(self, element_set):
+        """Sample states in the given element set."""
+        to_set = dict(coe=lambda X: X, mee=orb.coe2mee, rv=orb.coe2rv)
+        return to_set[element_set](self.COE)
+
+    def test_matches_default(self):
+        tol = 1e-14
+        for element_set in ['coe', 'mee', 'rv']:
+            X = self.states(element_set)
+            Xdot = self.system(element_set)(self.T, X)
+            Xdot_ws = self.system(element_set, workspace=True)(self.T, X)
+
+            scale = np.fabs(Xdot).max(axis=1, keepdims=True)
+            self.assertTrue((np.fabs(Xdot_ws - Xdot) <= tol*scale).all())
+
+    def test_plant_untouched(self):
+        for workspace in [False, True]:
+            X = self.states('mee')
+            sys = self.system('mee', workspace=workspace)
+            sys(self.T, X)
+
+            self.assertIsNot(sys.Xdot, sys.plant.Y)
+            np.testing.assert_array_equal(sys.plant.Y,
+                                          TwoBody(1., 'mee')(self.T, X))
+
+    def test_buffers(self):
+        X = self.states('coe')
+        sys = self.system('coe', workspace=True, max_workspaces=2)
+
+        Xdot = sys(self.T, X)
+        self.assertIs(sys(self.T + 1., X), Xdot)
+        Y = sys.plant.Y
+        sys(self.T, X + 1e-3)
+        self.assertIs(sys.plant.Y, Y)
+
+        Xdot_short = sys(self.T[0:5], X[0:5])
+        self.assertIsNot(Xdot_short, Xdot)
+        self.assertEqual(Xdot_short.shape, (5, 6))
+        self.assertIs(sys(self.T, X), Xdot)
+
+        sys(self.T[0:3], X[0:3])
+        self.assertEqual(len(sys._workspaces), 2)
+        self.assertIsNot(sys(self.T[0:5], X[0:5]), Xdot_short)
+
+    def test_out(self):
+        X = self.states('rv')
+        out = np.empty(X.shape)
+        for func in [TwoBody(1., 'rv'), ZonalGravity(ord=3, elements='rv'),
+                     ThrustConstant(1., np.array([0., 1e-3, 0.]), 'rv')]:
+            Xdot = func(self.T, X)
+            self.assertIs(func(self.T, X, out=out), out)
+            np.testing.assert_array_equal(out, Xdot)
+
+        X = self.states('mee')
+        for control in [LyapunovElementSteering, ProportionalElementControl]:
+            func = control(1., np.eye(6), 1e-3, 'mee', X[0:1] + .01)
+            Xdot = func(self.T, X)
+            self.assertIs(func(self.T, X, out=out), out)
+            np.testing.assert_array_equal(out, Xdot)
+
+    def test_integration(self):
+        X0 = self.states('mee')[1:9]
+        T0 = np.zeros((8, 1))
+        results = []
+        for workspace in [False, True]:
+            sys = self.system('mee', workspace=workspace)
+            integrator = DormandPrince(sys, rtol=1e-10, atol=1e-12)
+            results.append(integrator.propagate(T0, X0, .5))
+        np.testing.assert_array_equal(results[0], results[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
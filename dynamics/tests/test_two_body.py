@@ -0,0 +1,86 @@
+"""Created on Sat Oct 17 2026 08:13.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from .. import TwoBody
+
+
+class TestTwoBody(unittest.TestCase):
+    """Test class for TwoBody."""
+
+    def setUp(self):
+        """."""
+        self.COE0 = np.array([[1.5, .3, 1., .2, .3, 1.]])
+        self.T = np.linspace(2., 40., 20).reshape((20, 1))
+        self.to_set = dict(coe=lambda X: X, mee=orb.coe2mee, rv=orb.coe2rv)
+        self.to_rv = dict(coe=orb.coe2rv, mee=orb.mee2rv, rv=lambda X: X)
+
+    def test_reference(self):
+        tol = 1e-12
+
+        RV = orb.propagate_rv(np.tile(orb.coe2rv(self.COE0), (20, 1)),
+                              self.T - 2.)
+        for element_set in ['coe', 'mee', 'rv']:
+            X0 = self.to_set[element_set](self.COE0)
+            Y = TwoBody(1., element_set, X0=X0, T0=2.)(self.T)
+
+            self.assertEqual(Y.shape, (20, 6))
+            self.assertTrue((np.fabs(Y[0] - X0[0]) < tol).all())
+            self.assertTrue((np.fabs(self.to_rv[element_set](Y) - RV) <
+                             tol*10).all())
+
+    def test_reference_hyperbolic(self):
+        tol = 1e-10
+
+        COE0 = np.array([[1.5, 1.3, 1., .2, .3, 1.]])
+        Y = TwoBody(1., 'coe', X0=COE0, T0=0.)(self.T)
+        RV = orb.propagate_rv(np.tile(orb.coe2rv(COE0), (20, 1)), self.T)
+
+        scale = np.fabs(RV).max(axis=1, keepdims=True)
+        self.assertTrue((np.fabs(orb.coe2rv(Y) - RV) < tol*scale).all())
+
+    def test_epoch(self):
+        tol = 1e-12
+
+        for element_set in ['coe', 'mee', 'rv']:
+            X0 = self.to_set[element_set](self.COE0)
+
+            # without T0, X0 is at the first time of each call
+            reference = TwoBody(1., element_set, X0=X0)
+            Y = reference(self.T)
+            Y_late = reference(self.T[5:])
+            self.assertTrue((np.fabs(Y_late[0] - X0[0]) < tol).all())
+            self.assertTrue((np.fabs(Y[0] - X0[0]) < tol).all())
+            self.assertFalse((np.fabs(Y_late[0] - Y[5]) < tol).all())
+
+            # with T0, calls agree whatever their first time
+            reference = TwoBody(1., element_set, X0=X0, T0=2.)
+            Y = reference(self.T)
+            Y_late = reference(self.T[5:])
+            self.assertTrue((np.fabs(Y_late - Y[5:]) < tol*10).all())
+
+    def test_mee_dynamics(self):
+        tol = 1e-12
+
+        m = 100
+        p = npr.rand(m, 1) * 10 + 1.
+        e = npr.rand(m, 1) * .9
+        i = npr.rand(m, 1) * np.pi*.9 + .05
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        COE = np.concatenate((p, e, i, W, w, f), 1)
+        T = np.zeros((m, 1))
+
+        Xdot_coe = TwoBody(1., 'coe')(T, COE)
+        Xdot_mee = TwoBody(1., 'mee')(T, orb.coe2mee(COE))
+
+        self.assertTrue((np.fabs(Xdot_mee - Xdot_coe) < tol).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
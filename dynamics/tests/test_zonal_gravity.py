@@ -0,0 +1,98 @@
+"""Created on Sat Oct 17 2026 07:46.
+
+@author: Nathan Budd
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+import numpy.random as npr
+from ... import orbit as orb
+from ..zonal_gravity import ZonalGravity
+
+
+class TestZonalGravity(unittest.TestCase):
+    """Test class for ZonalGravity."""
+
+    def setUp(self):
+        """."""
+        m = 100
+        R = npr.randn(m, 3)
+        self.R = R / np.linalg.norm(R, axis=1, keepdims=True) * (
+            1. + npr.rand(m, 1))
+        self.J = (npr.randn(19) * 1e-3).tolist()
+
+    def test_J2(self):
+        tol = 1e-15
+
+        zonal = ZonalGravity(2)
+        a = zonal.acceleration(self.R)
+
+        J2 = zonal.J[0]
+        r = np.linalg.norm(self.R, axis=1, keepdims=True)
+        z_by_r = self.R[0:, 2:3] / r
+        a_J2 = -1.5 * J2 / r**4 * self.R/r * (1. - 5.*z_by_r**2)
+        a_J2[0:, 2:3] = (-1.5 * J2 / r**4 * z_by_r * (3. - 5.*z_by_r**2))
+
+        self.assertTrue((np.fabs(a - a_J2) < tol).all())
+
+    def test_gradient(self):
+        tol = 1e-8
+        dx = 1e-5
+
+        zonal = ZonalGravity(20, J=self.J)
+        a = zonal.acceleration(self.R)
+
+        for j in range(3):
+            dR = np.zeros(3)
+            dR[j] = dx
+            dV = zonal.potential(self.R + dR) - zonal.potential(self.R - dR)
+            a_j = (-dV / (2*dx))[0:, 0] - (-1./np.linalg.norm(
+                self.R, axis=1)**3 * self.R[0:, j])
+            self.assertTrue((np.fabs(a[0:, j] - a_j) < tol).all())
+
+    def test_element_sets(self):
+        tol = 1e-7
+        dt = 1e-2
+
+        m = 100
+        p = npr.rand(m, 1) * 5 + 1.
+        e = npr.rand(m, 1) * .5 + .1
+        i = npr.rand(m, 1) * np.pi*.8 + .1
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        COE = np.concatenate((p, e, i, W, w, f), 1)
+        MEE = orb.coe2mee(COE)
+        RV = orb.coe2rv(COE)
+
+        COE_dot = ZonalGravity(6, elements='coe')(None, COE)
+        MEE_dot = ZonalGravity(6, elements='mee')(None, MEE)
+        RV_dot = ZonalGravity(6, elements='rv')(None, RV)
+
+        # chain rule through the element conversion
+        MEE_dot_fd = orb.diff_elements(orb.coe2mee(COE + dt*COE_dot),
+                                       orb.coe2mee(COE - dt*COE_dot)) / (2*dt)
+        MEE_diff = (MEE_dot - MEE_dot_fd) / np.fabs(MEE_dot).max(axis=0)
+        self.assertTrue((np.fabs(MEE_diff) < tol).all())
+
+        a = ZonalGravity(6).acceleration(RV[0:, 0:3])
+        self.assertTrue((RV_dot[0:, 0:3] == 0.).all())
+        self.assertTrue((RV_dot[0:, 3:6] == a).all())
+
+    def test_from_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'zonal.txt')
+            with open(path, 'w') as table:
+                table.write('# n J_n\n0 1.\n1 0.\n2 1e-3\n4 -2e-6\n')
+
+            zonal = ZonalGravity.from_table(path)
+
+        self.assertEqual(zonal.J, [1e-3, 0., -2e-6])
+
+    def test_degree_too_high(self):
+        with self.assertRaises(ValueError):
+            ZonalGravity(20)
+        with self.assertRaises(ValueError):
+            ZonalGravity(4, J=[1e-3, 0.])
+        self.assertEqual(len(ZonalGravity(6).J), 5)
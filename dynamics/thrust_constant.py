@@ -13,12 +13,16 @@ class ThrustConstant():
     ----------------
     vector : numpy.array
         3x1 column vector representing the LVLH-constant acceleration applied.
-    gve : reference to GaussVariationalEqns.*element(X)
+    gve : GaussVariationalEqns
         Takes the constant LVLH acceleration vector into state space time
         derivatives.
     Xdot : ndarray
         The most recently computed call output
     """
+
+    uses_context = True
+    accepts_out = True
+
     def __init__(self, mu, vector, elements):
         """.
         Parameters
@@ -29,24 +33,22 @@ class ThrustConstant():
             Indicates the set of element time derivatives that will be output.
             Allowable values: coe, mee, rv
         """
-        gve = dict(coe=GaussVariationalEqns(mu).coe,
-                   mee=GaussVariationalEqns(mu).mee,
-                   rv=GaussVariationalEqns(mu).rv)
-
         self.vector = vector
-        self.gve = gve[elements]
+        self.gve = GaussVariationalEqns(mu, elements)
         self.Xdot = np.array([[]])
 
-    def __call__(self, T, X):
+    def __call__(self, T, X, ctx=None, out=None):
         """Output the result of an LVLH-constant thrust vector.
 
-        See dynamics_abstract.py for more details.
+        See dynamics_abstract.py for more details. The GVE intermediates are
+        taken from ctx, a shared StateContext, when given. The result is
+        placed in out, an mxn array, when given.
         """
-        Gs = self.gve(X)
-
-        Xdot = np.zeros(X.shape)
-        for i, G in enumerate(Gs):
-            Xdot[i, :] = np.dot(G, self.vector).T
+        A = np.broadcast_to(self.vector.reshape((1, 3)), (X.shape[0], 3))
+        if ctx is None:
+            Xdot = self.gve.rates(X, A, out=out)
+        else:
+            Xdot = ctx.rates(A, out=out)
 
         self.Xdot = Xdot
         return Xdot
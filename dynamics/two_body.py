@@ -5,6 +5,7 @@
 import numpy as np
 import numpy.linalg as npl
 from .. import orbit as orb
+from .utilities import StateContext
 
 
 class TwoBody():
@@ -26,18 +27,30 @@ class TwoBody():
         X0_coe = [p e i W w f]
         X0_mee = [p f g h k L]
         X0_rv = [rx ry rz vx vy vz]
+    T0 : float or None
+        The epoch of X0. If None, X0 is at the first requested time of each
+        reference call.
     Y : ndarray
         The most recent call output.
     """
 
-    def __init__(self, mu, element_set, X0=None):
+    uses_context = True
+    accepts_out = True
+
+    # the varying angle and the branch of the reference trajectories
+    reference_angles = dict(coe=dict(angle_idx=[5], angle_min=-np.pi),
+                            mee=dict(angle_idx=[5], angle_min=0.),
+                            rv=dict(angle_idx=[]))
+
+    def __init__(self, mu, element_set, X0=None, T0=None):
         """."""
         self.mu = mu
         self.element_set = element_set
         self.X0 = X0
+        self.T0 = T0
         self.Y = np.array([[]])
 
-    def __call__(self, T, X=None):
+    def __call__(self, T, X=None, ctx=None, out=None):
         """Evaluate the dynamics or reference trajectory at the sample times.
 
         Parameters
@@ -47,6 +60,12 @@ class TwoBody():
         X : ndarray
             An mxn array of states.
             Not necessary when calling for a reference trajectory.
+        ctx : StateContext, optional
+            Shared quantities derived from T and X.
+            Ignored when calling for a reference trajectory.
+        out : ndarray, optional
+            An mxn array in which to place the state derivatives.
+            Ignored when calling for a reference trajectory.
 
         Outputs
         -------
@@ -62,11 +81,11 @@ class TwoBody():
                          rv=self._rv_reference)
 
         if self.X0 is None:
-            return dyn_funcs[self.element_set](T, X)
+            return dyn_funcs[self.element_set](T, X, ctx, out)
         else:
             return ref_funcs[self.element_set](T)
 
-    def _coe_dynamics(self, T, X):
+    def _coe_dynamics(self, T, X, ctx=None, out=None):
         """COE dynamics function.
 
         Parameters
@@ -75,26 +94,26 @@ class TwoBody():
             An mx1 column array of sample times.
         X : ndarray
             An mxn array of states.
+        ctx : StateContext, optional
+            Shared quantities derived from T and X.
+        out : ndarray, optional
+            An mxn array in which to place the result.
 
         Outputs
         -------
         Y : ndarray
             An mxn array of state derivatives
         """
-        p = X[:, 0]
-        e = X[:, 1]
-        f = X[:, 5]
-        r = p / (1. + np.multiply(e, np.cos(f)))
-        h = np.power(self.mu * p, .5)
-        f_dot = h / np.power(r, 2)
-
-        shape = X.shape
-        self.Y = np.zeros(shape)
+        if ctx is None:
+            ctx = StateContext(T, X, self.mu, 'coe')
+        f_dot = ctx.h[0:, 0] / np.power(ctx.r[0:, 0], 2)
+
+        self.Y = self._zero_rates(X, out)
         self.Y[:, -1] = f_dot
 
         return self.Y
 
-    def _mee_dynamics(self, T, X):
+    def _mee_dynamics(self, T, X, ctx=None, out=None):
         """MEE dynamics function.
 
         Parameters
@@ -103,17 +122,26 @@ class TwoBody():
             An mx1 column array of sample times.
         X : ndarray
             An mxn array of states.
+        ctx : StateContext, optional
+            Shared quantities derived from T and X.
+        out : ndarray, optional
+            An mxn array in which to place the result.
 
         Outputs
         -------
         Y : ndarray
             An mxn array of state derivatives
         """
-        print('_mee_dynamics IS INCOMPLETE!!')
+        if ctx is None:
+            ctx = StateContext(T, X, self.mu, 'mee')
+        L_dot = ctx.h[0:, 0] / np.power(ctx.r[0:, 0], 2)
 
-        return None
+        self.Y = self._zero_rates(X, out)
+        self.Y[:, -1] = L_dot
 
-    def _rv_dynamics(self, T, X):
+        return self.Y
+
+    def _rv_dynamics(self, T, X, ctx=None, out=None):
         """MEE dynamics function.
 
         Parameters
@@ -122,6 +150,10 @@ class TwoBody():
             An mx1 column array of sample times.
         X : ndarray
             An mxn array of states.
+        ctx : StateContext, optional
+            Shared quantities derived from T and X.
+        out : ndarray, optional
+            An mxn array in which to place the result.
 
         Outputs
         -------
@@ -131,17 +163,33 @@ class TwoBody():
         # take the 2 norm at each instance in time (across the rows)
         R = X[:, 0:3]
         V = X[:, 3:6]
-        Rnorm = npl.norm(R, 2, 1, True)
+        if ctx is None:
+            Rnorm = npl.norm(R, 2, 1, True)
+        else:
+            Rnorm = ctx.r
         neg_mu_by_r3 = -self.mu / np.power(Rnorm, 3)
-        Neg_mu_by_r3 = (neg_mu_by_r3 * np.ones((1, 1)))
-        Vdot = np.multiply(Neg_mu_by_r3, R)
-        self.Y = np.concatenate((V, Vdot), 1)
+        if out is None:
+            out = np.empty(X.shape)
+        out[:, 0:3] = V
+        np.multiply(neg_mu_by_r3, R, out=out[:, 3:6])
+        self.Y = out
 
         return self.Y
 
+    @staticmethod
+    def _zero_rates(X, out):
+        """Zero the mxn output array, allocating it if not given."""
+        if out is None:
+            return np.zeros(X.shape)
+        out[...] = 0.
+        return out
+
     def _coe_reference(self, T):
         """COE reference function.
 
+        Elliptic references advance the mean anomaly in closed form, others
+        are propagated in RV.
+
         Parameters
         ----------
         T : ndarray
@@ -152,15 +200,18 @@ class TwoBody():
         Y : ndarray
             An mxn array of reference states.
         """
-        T0 = T[0, 0]
         p = self.X0[0, 0]
         e = self.X0[0, 1]
+        if e >= 1.:
+            RV0 = orb.coe2rv(self.X0, self.mu)
+            return orb.rv2coe(self._rv_propagate(RV0, T), self.mu)
+
         a = p / (1. - e**2)
         Mdot = (self.mu / a**3)**.5
 
-        dT = T - T0
+        dT = T - self._epoch(T)
         dM = dT * Mdot
-        Y_ref_M = np.tile(self.X0, T.shape)
+        Y_ref_M = np.tile(orb.E2M(orb.f2E(self.X0)), T.shape)
         Y_ref_M[0:, -1:] = Y_ref_M[0:, -1:] + dM
 
         Y = orb.M2f(Y_ref_M)
@@ -179,12 +230,11 @@ class TwoBody():
         Y : ndarray
             An mxn array of reference states.
         """
-        print('_mee_reference IS INCOMPLETE!!')
-
-        return None
+        RV0 = orb.mee2rv(self.X0, self.mu)
+        return orb.rv2mee(self._rv_propagate(RV0, T), self.mu)
 
     def _rv_reference(self, T):
-        """MEE reference function.
+        """RV reference function.
 
         Parameters
         ----------
@@ -196,16 +246,23 @@ class TwoBody():
         Y : ndarray
             An mxn array of reference states.
         """
-        print('_rv_reference IS INCOMPLETE!!')
+        return self._rv_propagate(self.X0, T)
+
+    def _rv_propagate(self, RV0, T):
+        """Propagate the 1x6 RV0 from the epoch to each of the mx1 times T."""
+        return orb.propagate_rv(np.tile(RV0, T.shape), T - self._epoch(T),
+                                self.mu)
 
-        return None
+    def _epoch(self, T):
+        """The epoch of X0, T0 or else the first of the times T."""
+        return T[0, 0] if self.T0 is None else self.T0
 
     def __repr__(self):
         """Printable represenation of the object."""
-        return 'ModelCOE({}, {}, {})'.format(self.mu, self.element_set,
-                                             self.X0)
+        return 'TwoBody({}, {}, {}, {})'.format(self.mu, self.element_set,
+                                                self.X0, self.T0)
 
     def __str__(self):
         """Human readable represenation of the object."""
-        return ('ModelCOE(mu={}, element_set={}, X0={})'
-                .format(self.mu, self.element_set, self.X0))
+        return ('TwoBody(mu={}, element_set={}, X0={}, T0={})'
+                .format(self.mu, self.element_set, self.X0, self.T0))
@@ -1,7 +1,17 @@
 from .diff_elements_theta_into_p import diff_elements_theta_into_p
 from .gauss_variational_eqns import GaussVariationalEqns
+from .gravity_coefficients import read_gravity_coefficients
+from .legendre import legendre
+from .perturbation_rates import perturbation_rates
+from .reference_cache import ReferenceCache
+from .state_context import StateContext
 from .system_dynamics import SystemDynamics
 
 __all__ = ['diff_elements_theta_into_p',
            'GaussVariationalEqns',
+           'legendre',
+           'perturbation_rates',
+           'read_gravity_coefficients',
+           'ReferenceCache',
+           'StateContext',
            'SystemDynamics']
@@ -2,9 +2,11 @@
 
 @author: Nathan Budd
 """
+import math
 import numpy as np
 import numpy.linalg as npl
-from math import cos, sin
+from ...orbit.backend import jit
+from ...orbit.backend import use_jit
 
 
 class GaussVariationalEqns():
@@ -12,8 +14,10 @@ class GaussVariationalEqns():
 
     A collection of methods for the Gauss Variational Equations
     in different element sets. A set of state histories is passed as input, and
-    the output is a list of GVE matrices, mapping LVLH frame
-    accelerations into orbital element derivatives.
+    the output is an mx6x3 array of GVE matrices, mapping LVLH frame
+    accelerations into orbital element derivatives. The whole batch is
+    computed at once, or row by row by compiled loops for float64 batches
+    under the numba backend.
 
     Instance Members
     -------
@@ -28,7 +32,7 @@ class GaussVariationalEqns():
         self.mu = mu
         self.element_set = element_set
 
-    def __call__(self, X):
+    def __call__(self, X, out=None, terms=None):
         """Gauss Variational Equations
 
         Input
@@ -36,142 +40,434 @@ class GaussVariationalEqns():
         X : ndarray
         Time history array (mx6) of elements, where
         m is the number of samples.
+        out : ndarray, optional
+        mx6x3 array in which to place the result.
+        terms : tuple, optional
+        Shared intermediates of X, as returned by terms.
 
         Output
         ------
-        G : list of ndarray
-        A 6x3 array of each element's time derivative as a result of
-        disturbances in the r, theta, and angular momentum directions.
+        G : ndarray
+        An mx6x3 array. Each 6x3 entry maps disturbances in the r, theta, and
+        angular momentum directions into each element's time derivative.
         """
         G_funcs = dict(mee=self._mee,
                        coe=self._coe,
                        rv=self._rv)
 
-        return G_funcs[self.element_set](X)
+        if out is None:
+            out = np.zeros((X.shape[0], 6, 3))
+        else:
+            out[...] = 0.
 
-    def _mee(self, X):
-        """Gauss Variational Equations for MEEs.
+        G_rows = _G_rows[self.element_set]
+        if terms is None and use_jit(G_rows, X, out):
+            return G_rows(X, self.mu, out)
+
+        if terms is None:
+            terms = self.terms(X)
+
+        return G_funcs[self.element_set](terms, out)
+
+    def rates(self, X, A, out=None, terms=None):
+        """Element time derivatives resulting from LVLH accelerations.
+
+        Equivalent to G @ a for every sample, without forming G.
+
+        Input
+        -----
+        X : ndarray
+        Time history array (mx6) of elements, where
+        m is the number of samples.
+        A : ndarray
+        mx3 array of accelerations in the r, theta, and angular momentum
+        directions.
+        out : ndarray, optional
+        mx6 array in which to place the result.
+        terms : tuple, optional
+        Shared intermediates of X, as returned by terms.
+
+        Output
+        ------
+        Xdot : ndarray
+        An mx6 array of element time derivatives.
+        """
+        rate_funcs = dict(mee=self._mee_rates,
+                          coe=self._coe_rates,
+                          rv=self._rv_rates)
+
+        if out is None:
+            out = np.zeros(X.shape)
+
+        rates_rows = _rates_rows[self.element_set]
+        if terms is None and use_jit(rates_rows, X, A, out):
+            return rates_rows(X, A, self.mu, out)
+
+        if terms is None:
+            terms = self.terms(X)
+
+        return rate_funcs[self.element_set](terms, A, out)
+
+    def terms(self, X, trig=None):
+        """Intermediates shared by the GVE matrices and rates.
 
         Input
         -----
         X : ndarray
-        Time history array (mx6) of MEE [p f g h k L], where
+        Time history array (mx6) of elements, where
         m is the number of samples.
+        trig : tuple, optional
+        Precomputed mx1 sine and cosine of the phase angle X[0:, 5:6].
+        Ignored for rv.
 
         Output
         ------
-        G : list of ndarray
-        A 6x3 array of each element's time derivative as a result of
+        terms : tuple
+        Intermediates consumed by __call__ and rates.
+        """
+        if self.element_set == 'rv':
+            return self._rv_terms(X)
+
+        if trig is None:
+            trig = np.sin(X[0:, 5:6]), np.cos(X[0:, 5:6])
+        s, c = trig[0][0:, 0], trig[1][0:, 0]
+
+        if self.element_set == 'mee':
+            return self._mee_terms(X, s, c)
+        return self._coe_terms(X, s, c)
+
+    def _mee_terms(self, X, sL, cL):
+        """Quantities shared by the MEE matrices and rates."""
+        p = X[0:, 0]
+        f = X[0:, 1]
+        g = X[0:, 2]
+        h = X[0:, 3]
+        k = X[0:, 4]
+
+        s2 = 1. + h**2 + k**2
+        w = 1. + f*cL + g*sL
+        rt_p_mu = (p/self.mu)**.5
+        hk = (h*sL - k*cL) / w
+
+        return p, f, g, sL, cL, s2, w, rt_p_mu, hk
+
+    def _mee(self, terms, G):
+        """Gauss Variational Equations for MEEs.
+
+        Input
+        -----
+        terms : tuple
+        Intermediates of the MEE [p f g h k L], see terms.
+        G : ndarray
+        Zeroed mx6x3 array in which to place the result.
+
+        Output
+        ------
+        G : ndarray
+        An mx6x3 array of each element's time derivative as a result of
         disturbances in the r, theta, and angular momentum directions.
         """
-        G = [np.array([[]]) for x in X]
-        for i, x in enumerate(X):
-            p = x[0]
-            f = x[1]
-            g = x[2]
-            h = x[3]
-            k = x[4]
-            L = x[5]
-
-            sL = sin(L)
-            cL = cos(L)
-            s = (1. + h**2 + k**2)**.5
-            w = 1. + f*cL + g*sL
-            rt_p_mu = (p/self.mu)**.5
-
-            pdot = [0., 2*p/w, 0.]
-            fdot = [sL, ((w+1)*cL + f)/w, -g*(h*sL - k*cL)/w]
-            gdot = [-cL, ((w+1.)*sL + g)/w, f*(h*sL - k*cL)/w]
-            hdot = [0., 0., s*s*cL/2/w]
-            kdot = [0., 0., s*s*sL/2/w]
-            Ldot = [0., 0., (h*sL - k*cL)/w]
-
-            G[i] = np.array([pdot, fdot, gdot, hdot, kdot, Ldot]) * rt_p_mu
+        p, f, g, sL, cL, s2, w, rt_p_mu, hk = terms
+
+        G[0:, 0, 1] = 2*p/w
+        G[0:, 1, 0] = sL
+        G[0:, 1, 1] = ((w+1)*cL + f)/w
+        G[0:, 1, 2] = -g*hk
+        G[0:, 2, 0] = -cL
+        G[0:, 2, 1] = ((w+1.)*sL + g)/w
+        G[0:, 2, 2] = f*hk
+        G[0:, 3, 2] = s2*cL/2/w
+        G[0:, 4, 2] = s2*sL/2/w
+        G[0:, 5, 2] = hk
+        G *= rt_p_mu.reshape((-1, 1, 1))
         return G
 
-    def _coe(self, X):
+    def _mee_rates(self, terms, A, Xdot):
+        """Fused MEE rates, see rates."""
+        p, f, g, sL, cL, s2, w, rt_p_mu, hk = terms
+        a_r = A[0:, 0]
+        a_t = A[0:, 1]
+        a_h = A[0:, 2]
+
+        Xdot[0:, 0] = 2*p/w*a_t
+        Xdot[0:, 1] = sL*a_r + ((w+1)*cL + f)/w*a_t - g*hk*a_h
+        Xdot[0:, 2] = -cL*a_r + ((w+1.)*sL + g)/w*a_t + f*hk*a_h
+        Xdot[0:, 3] = s2*cL/2/w*a_h
+        Xdot[0:, 4] = s2*sL/2/w*a_h
+        Xdot[0:, 5] = hk*a_h
+        Xdot *= rt_p_mu.reshape((-1, 1))
+        return Xdot
+
+    def _coe_terms(self, X, sf, cf):
+        """Quantities shared by the COE matrices and rates."""
+        p = X[0:, 0]
+        e = X[0:, 1]
+        i = X[0:, 2]
+        w = X[0:, 4]
+        f = X[0:, 5]
+
+        st = np.sin(f + w)
+        ct = np.cos(f + w)
+        si = np.sin(i)
+        ci = np.cos(i)
+        a = p / (1. - e**2)
+        r = p / (1. + e*cf)
+        h = (self.mu * p)**.5
+
+        return p, e, sf, cf, st, ct, si, ci, a, r, h
+
+    def _coe(self, terms, G):
         """Gauss Variational Equations for COEs.
 
         Input
         -----
-        X : ndarray
-        Time history array (mx6) of COE [p e i W w f], where
-        m is the number of samples.
+        terms : tuple
+        Intermediates of the COE [p e i W w f], see terms.
+        G : ndarray
+        Zeroed mx6x3 array in which to place the result.
 
         Output
         ------
-        G : list of ndarray
-        A 6x3 array of each element's time derivative as a result of
+        G : ndarray
+        An mx6x3 array of each element's time derivative as a result of
         disturbances in the r, theta, and angular momentum directions.
         """
-        G = [np.zeros((6, 3)) for x in X]
-        for k, x in enumerate(X):
-            p = x[0]
-            e = x[1]
-            i = x[2]
-            W = x[3]
-            w = x[4]
-            f = x[5]
-
-            sf = sin(f)
-            cf = cos(f)
-            st = sin(f + w)
-            ct = cos(f + w)
-            si = sin(i)
-            ci = cos(i)
-            a = p / (1. - e**2)
-            r = p / (1. + e*cf)
-            h = (self.mu * p)**.5
-
-            adot = np.array([e*sf, p/r, 0.]) * 2*a**2/h
-            edot = np.array([p*sf, (p+r)*cf + r*e, 0.]) / h
-            pdot = adot*(1-e**2) - 2*a*e*edot
-            idot = np.array([0., 0., r*ct/h])
-            Wdot = np.array([0., 0., r*st/h/si])
-            wdot = np.array([-p*cf/e, (p+r)*sf/e, -r*st*ci/si]) / h
-            fdot = np.array([p*cf, -(p+r)*sf, 0.]) / h / e
-
-            G[k][0] = pdot
-            G[k][1] = edot
-            G[k][2] = idot
-            G[k][3] = Wdot
-            G[k][4] = wdot
-            G[k][5] = fdot
+        p, e, sf, cf, st, ct, si, ci, a, r, h = terms
+
+        # adot = [e*sf, p/r, 0] * 2*a**2/h
+        adot_r = e*sf * 2*a**2/h
+        adot_t = p/r * 2*a**2/h
+        G[0:, 1, 0] = p*sf / h
+        G[0:, 1, 1] = ((p+r)*cf + r*e) / h
+        G[0:, 0, 0] = adot_r*(1-e**2) - 2*a*e*G[0:, 1, 0]
+        G[0:, 0, 1] = adot_t*(1-e**2) - 2*a*e*G[0:, 1, 1]
+        G[0:, 2, 2] = r*ct/h
+        G[0:, 3, 2] = r*st/h/si
+        G[0:, 4, 0] = -p*cf/e / h
+        G[0:, 4, 1] = (p+r)*sf/e / h
+        G[0:, 4, 2] = -r*st*ci/si / h
+        G[0:, 5, 0] = p*cf / h / e
+        G[0:, 5, 1] = -(p+r)*sf / h / e
         return G
 
-    def _rv(self, X):
+    def _coe_rates(self, terms, A, Xdot):
+        """Fused COE rates, see rates."""
+        p, e, sf, cf, st, ct, si, ci, a, r, h = terms
+        a_r = A[0:, 0]
+        a_t = A[0:, 1]
+        a_h = A[0:, 2]
+
+        adot = (e*sf*a_r + p/r*a_t) * 2*a**2/h
+        edot = (p*sf*a_r + ((p+r)*cf + r*e)*a_t) / h
+        Xdot[0:, 0] = adot*(1-e**2) - 2*a*e*edot
+        Xdot[0:, 1] = edot
+        Xdot[0:, 2] = r*ct/h*a_h
+        Xdot[0:, 3] = r*st/h/si*a_h
+        Xdot[0:, 4] = (-p*cf/e*a_r + (p+r)*sf/e*a_t - r*st*ci/si*a_h) / h
+        Xdot[0:, 5] = (p*cf*a_r - (p+r)*sf*a_t) / h / e
+        return Xdot
+
+    def _rv_terms(self, X):
+        """LVLH unit vectors, each mx3."""
+        r = X[0:, 0:3]
+        v = X[0:, 3:6]
+        h = np.cross(r, v)
+
+        i_r = r / npl.norm(r, ord=2, axis=1).reshape((-1, 1))
+        i_h = h / npl.norm(h, ord=2, axis=1).reshape((-1, 1))
+        i_theta = np.cross(i_h, i_r)
+
+        return i_r, i_theta, i_h
+
+    def _rv(self, terms, G):
         """Gauss Variational Equations for RV.
 
         Input
         -----
-        X : ndarray
-        Time history array (mx6) of COE [p e i W w f], where
-        m is the number of samples.
+        terms : tuple
+        LVLH unit vectors of the RV [rx ry rz vx vy vz], see terms.
+        G : ndarray
+        Zeroed mx6x3 array in which to place the result.
 
         Output
         ------
-        G : list of ndarray
-        A 6x3 array of each element's time derivative as a result of
+        G : ndarray
+        An mx6x3 array of each element's time derivative as a result of
         disturbances in the r, theta, and angular momentum directions.
         """
-        G = [np.zeros((6, 3)) for x in X]
-        for k, x in enumerate(X):
-            r = x[0:3].reshape((3, 1))
-            v = x[3:6].reshape((3, 1))
-            h = np.cross(r, v)
+        i_r, i_theta, i_h = terms
 
-            i_r = r / npl.norm(r)
-            i_h = h / npl.norm(h)
-            i_theta = np.cross(i_h, i_r)
+        G[0:, 3:6, 0] = i_r
+        G[0:, 3:6, 1] = i_theta
+        G[0:, 3:6, 2] = i_h
+        return G
 
-            G[k][3:6, 0:] = np.concatenate((i_r, i_theta, i_h), 1)
+    def _rv_rates(self, terms, A, Xdot):
+        """Fused RV rates, see rates."""
+        i_r, i_theta, i_h = terms
 
-        return G
+        Xdot[0:, 0:3] = 0.
+        Xdot[0:, 3:6] = (i_r*A[0:, 0:1] + i_theta*A[0:, 1:2] +
+                         i_h*A[0:, 2:3])
+        return Xdot
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'GaussVariationalEqns({}, {})'.format(self.mu,
+                                                     self.element_set)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'GaussVariationalEqns(mu={}, element_set={})'.format(
+            self.mu, self.element_set)
+
+
+@jit
+def _mee_rows(X, mu, G):
+    """Compiled GaussVariationalEqns._mee from the MEE X, into zeroed G."""
+    for j in range(X.shape[0]):
+        p, f, g, h, k = X[j, 0], X[j, 1], X[j, 2], X[j, 3], X[j, 4]
+        sL = math.sin(X[j, 5])
+        cL = math.cos(X[j, 5])
+        s2 = 1. + h**2 + k**2
+        w = 1. + f*cL + g*sL
+        rt_p_mu = (p/mu)**.5
+        hk = (h*sL - k*cL) / w
+
+        G[j, 0, 1] = 2*p/w * rt_p_mu
+        G[j, 1, 0] = sL * rt_p_mu
+        G[j, 1, 1] = ((w+1)*cL + f)/w * rt_p_mu
+        G[j, 1, 2] = -g*hk * rt_p_mu
+        G[j, 2, 0] = -cL * rt_p_mu
+        G[j, 2, 1] = ((w+1.)*sL + g)/w * rt_p_mu
+        G[j, 2, 2] = f*hk * rt_p_mu
+        G[j, 3, 2] = s2*cL/2/w * rt_p_mu
+        G[j, 4, 2] = s2*sL/2/w * rt_p_mu
+        G[j, 5, 2] = hk * rt_p_mu
+    return G
+
+
+@jit
+def _mee_rates_rows(X, A, mu, Xdot):
+    """Compiled GaussVariationalEqns._mee_rates from the MEE X."""
+    for j in range(X.shape[0]):
+        p, f, g, h, k = X[j, 0], X[j, 1], X[j, 2], X[j, 3], X[j, 4]
+        a_r, a_t, a_h = A[j, 0], A[j, 1], A[j, 2]
+        sL = math.sin(X[j, 5])
+        cL = math.cos(X[j, 5])
+        s2 = 1. + h**2 + k**2
+        w = 1. + f*cL + g*sL
+        rt_p_mu = (p/mu)**.5
+        hk = (h*sL - k*cL) / w
+
+        Xdot[j, 0] = 2*p/w*a_t * rt_p_mu
+        Xdot[j, 1] = (sL*a_r + ((w+1)*cL + f)/w*a_t - g*hk*a_h) * rt_p_mu
+        Xdot[j, 2] = (-cL*a_r + ((w+1.)*sL + g)/w*a_t + f*hk*a_h) * rt_p_mu
+        Xdot[j, 3] = s2*cL/2/w*a_h * rt_p_mu
+        Xdot[j, 4] = s2*sL/2/w*a_h * rt_p_mu
+        Xdot[j, 5] = hk*a_h * rt_p_mu
+    return Xdot
+
+
+@jit
+def _coe_rows(X, mu, G):
+    """Compiled GaussVariationalEqns._coe from the COE X, into zeroed G."""
+    for j in range(X.shape[0]):
+        p, e, i, w, f = X[j, 0], X[j, 1], X[j, 2], X[j, 4], X[j, 5]
+        sf = math.sin(f)
+        cf = math.cos(f)
+        st = math.sin(f + w)
+        ct = math.cos(f + w)
+        si = math.sin(i)
+        ci = math.cos(i)
+        a = p / (1. - e**2)
+        r = p / (1. + e*cf)
+        h = (mu * p)**.5
+
+        adot_r = e*sf * 2*a**2/h
+        adot_t = p/r * 2*a**2/h
+        G[j, 1, 0] = p*sf / h
+        G[j, 1, 1] = ((p+r)*cf + r*e) / h
+        G[j, 0, 0] = adot_r*(1-e**2) - 2*a*e*G[j, 1, 0]
+        G[j, 0, 1] = adot_t*(1-e**2) - 2*a*e*G[j, 1, 1]
+        G[j, 2, 2] = r*ct/h
+        G[j, 3, 2] = r*st/h/si
+        G[j, 4, 0] = -p*cf/e / h
+        G[j, 4, 1] = (p+r)*sf/e / h
+        G[j, 4, 2] = -r*st*ci/si / h
+        G[j, 5, 0] = p*cf / h / e
+        G[j, 5, 1] = -(p+r)*sf / h / e
+    return G
+
+
+@jit
+def _coe_rates_rows(X, A, mu, Xdot):
+    """Compiled GaussVariationalEqns._coe_rates from the COE X."""
+    for j in range(X.shape[0]):
+        p, e, i, w, f = X[j, 0], X[j, 1], X[j, 2], X[j, 4], X[j, 5]
+        a_r, a_t, a_h = A[j, 0], A[j, 1], A[j, 2]
+        sf = math.sin(f)
+        cf = math.cos(f)
+        st = math.sin(f + w)
+        ct = math.cos(f + w)
+        si = math.sin(i)
+        ci = math.cos(i)
+        a = p / (1. - e**2)
+        r = p / (1. + e*cf)
+        h = (mu * p)**.5
+
+        adot = (e*sf*a_r + p/r*a_t) * 2*a**2/h
+        edot = (p*sf*a_r + ((p+r)*cf + r*e)*a_t) / h
+        Xdot[j, 0] = adot*(1-e**2) - 2*a*e*edot
+        Xdot[j, 1] = edot
+        Xdot[j, 2] = r*ct/h*a_h
+        Xdot[j, 3] = r*st/h/si*a_h
+        Xdot[j, 4] = (-p*cf/e*a_r + (p+r)*sf/e*a_t - r*st*ci/si*a_h) / h
+        Xdot[j, 5] = (p*cf*a_r - (p+r)*sf*a_t) / h / e
+    return Xdot
+
+
+@jit
+def _lvlh_row(X, j, lvlh):
+    """Inertial LVLH unit vectors of row j of the RV X, as rows of lvlh."""
+    r_x, r_y, r_z = X[j, 0], X[j, 1], X[j, 2]
+    v_x, v_y, v_z = X[j, 3], X[j, 4], X[j, 5]
+    h_x = r_y*v_z - r_z*v_y
+    h_y = r_z*v_x - r_x*v_z
+    h_z = r_x*v_y - r_y*v_x
+    r = math.sqrt(r_x**2 + r_y**2 + r_z**2)
+    h = math.sqrt(h_x**2 + h_y**2 + h_z**2)
+
+    lvlh[0, 0], lvlh[0, 1], lvlh[0, 2] = r_x/r, r_y/r, r_z/r
+    lvlh[2, 0], lvlh[2, 1], lvlh[2, 2] = h_x/h, h_y/h, h_z/h
+    lvlh[1, 0] = lvlh[2, 1]*lvlh[0, 2] - lvlh[2, 2]*lvlh[0, 1]
+    lvlh[1, 1] = lvlh[2, 2]*lvlh[0, 0] - lvlh[2, 0]*lvlh[0, 2]
+    lvlh[1, 2] = lvlh[2, 0]*lvlh[0, 1] - lvlh[2, 1]*lvlh[0, 0]
+
+
+@jit
+def _rv_rows(X, mu, G):
+    """Compiled GaussVariationalEqns._rv from the RV X, into zeroed G."""
+    lvlh = np.empty((3, 3))
+    for j in range(X.shape[0]):
+        _lvlh_row(X, j, lvlh)
+        G[j, 3:6, 0:3] = lvlh.T
+    return G
+
+
+@jit
+def _rv_rates_rows(X, A, mu, Xdot):
+    """Compiled GaussVariationalEqns._rv_rates from the RV X."""
+    lvlh = np.empty((3, 3))
+    for j in range(X.shape[0]):
+        _lvlh_row(X, j, lvlh)
+        Xdot[j, 0:3] = 0.
+        for n in range(3):
+            Xdot[j, 3+n] = (lvlh[0, n]*A[j, 0] + lvlh[1, n]*A[j, 1] +
+                            lvlh[2, n]*A[j, 2])
+    return Xdot
 
-        def __repr__(self):
-            """Printable represenation of the object."""
-            return 'GaussVariationalEqns({})'.format(self.mu)
 
-        def __str__(self):
-            """Human readable represenation of the object."""
-            return 'GaussVariationalEqns(mu={})'.format(self.mu)
+_G_rows = dict(mee=_mee_rows, coe=_coe_rows, rv=_rv_rows)
+_rates_rows = dict(mee=_mee_rates_rows, coe=_coe_rates_rows,
+                   rv=_rv_rates_rows)
@@ -0,0 +1,86 @@
+"""Created on Sat Oct 17 2026 07:48.
+
+@author: Nathan Budd
+"""
+from math import exp
+from math import lgamma
+from math import log
+import numpy as np
+
+
+def read_gravity_coefficients(path, degree, order=None):
+    """
+    Read fully normalized spherical harmonic coefficients from a text file.
+
+    Supports plain EGM-style tables, whose lines begin with
+    n m C_nm S_nm [sigma_C sigma_S], and ICGEM .gfc files, whose header ends
+    with end_of_head and whose data lines begin with a key such as gfc.
+    Fortran D exponents are accepted. If an ICGEM header declares the
+    coefficients unnormalized, they are normalized on load.
+
+    Parameters
+    ----------
+    path : string
+        Path to the coefficient file.
+    degree : int
+        Maximum degree to keep.
+    order : int, optional
+        Maximum order to keep. Defaults to degree.
+
+    Returns
+    -------
+    C : ndarray
+        (degree+1)x(degree+1) array of normalized cosine coefficients, indexed
+        [n, m].
+    S : ndarray
+        (degree+1)x(degree+1) array of normalized sine coefficients.
+    mu : float or None
+        Gravitational parameter from the file header, if present.
+    Re : float or None
+        Reference radius from the file header, if present.
+    """
+    if order is None:
+        order = degree
+
+    C = np.zeros((degree+1, degree+1))
+    S = np.zeros((degree+1, degree+1))
+    header = {}
+
+    with open(path) as lines:
+        for line in lines:
+            tokens = line.split()
+            if not tokens or tokens[0].startswith('#'):
+                continue
+
+            key = tokens[0].lower()
+            if key in ('gfc', 'gfct'):
+                tokens = tokens[1:]
+            elif not key.isdigit():
+                # ICGEM header line
+                header[key] = tokens[1] if len(tokens) > 1 else ''
+                continue
+
+            n = int(tokens[0])
+            m = int(tokens[1])
+            if n <= degree and m <= order:
+                C[n, m] = _float(tokens[2])
+                S[n, m] = _float(tokens[3])
+
+    if header.get('norm', '').startswith('unnormalized'):
+        for n in range(degree+1):
+            for m in range(min(n, order)+1):
+                # the factorial ratio alone underflows at high degree
+                N = exp(.5 * (log((2 - (m == 0)) * (2*n + 1)) +
+                              lgamma(n - m + 1) - lgamma(n + m + 1)))
+                C[n, m] /= N
+                S[n, m] /= N
+
+    mu = header.get('earth_gravity_constant')
+    Re = header.get('radius')
+    return (C, S, None if mu is None else _float(mu),
+            None if Re is None else _float(Re))
+
+
+def _float(token):
+    """Parse a number that may use a Fortran D exponent."""
+    return float(token.replace('D', 'E').replace('d', 'e'))
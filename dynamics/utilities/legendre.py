@@ -0,0 +1,43 @@
+"""Created on Sat Oct 17 2026 07:46.
+
+@author: Nathan Budd
+"""
+import numpy as np
+
+
+def legendre(s, n):
+    """
+    Legendre polynomials and their derivatives up to degree n.
+
+    Uses Bonnet's recursion, n P_n = (2n-1) s P_n-1 - (n-1) P_n-2, and
+    P'_n = n P_n-1 + s P'_n-1 for the derivatives, which stays finite at the
+    poles.
+
+    Parameters
+    ----------
+    s : ndarray
+        Array of arguments, e.g. the sine of the latitude.
+    n : int
+        Maximum degree.
+
+    Returns
+    -------
+    P : ndarray
+        Array of shape (n+1,) + s.shape, where P[j] is the degree j
+        polynomial evaluated at s.
+    dP : ndarray
+        Array of the same shape as P, holding the derivatives with respect to
+        s.
+    """
+    P = np.zeros((n+1,) + s.shape)
+    dP = np.zeros((n+1,) + s.shape)
+
+    P[0] = 1.
+    if n > 0:
+        P[1] = s
+        dP[1] = 1.
+    for j in range(2, n+1):
+        P[j] = ((2*j-1)*s*P[j-1] - (j-1)*P[j-2]) / j
+        dP[j] = j*P[j-1] + s*dP[j-1]
+
+    return P, dP
@@ -0,0 +1,55 @@
+"""Created on Sat Oct 17 2026 07:48.
+
+@author: Nathan Budd
+"""
+import numpy as np
+
+
+def perturbation_rates(gve, X, RV, a_eci, out=None):
+    """
+    Element time derivatives resulting from inertial perturbing accelerations.
+
+    The LVLH basis, r_hat, h_hat x r_hat and h_hat, is built directly from the
+    inertial position and velocity of every sample, the accelerations are
+    projected onto it and passed straight into the Gauss Variational
+    Equations.
+
+    Parameters
+    ----------
+    gve : GaussVariationalEqns
+        Gauss Variational Equations of the element set of X.
+        Allowable element sets: coe, mee, rv
+    X : ndarray
+        mx6 array of states.
+    RV : ndarray
+        mx6 array of the same states as inertial position and velocity.
+    a_eci : ndarray
+        mx3 array of inertial accelerations.
+    out : ndarray, optional
+        mx6 array in which to place the result.
+
+    Returns
+    -------
+    Xdot : ndarray
+        mx6 array of state derivatives.
+    """
+    if out is None:
+        out = np.zeros(X.shape)
+
+    if gve.element_set == 'rv':
+        out[0:, 0:3] = 0.
+        out[0:, 3:6] = a_eci
+        return out
+
+    R = RV[0:, 0:3]
+    H = np.cross(R, RV[0:, 3:6])
+    i_r = R / np.linalg.norm(R, axis=1, keepdims=True)
+    i_h = H / np.linalg.norm(H, axis=1, keepdims=True)
+    i_theta = np.cross(i_h, i_r)
+
+    # project ECI accelerations onto the LVLH frame
+    a_lvlh = np.stack((np.einsum('ij,ij->i', i_r, a_eci),
+                       np.einsum('ij,ij->i', i_theta, a_eci),
+                       np.einsum('ij,ij->i', i_h, a_eci)), 1)
+
+    return gve.rates(X, a_lvlh, out=out)
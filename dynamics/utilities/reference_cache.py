@@ -0,0 +1,201 @@
+"""Created on Sat Oct 17 2026 08:15.
+
+@author: Nathan Budd
+"""
+from collections import OrderedDict
+import numpy as np
+import numpy.polynomial.chebyshev as npc
+
+
+class ReferenceCache():
+    """
+    Memoized, optionally interpolated, reference trajectory.
+
+    Calls with times that were recently requested are answered from a least
+    recently used cache keyed on the bytes of T. This pays off when the same
+    times recur, as over the Picard iterations of MCPI. Adaptive integrators
+    request new times at every stage and only miss, so the cache is kept
+    small and bounded in bytes; densify suits them instead. After densify,
+    times within the interpolated span are instead read from piecewise
+    Chebyshev fits of the reference. Angle elements are unwrapped before
+    fitting, and wrapped back into [angle_min, angle_min + 2pi) after
+    interpolation.
+
+    Members
+    -------
+    reference : callable
+        Can be called with input T (an mx1 ndarray) to produce a reference
+        trajectory, X (mxn ndarray), e.g. TwoBody with X0.
+    maxsize : int
+        Maximum number of cached calls.
+    maxbytes : int
+        Maximum bytes held by the cached times and states.
+    angle_idx : list
+        Indices of the angle elements that vary along the reference.
+    angle_min : float
+        Lower bound of the interpolated angles.
+    span : ndarray or None
+        Segment boundaries of the interpolant, None until densify.
+    coefficients : ndarray
+        Sx(N+1)xk Chebyshev coefficients of the S interpolant segments, for
+        the k elements that vary along the reference.
+    error : float
+        Largest interpolation error, sampled between the fitting nodes.
+    hits : int
+        Calls answered from the cache.
+    misses : int
+        Calls passed on to the reference.
+    """
+
+    def __init__(self, reference, maxsize=8, maxbytes=2**26, angle_idx=(),
+                 angle_min=-np.pi):
+        """."""
+        self.reference = reference
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.angle_idx = list(angle_idx)
+        self.angle_min = angle_min
+        self.span = None
+        self.coefficients = np.zeros(())
+        self.error = np.nan
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._nbytes = 0
+
+    def __call__(self, T):
+        """Evaluate the reference trajectory at the sample times.
+
+        Parameters
+        ----------
+        T : ndarray
+            An mx1 column array of sample times.
+
+        Returns
+        -------
+        X : ndarray
+            An mxn array of reference states. Cached arrays are read-only.
+        """
+        if self.span is not None and (T >= self.span[0]).all() and (
+                T <= self.span[-1]).all():
+            return self._interpolate(T)
+
+        key = (T.shape, T.dtype.str, T.tobytes())
+        X = self._cache.get(key)
+        if X is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return X
+
+        self.misses += 1
+        X = np.asarray(self.reference(T))
+        X.flags.writeable = False
+        self._cache[key] = X
+        self._nbytes += T.nbytes + X.nbytes
+        while self._cache and (len(self._cache) > self.maxsize or
+                               self._nbytes > self.maxbytes):
+            (_, _, T_bytes), X_old = self._cache.popitem(last=False)
+            self._nbytes -= len(T_bytes) + X_old.nbytes
+        return X
+
+    def clear(self):
+        """Empty the cache and drop the interpolant."""
+        self._cache.clear()
+        self._nbytes = 0
+        self.span = None
+        self.coefficients = np.zeros(())
+        self.error = np.nan
+
+    def densify(self, t0, tf, segments=1, N=16):
+        """Fit a piecewise Chebyshev interpolant of the reference.
+
+        The reference must not depend on which times are requested together,
+        e.g. a TwoBody reference needs an explicit epoch T0.
+
+        Parameters
+        ----------
+        t0, tf : float
+            Span of the interpolant.
+        segments : int
+            Number of equal segments.
+        N : int
+            Chebyshev order of each segment.
+
+        Returns
+        -------
+        error : float
+            Largest interpolation error, sampled between the fitting nodes.
+            Low orders on many segments interpolate fastest.
+        """
+        span = np.linspace(t0, tf, segments+1)
+        tau = -np.cos(np.pi * np.arange(N+1) / N)
+        X = self._sample(span, tau)
+
+        # only elements which vary along the reference are interpolated
+        flat = X.reshape((-1, X.shape[2]))
+        self._varying = np.nonzero((flat != flat[0:1]).any(axis=0))[0]
+        self._constant = flat[0].copy()
+        self._constant[self._varying] = 0.
+        self._angles = [i for i in self.angle_idx if i in self._varying]
+
+        V = npc.chebvander(tau, N)
+        self.coefficients = np.linalg.solve(V, X[0:, 0:, self._varying])
+        self.span = span
+
+        # check against the reference halfway between the nodes
+        tau_mid = -np.cos(np.pi * (np.arange(N) + .5) / N)
+        T_mid = self._times(span, tau_mid)
+        X_mid = np.asarray(self.reference(T_mid))
+        dX = self._interpolate(T_mid) - X_mid
+        dX[0:, self.angle_idx] = np.fmod(dX[0:, self.angle_idx] + 3*np.pi,
+                                         2*np.pi) - np.pi
+        self.error = np.max(np.fabs(dX))
+        return self.error
+
+    def _times(self, span, tau):
+        """Sample times, S*len(tau)x1, at the scaled times tau of segments."""
+        mid = (span[1:] + span[0:-1]).reshape((-1, 1)) / 2.
+        half = (span[1:] - span[0:-1]).reshape((-1, 1)) / 2.
+        return (mid + half*tau.reshape((1, -1))).reshape((-1, 1))
+
+    def _sample(self, span, tau):
+        """Reference states, Sxlen(tau)xn, with angles unwrapped."""
+        X = np.array(self.reference(self._times(span, tau)), dtype=float)
+        X = X.reshape((span.size - 1, tau.size, -1))
+        X[0:, 0:, self.angle_idx] = np.unwrap(X[0:, 0:, self.angle_idx],
+                                              axis=1)
+        return X
+
+    def _interpolate(self, T):
+        """Evaluate the interpolant by Clenshaw's recurrence."""
+        t = T[0:, 0]
+        s = np.clip(np.searchsorted(self.span, t, side='right') - 1, 0,
+                    self.span.size - 2)
+        t0 = self.span[s]
+        tf = self.span[s+1]
+        tau = ((2.*t - tf - t0) / (tf - t0)).reshape((-1, 1))
+
+        B = self.coefficients[s]
+        b1 = np.zeros(B[0:, 0].shape)
+        b2 = np.zeros(B[0:, 0].shape)
+        for k in range(B.shape[1] - 1, 0, -1):
+            b1, b2 = 2.*tau*b1 - b2 + B[0:, k], b1
+
+        X = np.tile(self._constant, (t.size, 1))
+        X[0:, self._varying] = tau*b1 - b2 + B[0:, 0]
+
+        # constant angles are passed through as the reference gave them
+        X[0:, self._angles] = np.mod(X[0:, self._angles] - self.angle_min,
+                                     2*np.pi) + self.angle_min
+        return X
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'ReferenceCache({}, {}, {}, {}, {})'.format(
+            self.reference, self.maxsize, self.maxbytes, self.angle_idx,
+            self.angle_min)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'ReferenceCache(reference={}, maxsize={}, span={})'.format(
+            self.reference, self.maxsize, self.span)
@@ -0,0 +1,145 @@
+"""Created on Sat Oct 17 2026 08:03.
+
+@author: Nathan Budd
+"""
+from functools import cached_property
+import numpy as np
+import numpy.linalg as npl
+from ...orbit import coe2rv
+from ...orbit import get_backend
+from ...orbit import mee2rv
+from .gauss_variational_eqns import GaussVariationalEqns
+
+
+class StateContext():
+    """Quantities derived from one batch of states, shared between callables.
+
+    SystemDynamics creates one context per evaluation and hands it to the
+    plant, control and perturbations, so that quantities such as the sine and
+    cosine of the anomaly, the radius, the inertial state and the Gauss
+    Variational Equations are computed at most once, and only if some
+    component asks for them.
+
+    Members
+    -------
+    T : ndarray
+        An mx1 column array of times.
+    X : ndarray
+        An mxn array of states.
+    mu : float
+        Standard gravitational parameter.
+    element_set : string
+        See two_body.py for more details.
+    gve : GaussVariationalEqns
+        Gauss Variational Equations of the element set.
+    reuse_G : bool
+        Whether rates may reuse G once it has been computed. Components
+        evaluated concurrently would otherwise round differently depending on
+        which of them asked for G first.
+    """
+
+    toRV = {'coe': coe2rv, 'mee': mee2rv, 'rv': np.asarray}
+
+    def __init__(self, T, X, mu, element_set, reuse_G=True):
+        """."""
+        self.T = T
+        self.X = X
+        self.mu = mu
+        self.element_set = element_set
+        self.reuse_G = reuse_G
+        self.gve = GaussVariationalEqns(mu, element_set)
+
+    @cached_property
+    def trig(self):
+        """Sine and cosine, each mx1, of the phase angle (f or L)."""
+        angle = self.X[0:, 5:6]
+        return np.sin(angle), np.cos(angle)
+
+    @cached_property
+    def w(self):
+        """The mx1 ratio p/r for COE and MEE."""
+        s, c = self.trig
+        if self.element_set == 'coe':
+            return 1. + self.X[0:, 1:2]*c
+        return 1. + self.X[0:, 1:2]*c + self.X[0:, 2:3]*s
+
+    @cached_property
+    def r(self):
+        """The mx1 orbit radius."""
+        if self.element_set == 'rv':
+            return npl.norm(self.X[0:, 0:3], ord=2, axis=1).reshape((-1, 1))
+        return self.X[0:, 0:1] / self.w
+
+    @cached_property
+    def h(self):
+        """The mx1 specific angular momentum magnitude."""
+        if self.element_set == 'rv':
+            return npl.norm(self.H, ord=2, axis=1).reshape((-1, 1))
+        return (self.mu * self.X[0:, 0:1])**.5
+
+    @cached_property
+    def RV(self):
+        """The mx6 inertial position and velocity."""
+        return self.toRV[self.element_set](self.X)
+
+    @cached_property
+    def H(self):
+        """The mx3 inertial specific angular momentum vector."""
+        return np.cross(self.RV[0:, 0:3], self.RV[0:, 3:6])
+
+    @cached_property
+    def lvlh(self):
+        """The mx3 inertial LVLH unit vectors r_hat, theta_hat and h_hat."""
+        R = self.RV[0:, 0:3]
+        i_r = R / npl.norm(R, ord=2, axis=1).reshape((-1, 1))
+        i_h = self.H / npl.norm(self.H, ord=2, axis=1).reshape((-1, 1))
+        return i_r, np.cross(i_h, i_r), i_h
+
+    @cached_property
+    def terms(self):
+        """Intermediates shared by the GVE matrices and rates."""
+        if self.element_set == 'rv':
+            return self.lvlh
+        return self.gve.terms(self.X, trig=self.trig)
+
+    @cached_property
+    def G(self):
+        """The mx6x3 Gauss Variational Equations."""
+        return self.gve(self.X, terms=self._gve_terms())
+
+    def _gve_terms(self):
+        """The shared GVE intermediates, None if the numba backend is used."""
+        return None if get_backend() == 'numba' else self.terms
+
+    def rates(self, A, out=None):
+        """Element time derivatives of mx3 LVLH accelerations.
+
+        G @ a is used once some component has asked for G, if reuse_G is set,
+        otherwise the fused GVE rates are evaluated from the shared
+        intermediates.
+        """
+        if self.reuse_G and 'G' in self.__dict__:
+            return np.einsum('ijk,ik->ij', self.G, A, out=out)
+        return self.gve.rates(self.X, A, out=out, terms=self._gve_terms())
+
+    def perturbation_rates(self, a_eci, out=None):
+        """Element time derivatives of mx3 inertial accelerations."""
+        if self.element_set == 'rv':
+            if out is None:
+                out = np.zeros(self.X.shape)
+            out[0:, 0:3] = 0.
+            out[0:, 3:6] = a_eci
+            return out
+
+        A = np.stack([np.einsum('ij,ij->i', i, a_eci) for i in self.lvlh], 1)
+        return self.rates(A, out=out)
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'StateContext({}, {}, {}, {})'.format(
+            self.T, self.X, self.mu, self.element_set)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'StateContext(m={}, mu={}, element_set={})'.format(
+            self.X.shape[0], self.mu, self.element_set)
@@ -2,6 +2,11 @@
 
 @author: Nathan Budd
 """
+from collections import OrderedDict
+import copy
+import types
+import numpy as np
+from .state_context import StateContext
 
 
 class SystemDynamics():
@@ -11,6 +16,35 @@ class SystemDynamics():
     (T, X) where T is an mx1 ndarray of sample times and X is an mxn ndarray
     of sample states.
 
+    If the plant defines mu and element_set, one StateContext is built per
+    call and passed as the keyword ctx to every callable whose uses_context
+    attribute is True, so that quantities derived from X are computed once.
+
+    In workspace mode every term is written into a buffer owned by the
+    SystemDynamics, passed as the keyword out to callables whose accepts_out
+    attribute is True, and the terms are summed into one output buffer.
+    Buffers are kept per array shape, so the returned Xdot is overwritten by
+    the next call of the same shape and must be copied if it is to be kept.
+    Outside workspace mode each call returns a new array. In neither mode is
+    the array returned by a component modified.
+
+    Given an executor, e.g. a concurrent.futures.ThreadPoolExecutor, the
+    terms are evaluated concurrently, which pays off when they are large
+    NumPy kernels that release the GIL. If chunk_rows is also given, batches
+    of more rows are instead split into chunks of chunk_rows rows, each
+    evaluated serially by its own replica of the system, a deep copy of the
+    plant, control and perturbations, since components keep per-call state.
+    Replicas are rebuilt once any attribute reachable from the members has
+    been rebound. Read-only arrays, such as the values of a GravityGrid, are
+    shared by the replicas. Writeable arrays are copied, so later in-place
+    changes to them are not seen by existing replicas. Components must then
+    treat rows independently, e.g. a TwoBody reference needs an explicit
+    epoch T0. Terms are always summed in the order plant, control,
+    perturbations and chunks are joined in row order, so the result does not
+    depend on thread scheduling. Chunked evaluation records the most recent
+    outputs of each component on the replicas rather than on the components
+    themselves.
+
     Members
     -------
     plant : callable
@@ -19,13 +53,33 @@ class SystemDynamics():
         Represents the system control.
     preturbations : callable or list of callables
         Represent perturbations acting on the system.
+    workspace : bool
+        Evaluate into preallocated buffers rather than new arrays.
+    max_workspaces : int
+        Number of array shapes for which buffers are kept, least recently
+        used first out.
+    executor : concurrent.futures.Executor or None
+        Evaluates terms or row chunks concurrently when given.
+    chunk_rows : int or None
+        Number of rows per chunk when splitting batches across the executor.
+    Xdot : ndarray
+        The most recently computed call output
     """
 
-    def __init__(self, plant, control=None, perturbations=None):
+    def __init__(self, plant, control=None, perturbations=None,
+                 workspace=False, max_workspaces=8, executor=None,
+                 chunk_rows=None):
         """."""
         self.plant = plant
         self.control = control
         self.perturbations = perturbations
+        self.workspace = workspace
+        self.max_workspaces = max_workspaces
+        self.executor = executor
+        self.chunk_rows = chunk_rows
+        self._workspaces = OrderedDict()
+        self._replicas = []
+        self._replica_bindings = []
         super().__init__()
 
     def __call__(self, T, X):
@@ -43,29 +97,163 @@ class SystemDynamics():
         Xdot : ndarray
             An mxn array of state derivatives
         """
-        Xdot = self.plant(T, X)
+        if (self.executor is not None and self.chunk_rows is not None and
+                X.shape[0] > self.chunk_rows):
+            Xdot = self._sum_chunks(T, X)
+        else:
+            Xdot = self._sum_terms(T, X)
+
+        self.Xdot = Xdot
+        return Xdot
 
+    def terms(self):
+        """List the plant, control and perturbations in summation order."""
+        terms = [self.plant]
         if self.control is not None:
-            Xdot += self.control(T, X)
+            terms.append(self.control)
+        if isinstance(self.perturbations, list):
+            terms.extend(self.perturbations)
+        elif self.perturbations is not None:
+            terms.append(self.perturbations)
+        return terms
 
-        if self.perturbations is not None:
-            if isinstance(self.perturbations, list):
-                for perturb in self.perturbations:
-                    Xdot = Xdot + perturb(T, X)
-            else:
-                Xdot += self.perturbations(T, X)
+    def context(self, T, X):
+        """Build the StateContext shared by one evaluation.
 
-        self.Xdot = Xdot
+        Returns None if the plant does not define mu and element_set. With an
+        executor the context never reuses G for rates, so that the result
+        does not depend on which term asks for G first.
+        """
+        if not (hasattr(self.plant, 'mu') and
+                hasattr(self.plant, 'element_set')):
+            return None
+        return StateContext(T, X, self.plant.mu, self.plant.element_set,
+                            reuse_G=self.executor is None)
+
+    def _sum_terms(self, T, X):
+        """Evaluate every term on the whole batch and sum them in order."""
+        ctx = self.context(T, X)
+        terms = self.terms()
+        if self.workspace:
+            buffers = self._buffers(X, len(terms))
+        else:
+            buffers = [None] * (len(terms) + 1)
+
+        if self.executor is None:
+            results = (self._evaluate(func, T, X, ctx, out)
+                       for func, out in zip(terms, buffers))
+        else:
+            futures = [self.executor.submit(self._evaluate, func, T, X, ctx,
+                                            out)
+                       for func, out in zip(terms, buffers)]
+            results = (future.result() for future in futures)
+
+        for k, term in enumerate(results):
+            if k == 0:
+                Xdot = term
+                if self.workspace:
+                    Xdot = buffers[-1]
+                    np.copyto(Xdot, term)
+            elif k == 1 and not self.workspace:
+                Xdot = Xdot + term  # leave the plant output untouched
+            else:
+                Xdot += term
         return Xdot
 
+    def _sum_chunks(self, T, X):
+        """Evaluate row chunks of the batch on replicas, joined in order."""
+        members = (self.plant, self.control, self.perturbations)
+        bindings = self._bindings(members)
+        if not (len(bindings) == len(self._replica_bindings) and all(
+                a is b and name == other and value is other_value
+                for (a, name, value), (b, other, other_value)
+                in zip(bindings, self._replica_bindings))):
+            self._replicas = []
+            self._replica_bindings = bindings
+
+        starts = range(0, X.shape[0], self.chunk_rows)
+        while len(self._replicas) < len(starts):
+            memo = {id(value): value for _, _, value in bindings
+                    if isinstance(value, np.ndarray) and
+                    not value.flags.writeable}
+            plant, control, perturbations = copy.deepcopy(members, memo)
+            self._replicas.append(SystemDynamics(
+                plant, control, perturbations, self.workspace,
+                self.max_workspaces))
+
+        futures = [self.executor.submit(replica, T[i:i+self.chunk_rows],
+                                        X[i:i+self.chunk_rows])
+                   for replica, i in zip(self._replicas, starts)]
+        chunks = [future.result() for future in futures]
+
+        out = self._buffers(X, 0)[-1] if self.workspace else None
+        return np.concatenate(chunks, out=out)
+
+    @staticmethod
+    def _bindings(members):
+        """List (owner, name, value) for every binding reachable from members.
+
+        Attributes are followed through objects, lists, tuples and dicts but
+        not into arrays. The members themselves have owner None.
+        """
+        bindings = [(None, k, member) for k, member in enumerate(members)]
+        stack = list(members)
+        seen = set()
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen or isinstance(obj, (np.ndarray, type,
+                                                   types.ModuleType)):
+                continue
+            seen.add(id(obj))
+            if isinstance(obj, (list, tuple)):
+                items = enumerate(obj)
+            elif isinstance(obj, dict):
+                items = obj.items()
+            elif isinstance(getattr(obj, '__dict__', None), dict):
+                items = vars(obj).items()
+            else:
+                continue
+            for name, value in items:
+                bindings.append((obj, name, value))
+                stack.append(value)
+        return bindings
+
+    def _buffers(self, X, count):
+        """Term buffers and the output buffer last, for states shaped as X."""
+        key = (X.shape, np.promote_types(X.dtype, np.float32), count)
+        try:
+            self._workspaces.move_to_end(key)
+            return self._workspaces[key]
+        except KeyError:
+            pass
+
+        buffers = [np.empty(X.shape, dtype=key[1]) for k in range(count+1)]
+        self._workspaces[key] = buffers
+        if len(self._workspaces) > self.max_workspaces:
+            self._workspaces.popitem(last=False)
+        return buffers
+
+    @staticmethod
+    def _evaluate(func, T, X, ctx, out=None):
+        """Call func, passing ctx and out if it is able to use them."""
+        kwargs = {}
+        if ctx is not None and getattr(func, 'uses_context', False):
+            kwargs['ctx'] = ctx
+        if out is not None and getattr(func, 'accepts_out', False):
+            kwargs['out'] = out
+        return func(T, X, **kwargs)
+
     def __repr__(self):
         """Printable represenation of the object."""
-        return 'SystemDynamics({}, {}, {})'.format(
-            self.plant, self.control, self.perturbations)
+        return 'SystemDynamics({}, {}, {}, {}, {}, {}, {})'.format(
+            self.plant, self.control, self.perturbations, self.workspace,
+            self.max_workspaces, self.executor, self.chunk_rows)
 
     def __str__(self):
         """Human readable represenation of the object."""
         output = 'SystemDynamics'
-        output += '(plant={}, control={}, perturbations={})'.format(
-            self.plant, self.control, self.perturbations)
+        output += ('(plant={}, control={}, perturbations={}, workspace={}, '
+                   'max_workspaces={}, executor={}, chunk_rows={})').format(
+            self.plant, self.control, self.perturbations, self.workspace,
+            self.max_workspaces, self.executor, self.chunk_rows)
         return output
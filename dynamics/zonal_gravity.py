@@ -6,125 +6,185 @@ import numpy as np
 import numpy.linalg as npl
 from ..orbit import coe2rv
 from ..orbit import mee2rv
-from ..orbit import mee2coe
-from ..orbit import euler_sequence
 from .utilities import GaussVariationalEqns
+from .utilities import legendre
+from .utilities import perturbation_rates
 from multiplot2d import MultiPlotter
 
 
 class ZonalGravity():
     """
-    Zonal gravity perturbations, J2 up to J6, in canonical units.
+    Zonal gravity perturbations of arbitrary degree, in canonical units.
+
+    The Legendre polynomials and their derivatives are generated once per
+    call by recursion and shared by every zonal term.
 
     Members
     -------
     J : list of floats
-        List of all zonal gravity coefficients from J2 up to no more than J6.
-        Defaults to only J2.
+        List of all zonal gravity coefficients from J2 up to the maximum
+        degree. Defaults to only J2.
     Re : float
         Radius of the earth. Defaults to canonical units.
     mu : float
         Standard gravitational parameter. Defaults to canonical units.
     elements : string
         Indicates the element set being used as input and output. Allowable
-        values include: 'coe', 'mee'. Defaults to 'coe'.
+        values include: 'coe', 'mee', 'rv'. Defaults to 'coe'.
     Xdot : ndarray
         The most recently computed call output
     """
 
-    toRV = {'coe': coe2rv, 'mee': mee2rv}
+    toRV = {'coe': coe2rv, 'mee': mee2rv, 'rv': np.asarray}
+    uses_context = True
+    accepts_out = True
+
+    J_table = [1082.63e-6, -2.52e-6, -1.61e-6, -.15e-6, .57e-6]
 
-    def __init__(self, ord=2, Re=1., mu=1., elements='coe'):
-        """."""
-        J2_to_6 = [1082.63e-6, -2.52e-6, -1.61e-6, -.15e-6, .57e-6]
-        self.J = J2_to_6[0:ord-1]
+    def __init__(self, ord=2, Re=1., mu=1., elements='coe', J=None):
+        """.
+
+        Parameters
+        ----------
+        ord : int
+            Maximum degree of the zonal terms.
+        J : list of floats, optional
+            Zonal coefficients [J2 J3 ... JN] to draw from in place of
+            J_table. Must reach at least degree ord.
+        """
+        J_table = self.J_table if J is None else J
+        if ord - 1 > len(J_table):
+            raise ValueError('ZonalGravity: degree {} requested, but '
+                             'coefficients are only given up to J{}'.format(
+                                 ord, len(J_table) + 1))
+        self.J = list(J_table[0:ord-1])
         self.Re = Re
         self.mu = mu
         self.elements = elements
+        self.gve = GaussVariationalEqns(mu, elements)
         self.Xdot = np.array([[]])
 
-    def __call__(self, T, X):
-        """Output indicated element derivatives resulting from zonal gravity.
+    @classmethod
+    def from_table(cls, path, ord=None, **kwargs):
+        """
+        Create a ZonalGravity from a text table of zonal coefficients.
+
+        Each non-comment line of the table holds a degree n and its
+        unnormalized coefficient J_n. Missing degrees are taken as zero and
+        degrees below 2 are ignored.
 
-        See dynamics_abstract.py for more details.
+        Parameters
+        ----------
+        path : string
+            Path to the table.
+        ord : int, optional
+            Maximum degree. Defaults to the highest degree in the table.
+        kwargs
+            Passed on to ZonalGravity.
+
+        Returns
+        -------
+        ZonalGravity
         """
-        RV = self.toRV[self.elements](X)
+        table = np.loadtxt(path, comments='#', ndmin=2)
+        table = table[table[0:, 0] >= 2]
+        n = table[0:, 0].astype(int)
+        J = np.zeros(n.max() - 1)
+        J[n - 2] = table[0:, 1]
 
-        x = RV[0:, 0:1]
-        y = RV[0:, 1:2]
-        z = RV[0:, 2:3]
-        r = npl.norm(RV[0:, 0:3], ord=2, axis=1).reshape(z.shape)
-
-        # calculate and accumulate J_i ECI accelerations
-        a_eci = np.zeros(RV[0:, 0:3].shape)
-        for i, J in enumerate(self.J):
-            if i == 0:  # J2
-                factor = -3./2. * J * (self.mu/r**2) * (self.Re/r)**2
-                a_x = (1. - 5.*(z/r)**2) * x/r
-                a_y = (1. - 5.*(z/r)**2) * y/r
-                a_z = (3. - 5.*(z/r)**2) * z/r
-
-            elif i == 1:  # J3
-                factor = 1./2. * J * (self.mu/r**2) * (self.Re/r)**3
-                a_x = 5.*(7.*(z/r)**3 - 3.*(z/r)) * x/r
-                a_y = 5.*(7.*(z/r)**3 - 3.*(z/r)) * y/r
-                a_z = 3.*(1. - 10.*(z/r)**2 + 35./3.*(z/r)**4)
-
-            elif i == 2:  # J4
-                factor = 5./8. * J * (self.mu/r**2) * (self.Re/r)**4
-                a_x = (3. - 42.*(z/r)**2 + 63.*(z/r)**4) * x/r
-                a_y = (3. - 42.*(z/r)**2 + 63.*(z/r)**4) * y/r
-                a_z = (15. - 70.*(z/r)**2 + 63.*(z/r)**4) * z/r
-
-            elif i == 3:  # J5
-                factor = 1./8. * J * (self.mu/r**2) * (self.Re/r)**5
-                a_x = 3.*(35.*(z/r) - 210.*(z/r)**3 + 231.*(z/r)**5) * x/r
-                a_y = 3.*(35.*(z/r) - 210.*(z/r)**3 + 231.*(z/r)**5) * y/r
-                a_z = (-15. + 315.*(z/r)**2 - 945.*(z/r)**4 + 693.*(z/r)**6)
-
-            elif i == 4:  # J6
-                factor = -1./16. * J * (self.mu/r**2) * (self.Re/r)**6
-                a_x = (35. - 945.*(z/r)**2 + 3465.*(z/r)**4 -
-                       3003.*(z/r)**6) * x/r
-                a_y = (35. - 945.*(z/r)**2 + 3465.*(z/r)**4 -
-                       3003.*(z/r)**6) * y/r
-                a_z = (245. - 2205.*(z/r)**2 + 4851.*(z/r)**4 -
-                       3003.*(z/r)**6) * z/r
-
-            a_eci = a_eci + np.concatenate((a_x, a_y, a_z), 1) * factor
-
-        # create rotation matrices and Gauss-Lagrange matrices
-        if self.elements is 'coe':
-            i = X[0:, 2:3]
-            W = X[0:, 3:4]
-            w = X[0:, 4:5]
-            f = X[0:, 5:6]
-
-            G = GaussVariationalEqns(self.mu).coe(X)
-
-        elif self.elements is 'mee':
-            COE = mee2coe(X)
-            i = COE[0:, 2:3]
-            W = COE[0:, 3:4]
-            w = COE[0:, 4:5]
-            f = COE[0:, 5:6]
-
-            G = GaussLagrangePlanetaryEqns(self.mu).mee(X)
-
-        C = euler_sequence([3, 1, 3], W, i, w+f)
-
-        # rotate ECI accelerations into the LVLH frame
-        a_lvlh = np.zeros(a_eci.shape)
-        for j, dcm in enumerate(C):
-            a_lvlh[j] = (dcm @ a_eci[j].T).T
-
-        # multiply accelerations into Gauss-Lagrange matrix
-        self.Xdot = np.zeros(X.shape)
-        for j, g in enumerate(G):
-            self.Xdot[j] = (g @ a_lvlh[j].T).T
+        if ord is None:
+            ord = n.max()
+        return cls(ord, J=J.tolist(), **kwargs)
+
+    def __call__(self, T, X, ctx=None, out=None):
+        """Output indicated element derivatives resulting from zonal gravity.
 
+        See dynamics_abstract.py for more details. The inertial state and
+        LVLH basis are taken from ctx, a shared StateContext, when given. The
+        result is placed in out, an mxn array, when given.
+        """
+        if ctx is None:
+            RV = self.toRV[self.elements](X)
+            a_eci = self.acceleration(RV[0:, 0:3])
+            self.Xdot = perturbation_rates(self.gve, X, RV, a_eci, out=out)
+        else:
+            a_eci = self.acceleration(ctx.RV[0:, 0:3])
+            self.Xdot = ctx.perturbation_rates(a_eci, out=out)
         return self.Xdot
 
+    def acceleration(self, R):
+        """
+        Calculate the zonal gravity acceleration in the inertial frame.
+
+        Parameters
+        ----------
+        R : ndarray
+            mx3 array of inertial positions.
+
+        Returns
+        -------
+        a_eci : ndarray
+            mx3 array of inertial accelerations.
+        """
+        x = R[0:, 0:1]
+        y = R[0:, 1:2]
+        z = R[0:, 2:3]
+        r = npl.norm(R, ord=2, axis=1).reshape(z.shape)
+        sin_phi = z/r
+        P, dP = legendre(sin_phi, len(self.J) + 1)
+
+        # accumulate the radial and polar derivatives of every J_n term
+        radial = np.zeros(z.shape)
+        polar = np.zeros(z.shape)
+        Re_by_r_n = self.Re/r
+        for n, J in enumerate(self.J, 2):
+            Re_by_r_n = Re_by_r_n * (self.Re/r)
+            radial += J * Re_by_r_n * ((n+1.)*P[n] + sin_phi*dP[n])
+            polar += J * Re_by_r_n * dP[n]
+
+        mu_by_r2 = self.mu/r**2
+        a_x = mu_by_r2 * radial * x/r
+        a_y = mu_by_r2 * radial * y/r
+        a_z = mu_by_r2 * (radial*sin_phi - polar)
+
+        return np.concatenate((a_x, a_y, a_z), 1)
+
+    def body_acceleration(self, R):
+        """
+        Calculate the zonal gravity acceleration in the body-fixed frame.
+
+        The zonal field is symmetric about the z axis, so the body-fixed and
+        inertial frames coincide. See acceleration.
+        """
+        return self.acceleration(R)
+
+    def potential(self, R):
+        """
+        Calculate the gravitational potential energy per unit mass.
+
+        Parameters
+        ----------
+        R : ndarray
+            mx3 array of inertial positions.
+
+        Returns
+        -------
+        V : ndarray
+            mx1 array of potential energies, including the central term.
+        """
+        z = R[0:, 2:3]
+        r = npl.norm(R, ord=2, axis=1).reshape(z.shape)
+        P, dP = legendre(z/r, len(self.J) + 1)
+
+        # accumulate potential function terms for each J_n
+        terms = np.zeros(z.shape)
+        Re_by_r_n = self.Re/r
+        for n, J in enumerate(self.J, 2):
+            Re_by_r_n = Re_by_r_n * (self.Re/r)
+            terms += J * Re_by_r_n * P[n]
+
+        return -self.mu/r * (1. - terms)
+
     def __repr__(self):
         """Printable represenation of the object."""
         return 'ZonalGravity({}, {}, {}, {})'.format(
@@ -154,37 +214,10 @@ class ZonalGravity():
         RV = self.toRV[self.elements](X)
 
         z = RV[0:, 2:3]
-        r = npl.norm(RV[0:, 0:3], ord=2, axis=1).reshape(z.shape)
         v = npl.norm(RV[0:, 3:6], ord=2, axis=1).reshape(z.shape)
-        sin_phi = z/r
 
         KE = .5 * v**2
-
-        # calculate and accumulate potential function terms for each J_i
-        V = -self.mu/r
-        for i, J in enumerate(self.J):
-            if i == 0:  # J2
-                factor = -J/2. * self.mu/r * (self.Re/r)**2
-                terms = 3.*sin_phi**2 - 1.
-
-            elif i == 1:  # J3
-                factor = -J/2. * self.mu/r * (self.Re/r)**3
-                terms = 5.*sin_phi**3 - 3.*sin_phi
-
-            elif i == 2:  # J4
-                factor = -J/8. * self.mu/r * (self.Re/r)**4
-                terms = 35.*sin_phi**4 - 30.*sin_phi**2 + 3.
-
-            elif i == 3:  # J5
-                factor = -J/8. * self.mu/r * (self.Re/r)**5
-                terms = 63.*sin_phi**5 - 70.*sin_phi**3 + 15.*sin_phi
-
-            elif i == 4:  # J6
-                factor = -J/16. * self.mu/r * (self.Re/r)**6
-                terms = (231.*sin_phi**6 - 315.*sin_phi**4 +
-                         105.*sin_phi**2 - 5.)
-
-            V = V - factor*terms
+        V = self.potential(RV[0:, 0:3])
 
         H = KE + V
         H_rel = (H - H[0, 0]) / H[0, 0]
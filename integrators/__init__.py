@@ -0,0 +1 @@
+from .dormand_prince import DormandPrince
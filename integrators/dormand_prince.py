@@ -0,0 +1,439 @@
+"""Created on Sat Oct 17 2026 08:07.
+
+@author: Nathan Budd
+"""
+import warnings
+import numpy as np
+
+
+class DormandPrince():
+    """
+    Batched adaptive Dormand-Prince 5(4) integrator.
+
+    Every row of the state batch is an independent trajectory with its own
+    time, step size, error estimate and accept/reject decision, while each of
+    the stages is one vectorized call of the dynamics on the whole batch.
+
+    Members
+    -------
+    dynamics : callable
+        Takes inputs (T, X), an mx1 array of times and an mxn array of
+        states, and returns an mxn array of state derivatives, e.g. a
+        SystemDynamics.
+    rtol : float
+        Relative error tolerance.
+    atol : float or ndarray
+        Absolute error tolerance, a scalar or one per state.
+    max_steps : int
+        Maximum number of step attempts in propagate.
+    K : ndarray
+        7xmxn stage derivatives of the most recent step.
+    nfev : int
+        Rows evaluated by the dynamics during the most recent propagate.
+    steps : ndarray
+        Accepted steps of each row during the most recent propagate.
+    rejected : ndarray
+        Rejected steps of each row during the most recent propagate.
+    T : ndarray
+        Final times of each row of the most recent propagate.
+    status : ndarray
+        How each row of the most recent propagate finished: 0 at its final
+        time, 1 at an event, 2 when done, -1 not finished, -2 failed when its
+        step size underflowed, e.g. on non-finite derivatives.
+    """
+
+    C = np.array([0., 1/5, 3/10, 4/5, 8/9, 1., 1.])
+    A = [[],
+         [1/5],
+         [3/40, 9/40],
+         [44/45, -56/15, 32/9],
+         [19372/6561, -25360/2187, 64448/6561, -212/729],
+         [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+         [35/384, 0., 500/1113, 125/192, -2187/6784, 11/84]]
+    B = np.array([35/384, 0., 500/1113, 125/192, -2187/6784, 11/84, 0.])
+    E = np.array([-71/57600, 0., 71/16695, -71/1920, 17253/339200, -22/525,
+                  1/40])
+
+    # coefficients of theta, ..., theta**4 of the continuous extension
+    P = np.array([
+        [1., -8048581381/2820520608, 8663915743/2820520608,
+         -12715105075/11282082432],
+        [0., 0., 0., 0.],
+        [0., 131558114200/32700410799, -68118460800/10900136933,
+         87487479700/32700410799],
+        [0., -1754552775/470086768, 14199869525/1410260304,
+         -10690763975/1880347072],
+        [0., 127303824393/49829197408, -318862633887/49829197408,
+         701980252875/199316789632],
+        [0., -282668133/205662961, 2019193451/616988883,
+         -1453857185/822651844],
+        [0., 40617522/29380423, -110615467/29380423, 69997945/29380423]])
+
+    safety = .9
+    min_factor = .2
+    max_factor = 10.
+
+    def __init__(self, dynamics, rtol=1e-9, atol=1e-12, max_steps=100000):
+        """."""
+        self.dynamics = dynamics
+        self.rtol = rtol
+        self.atol = atol
+        self.max_steps = max_steps
+        self.K = np.zeros(())
+        self.nfev = 0
+        self.steps = np.zeros(())
+        self.rejected = np.zeros(())
+        self.T = np.zeros(())
+        self.status = np.zeros(())
+
+    def _f(self, T, X, copy=False):
+        """Evaluate the dynamics on the batch.
+
+        The dynamics may return a buffer they reuse, so copy is set wherever
+        the result must outlive the next evaluation.
+        """
+        self.nfev += X.shape[0]
+        if copy:
+            return np.array(self.dynamics(T, X))
+        return np.asarray(self.dynamics(T, X))
+
+    def _scale(self, X, X_new):
+        """Per-state error scale of every row."""
+        return self.atol + self.rtol*np.maximum(np.fabs(X), np.fabs(X_new))
+
+    def initial_step(self, T, X, direction, F=None):
+        """Estimate a first step size for every row.
+
+        Parameters
+        ----------
+        T : ndarray
+            An mx1 column array of times.
+        X : ndarray
+            An mxn array of states.
+        direction : ndarray
+            An mx1 array of +1 or -1, the sign of the integration.
+        F : ndarray, optional
+            The mxn state derivatives at (T, X).
+
+        Returns
+        -------
+        H : ndarray
+            An mx1 array of signed step sizes.
+        """
+        if F is None:
+            F = self._f(T, X, copy=True)
+        n = X.shape[1]
+        scale = self._scale(X, X)
+
+        d0 = (np.sum((X/scale)**2, 1, keepdims=True) / n)**.5
+        d1 = (np.sum((F/scale)**2, 1, keepdims=True) / n)**.5
+        h0 = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6,
+                      .01*d0/np.where(d1 > 0., d1, 1.))
+
+        F1 = self._f(T + direction*h0, X + direction*h0*F)
+        d2 = (np.sum(((F1 - F)/scale)**2, 1, keepdims=True) / n)**.5 / h0
+        d12 = np.maximum(d1, d2)
+        h1 = np.where(d12 <= 1e-15, np.maximum(1e-6, h0*1e-3),
+                      (.01/np.where(d12 > 0., d12, 1.))**.2)
+
+        return direction * np.minimum(100.*h0, h1)
+
+    def step(self, T, X, H, F=None):
+        """Attempt one step of every row.
+
+        Rows with a zero step are left unchanged and count as accepted.
+        Rows whose error estimate is not finite are rejected.
+
+        Parameters
+        ----------
+        T : ndarray
+            An mx1 column array of times.
+        X : ndarray
+            An mxn array of states.
+        H : ndarray
+            An mx1 array of signed step sizes.
+        F : ndarray, optional
+            The mxn state derivatives at (T, X), reused from the previous
+            step when available.
+
+        Returns
+        -------
+        T : ndarray
+            An mx1 array of times, advanced by H on accepted rows.
+        X : ndarray
+            An mxn array of states, advanced on accepted rows.
+        H : ndarray
+            An mx1 array of proposed next step sizes.
+        F : ndarray
+            The mxn state derivatives at the returned (T, X).
+        accepted : ndarray
+            Boolean m array, True where the step was accepted.
+        """
+        if F is None:
+            F = self._f(T, X, copy=True)
+
+        K = np.empty((7,) + X.shape)
+        K[0] = F
+        for s in range(1, 7):
+            dX = np.tensordot(self.A[s], K[0:s], axes=(0, 0))
+            K[s] = self._f(T + self.C[s]*H, X + H*dX)
+        X_new = X + H*np.tensordot(self.B, K, axes=(0, 0))
+        self.K = K
+
+        error = H*np.tensordot(self.E, K, axes=(0, 0)) / self._scale(
+            X, X_new)
+        error = (np.sum(error**2, 1) / X.shape[1])**.5
+        finite = np.isfinite(error)
+        accepted = finite & (error <= 1.)
+
+        # error ** -1/5 step control, never growing after a rejection and
+        # shrinking the most on non-finite errors
+        factor = np.where(error > 0., self.safety * np.where(
+            error > 0., error, 1.)**-.2, self.max_factor)
+        factor = np.where(finite, factor, self.min_factor)
+        factor = np.clip(factor, self.min_factor, np.where(
+            accepted, self.max_factor, 1.))
+
+        a = accepted.reshape((-1, 1))
+        T = np.where(a, T + H, T)
+        X = np.where(a, X_new, X)
+        F = np.where(a, K[6], F)
+        H = H*factor.reshape((-1, 1))
+
+        return T, X, H, F, accepted
+
+    def dense(self, X, H, theta, K=None):
+        """Evaluate the continuous extension within a step.
+
+        Parameters
+        ----------
+        X : ndarray
+            An mxn array of states at the start of the step.
+        H : ndarray
+            An mx1 array of step sizes.
+        theta : ndarray
+            An mx1 array of fractions of the step, from 0 to 1.
+        K : ndarray, optional
+            7xmxn stage derivatives of the step. Defaults to the most recent.
+
+        Returns
+        -------
+        X : ndarray
+            An mxn array of interpolated states.
+        """
+        if K is None:
+            K = self.K
+        powers = theta ** np.arange(1, 5).reshape((1, 4))
+        Q = np.tensordot(K, self.P, axes=(0, 0))
+        return X + H*np.einsum('ijk,ik->ij', Q, powers)
+
+    def propagate(self, T0, X0, tf, T_eval=None, H0=None, events=None,
+                  done=None, reset=None):
+        """Propagate every row to its own final time.
+
+        Rows finish when they reach their final time, when an event function
+        crosses zero or when done reports them converged. Finished rows are
+        scattered back to their original index and removed from the working
+        batch, so the dynamics are only evaluated on live rows. This requires
+        the dynamics to treat rows independently. Rows whose step no longer
+        advances their time after rejections, e.g. as their derivatives are
+        not finite, fail and keep their last accepted state.
+
+        Parameters
+        ----------
+        T0 : ndarray
+            An mx1 column array of initial times, or a scalar.
+        X0 : ndarray
+            An mxn array of initial states.
+        tf : ndarray
+            An mx1 column array of final times, or a scalar.
+        T_eval : ndarray, optional
+            A length k array of output times shared by all rows, each between
+            the initial and final time of every row. Times after a row has
+            finished early are left as nan.
+        H0 : ndarray, optional
+            An mx1 array of initial step sizes, or a scalar.
+        events : callable, optional
+            Takes inputs (T, X) and returns an mx1 array. A row terminates
+            where its value changes sign, located on the continuous extension.
+        done : callable, optional
+            Takes inputs (T, X) and returns a boolean m array. A row
+            terminates after the first accepted step where it is True.
+        reset : callable, optional
+            Takes inputs (T, X) after accepted steps and returns a boolean m
+            array and the new states of the rows where it is True, e.g. to
+            rectify a reference. Those rows continue from the new states.
+
+        Returns
+        -------
+        X : ndarray
+            An mxn array of final states, or an mxkxn array of states at
+            T_eval when it is given.
+        """
+        X_out = np.array(X0, dtype=float)
+        m, n = X_out.shape
+        T_out = np.array(np.broadcast_to(T0, (m, 1)), dtype=float)
+        tf = np.array(np.broadcast_to(tf, (m, 1)), dtype=float)
+        direction = np.where(tf >= T_out, 1., -1.)
+
+        self.nfev = 0
+        self.steps = np.zeros(m, dtype=int)
+        self.rejected = np.zeros(m, dtype=int)
+        self.status = np.full(m, -1)
+
+        # working batch of the live rows, idx holding their original index
+        idx = np.arange(m)
+        T = T_out.copy()
+        X = X_out.copy()
+
+        F = self._f(T, X, copy=True)
+        if H0 is None:
+            H = self.initial_step(T, X, direction, F)
+        else:
+            H = direction * np.fabs(np.broadcast_to(H0, (m, 1)))
+
+        if T_eval is not None:
+            T_eval = np.asarray(T_eval, dtype=float).reshape((1, -1))
+            X_eval = np.full((m, T_eval.size, n), np.nan)
+            rows, k = np.nonzero(T_eval == T)
+            X_eval[rows, k] = X[rows]
+
+        if events is not None:
+            G = np.asarray(events(T, X)).reshape((-1, 1))
+
+        for attempt in range(self.max_steps):
+            if not idx.size:
+                break
+
+            remaining = tf - T
+            H = np.where(np.fabs(H) > np.fabs(remaining), remaining, H)
+
+            T_old, X_old, H_step = T, X, H
+            T, X, H, F, accepted = self.step(T, X, H, F)
+            self.steps[idx] += accepted
+            self.rejected[idx] += ~accepted
+
+            status = np.where(accepted & ((tf - T)*direction <= 0.)[0:, 0],
+                              0, -1)
+            status[~accepted & (T + H == T)[0:, 0]] = -2
+            theta_end = np.ones((idx.size, 1))
+
+            if events is not None:
+                rows = np.nonzero(accepted)[0]
+                G_new = G.copy()
+                G_new[rows] = np.asarray(events(T[rows], X[rows])).reshape(
+                    (-1, 1))
+                crossed = np.nonzero(
+                    accepted & ((G*G_new <= 0.) & (G != 0.))[0:, 0])[0]
+                G = G_new
+
+                if crossed.size:
+                    theta = self._locate(events, T_old[crossed],
+                                         X_old[crossed], H_step[crossed],
+                                         G_new[crossed], crossed)
+                    T[crossed] = T_old[crossed] + theta*H_step[crossed]
+                    X[crossed] = self.dense(X_old[crossed], H_step[crossed],
+                                            theta, self.K[0:, crossed])
+                    theta_end[crossed] = theta
+                    status[crossed] = 1
+
+            if T_eval is not None:
+                theta = (T_eval - T_old) / np.where(H_step != 0., H_step, 1.)
+                rows, k = np.nonzero(accepted.reshape((-1, 1)) &
+                                     (theta > 0.) & (theta <= theta_end))
+                if rows.size:
+                    X_eval[idx[rows], k] = self.dense(
+                        X_old[rows], H_step[rows],
+                        theta[rows, k].reshape((-1, 1)), self.K[0:, rows])
+
+            if done is not None:
+                rows = np.nonzero(accepted & (status < 0))[0]
+                if rows.size:
+                    converged = np.asarray(done(T[rows], X[rows]),
+                                           dtype=bool).reshape(-1)
+                    status[rows[converged]] = 2
+
+            if reset is not None:
+                rows = np.nonzero(accepted & (status < 0))[0]
+                if rows.size:
+                    mask, X_reset = reset(T[rows], X[rows])
+                    rows = rows[mask]
+                    if rows.size:
+                        X[rows] = X_reset
+                        F[rows] = self._f(T[rows], X[rows])
+                        if events is not None:
+                            G[rows] = np.asarray(events(
+                                T[rows], X[rows])).reshape((-1, 1))
+
+            finished = status != -1
+            if finished.any():
+                rows = idx[finished]
+                T_out[rows] = T[finished]
+                X_out[rows] = X[finished]
+                self.status[rows] = status[finished]
+
+                live = ~finished
+                idx = idx[live]
+                T, X, H, F = T[live], X[live], H[live], F[live]
+                tf, direction = tf[live], direction[live]
+                if events is not None:
+                    G = G[live]
+        else:
+            T_out[idx] = T
+            X_out[idx] = X
+            warnings.warn('DormandPrince: {} of {} rows did not finish in {} '
+                          'steps'.format(idx.size, m, self.max_steps),
+                          RuntimeWarning)
+
+        failed = np.count_nonzero(self.status == -2)
+        if failed:
+            warnings.warn('DormandPrince: {} of {} rows failed as their step '
+                          'size underflowed'.format(failed, m),
+                          RuntimeWarning)
+
+        self.T = T_out
+        return X_out if T_eval is None else X_eval
+
+    def _locate(self, events, T, X, H, G_end, rows, iterations=52):
+        """Bisect the continuous extension for the event zero crossings.
+
+        Parameters
+        ----------
+        events : callable
+            The event function.
+        T, X, H : ndarray
+            Times, states and step sizes at the start of the steps.
+        G_end : ndarray
+            Event values at the end of the steps.
+        rows : ndarray
+            Rows of the most recent step stages to interpolate.
+
+        Returns
+        -------
+        theta : ndarray
+            An mx1 array of step fractions where the events change sign.
+        """
+        K = self.K[0:, rows]
+        lo = np.zeros((rows.size, 1))
+        hi = np.ones((rows.size, 1))
+        G_hi = G_end
+        for _ in range(iterations):
+            mid = .5*(lo + hi)
+            G_mid = np.asarray(events(T + mid*H, self.dense(
+                X, H, mid, K))).reshape((-1, 1))
+            upper = (G_mid*G_hi <= 0.)
+            lo = np.where(upper, mid, lo)
+            hi = np.where(upper, hi, mid)
+            G_hi = np.where(upper, G_hi, G_mid)
+        return hi
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'DormandPrince({}, {}, {}, {})'.format(
+            self.dynamics, self.rtol, self.atol, self.max_steps)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'DormandPrince(dynamics={}, rtol={}, atol={}, '\
+            'max_steps={})'.format(self.dynamics, self.rtol, self.atol,
+                                   self.max_steps)
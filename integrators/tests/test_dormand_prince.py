@@ -0,0 +1,139 @@
+"""Created on Sat Oct 17 2026 08:07.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+from ..dormand_prince import DormandPrince
+from ...dynamics import SystemDynamics
+from ...dynamics import TwoBody
+
+
+class TestDormandPrince(unittest.TestCase):
+    """Test class for DormandPrince."""
+
+    def setUp(self):
+        """."""
+        self.dp = DormandPrince(SystemDynamics(TwoBody(1., 'rv')),
+                                rtol=1e-11, atol=1e-13)
+
+        # equatorial circular orbits of radius p
+        self.p = np.array([[1.], [1.5], [2.], [4.]])
+        zero = 0.*self.p
+        self.X0 = np.concatenate((self.p, zero, zero, zero, self.p**-.5,
+                                  zero), 1)
+
+    def circular(self, T):
+        """Exact states of the circular orbits at the mx1 or mxk times T."""
+        p = self.p.reshape((-1, 1, 1))
+        nt = p**-1.5 * T.reshape((self.p.shape[0], -1, 1))
+        v = p**-.5
+        return np.concatenate((p*np.cos(nt), p*np.sin(nt), 0.*nt,
+                               -v*np.sin(nt), v*np.cos(nt), 0.*nt), 2)
+
+    def test_continuous_extension(self):
+        tol = 1e-15
+
+        self.assertTrue((np.fabs(DormandPrince.P.sum(1) - DormandPrince.B) <
+                         tol).all())
+
+    def test_per_row_control(self):
+        tol = 1e-8
+
+        tf = np.array([[10.], [20.], [30.], [40.]])
+        X = self.dp.propagate(0., self.X0, tf)
+
+        self.assertTrue((np.fabs(X - self.circular(tf)[0:, 0]) < tol).all())
+        self.assertEqual(len(set(self.dp.steps)), 4)
+
+    def test_T_eval(self):
+        tol = 1e-8
+
+        T_eval = np.linspace(0., 25., 26)
+        X = self.dp.propagate(0., self.X0, 25., T_eval=T_eval)
+        T = np.tile(T_eval, (4, 1))
+
+        self.assertEqual(X.shape, (4, 26, 6))
+        self.assertTrue((np.fabs(X - self.circular(T)) < tol).all())
+
+    def test_backward(self):
+        tol = 1e-8
+
+        X = self.dp.propagate(0., self.X0, 15.)
+        X = self.dp.propagate(15., X, 0.)
+
+        self.assertTrue((np.fabs(X - self.X0) < tol).all())
+
+    def test_events(self):
+        tol = 1e-9
+
+        # the first crossing of y = 0 after the start, half an orbit later
+        X = self.dp.propagate(0., self.X0, 100., events=lambda T, X: X[0:, 1])
+        T = np.pi * self.p**1.5
+
+        self.assertTrue((self.dp.status == 1).all())
+        self.assertTrue((np.fabs(self.dp.T - T) < tol).all())
+        self.assertTrue((np.fabs(X - self.circular(T)[0:, 0]) < tol).all())
+
+    def test_done(self):
+        X = self.dp.propagate(0., self.X0, 100.,
+                              done=lambda T, X: X[0:, 0] < 0.)
+
+        self.assertTrue((self.dp.status == 2).all())
+        self.assertTrue((X[0:, 0] < 0.).all())
+        self.assertTrue((self.dp.T < np.pi * self.p**1.5).all())
+
+    def test_compaction(self):
+        tol = 1e-12
+
+        tf = np.array([[1.], [10.], [100.], [2.]])
+        X = self.dp.propagate(0., self.X0, tf)
+        nfev = self.dp.nfev
+        steps = self.dp.steps.copy()
+        self.assertTrue((self.dp.status == 0).all())
+
+        for i in range(4):
+            X_i = self.dp.propagate(0., self.X0[i:i+1], tf[i:i+1])
+            self.assertTrue((np.fabs(X[i] - X_i) < tol).all())
+            self.assertEqual(steps[i], self.dp.steps[0])
+
+        self.assertLess(nfev, 4 * (7*steps.max() + 2))
+
+    def test_step(self):
+        T = np.zeros((4, 1))
+        H = np.array([[1e-3], [0.], [1e-3], [0.]])
+        T1, X1, H1, F1, accepted = self.dp.step(T, self.X0, H)
+
+        self.assertTrue(accepted.all())
+        self.assertTrue((T1 == H).all())
+        self.assertTrue((X1[1] == self.X0[1]).all())
+        self.assertTrue((X1[0] != self.X0[0]).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+    def test_non_finite(self):
+        tol = 1e-8
+        two_body = SystemDynamics(TwoBody(1., 'rv'))
+
+        def dynamics(T, X):
+            """Two body rates, nan on the radius 2 orbit after T = 1."""
+            F = np.array(two_body(T, X))
+            r = np.linalg.norm(X[0:, 0:3], axis=1)
+            F[(np.fabs(r - 2.) < .1) & (T[0:, 0] > 1.)] = np.nan
+            return F
+
+        dp = DormandPrince(dynamics, rtol=1e-11, atol=1e-13)
+        tf = np.full((4, 1), 10.)
+        with self.assertWarns(RuntimeWarning):
+            X = dp.propagate(0., self.X0, tf)
+
+        self.assertEqual(list(dp.status), [0, 0, -2, 0])
+        self.assertLess(dp.rejected[2], 100)
+        self.assertTrue(np.isfinite(X).all())
+        self.assertTrue((np.fabs(X[2] - self.circular(dp.T)[2, 0]) <
+                         tol).all())
+        rows = [0, 1, 3]
+        self.assertTrue((np.fabs(X[rows] - self.circular(tf)[rows, 0]) <
+                         tol).all())
@@ -0,0 +1,4 @@
+from .mcpi import MCPI
+from .mcpi_approx import MCPIapprox
+from .warm_start_approx import WarmStartApprox
+from .warm_start_constant import WarmStartConstant
@@ -0,0 +1,174 @@
+"""Created on Sat Oct 17 2026 08:06.
+
+@author: Nathan Budd
+"""
+import warnings
+from functools import lru_cache
+import numpy as np
+import numpy.polynomial.chebyshev as npc
+from .mcpi_approx import MCPIapprox
+
+
+class MCPI():
+    """
+    Modified Chebyshev-Picard Iteration for batches of trajectories.
+
+    The domain is split into segments, each solved in turn from the final
+    states of the previous one. On a segment [t0, tf] of order N the states of
+    all K trajectories are sampled at the N+1 Chebyshev-Gauss-Lobatto nodes,
+    the dynamics are evaluated at every node of every trajectory in a single
+    call, and the Picard update
+
+        x(tau) = x0 + (tf - t0)/2 * integral_{-1}^{tau} f(t, x) ds
+
+    is applied through the Chebyshev coefficients of f, until the node states
+    change by less than tol.
+
+    Members
+    -------
+    dynamics : callable
+        Takes inputs (T, X), an mx1 array of times and an mxn array of
+        states, and returns an mxn array of state derivatives, e.g. a
+        SystemDynamics.
+    domains : ndarray
+        Segment boundaries [t0, t1, ..., tk] in increasing order.
+    N : tuple of int
+        Chebyshev order of each segment.
+    warm_start : callable
+        Takes inputs (T, X0, previous), the (N+1)x1 node times, the Kxn
+        initial states and the MCPIapprox of the preceding segments, and
+        returns the Kx(N+1)xn initial guess of the node states.
+    X0 : ndarray
+        A Kxn array of initial states.
+    tol : float
+        Convergence tolerance on the node states, relative to their magnitude
+        when it exceeds one.
+    max_iter : int
+        Maximum Picard iterations per segment.
+    iterations : list of int
+        Picard iterations used on each segment by the most recent solve.
+    """
+
+    def __init__(self, dynamics, domains, N, warm_start, X0, tol=1e-10,
+                 max_iter=300):
+        """."""
+        self.dynamics = dynamics
+        self.domains = np.array(domains, dtype=float)
+        self.N = tuple(int(n) for n in np.broadcast_to(
+            N, (self.domains.size - 1,)))
+        self.warm_start = warm_start
+        self.X0 = np.atleast_2d(np.array(X0, dtype=float))
+        self.tol = tol
+        self.max_iter = max_iter
+        self.iterations = []
+
+    def solve_serial(self):
+        """Solve the segments one after another.
+
+        Returns
+        -------
+        approx : MCPIapprox
+            Piecewise Chebyshev approximation of the trajectories.
+        """
+        approx = MCPIapprox()
+        self.iterations = []
+
+        X0 = self.X0
+        for s, N in enumerate(self.N):
+            t0, tf = self.domains[s], self.domains[s+1]
+            B, iterations = self._solve_segment(t0, tf, N, X0, approx)
+            approx.append(t0, tf, B)
+            self.iterations.append(iterations)
+
+            # every Chebyshev polynomial is one at tau = 1
+            X0 = B.sum(axis=1)
+
+        return approx
+
+    def _solve_segment(self, t0, tf, N, X0, previous):
+        """Picard iteration on one segment.
+
+        Returns
+        -------
+        B : ndarray
+            Kx(N+2)xn Chebyshev coefficients of the states.
+        iterations : int
+            Picard iterations used.
+        """
+        tau, V, P = _chebyshev_operators(N)
+        K, n = X0.shape
+        w = (tf - t0) / 2.
+
+        T = (tf + t0)/2. + w*tau.reshape((-1, 1))
+        T_all = np.tile(T, (K, 1))
+        X = self.warm_start(T, X0, None if not previous.coefficients
+                            else previous)
+
+        # the integral of f vanishes at tau = -1, leaving x0 on T_0
+        B0 = np.zeros((K, N+2, n))
+        B0[0:, 0] = X0
+
+        for iterations in range(1, self.max_iter+1):
+            F = np.asarray(self.dynamics(T_all, X.reshape((K*(N+1), n))))
+            B = B0 + w*(P @ F.reshape((K, N+1, n)))
+            X_new = V @ B
+
+            error = np.max(np.fabs(X_new - X))
+            scale = max(1., np.max(np.fabs(X_new)))
+            X = X_new
+            if error <= self.tol*scale:
+                break
+        else:
+            warnings.warn('MCPI: segment [{}, {}] did not converge in {} '
+                          'iterations'.format(t0, tf, self.max_iter),
+                          RuntimeWarning)
+
+        return B, iterations
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'MCPI({}, {}, {}, {}, {}, {}, {})'.format(
+            self.dynamics, self.domains, self.N, self.warm_start, self.X0,
+            self.tol, self.max_iter)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        output = 'MCPI'
+        output += '(dynamics={}, domains={}, N={}, warm_start={}, K={}, '\
+            'tol={})'.format(self.dynamics, self.domains, self.N,
+                             self.warm_start, self.X0.shape[0], self.tol)
+        return output
+
+
+@lru_cache(maxsize=None)
+def _chebyshev_operators(N):
+    """Nodes and matrices of an order N Picard iteration.
+
+    Returns
+    -------
+    tau : ndarray
+        The N+1 Chebyshev-Gauss-Lobatto nodes in increasing order.
+    V : ndarray
+        (N+1)x(N+2) values of T_0, ..., T_N+1 at the nodes.
+    P : ndarray
+        (N+2)x(N+1) map from the values of f at the nodes to the Chebyshev
+        coefficients of its integral from -1.
+    """
+    j = np.arange(N+1)
+    tau = -np.cos(np.pi * j / N)
+    V = npc.chebvander(tau, N+1)
+
+    # discrete orthogonality fit of f, halving the end nodes and order N
+    c = np.ones(N+1)
+    c[0] = c[-1] = .5
+    A = 2./N * c.reshape((-1, 1)) * V[0:, 0:N+1].T * c.reshape((1, -1))
+
+    # integral_{-1}^{tau} T_k = T_k+1/(2(k+1)) - T_k-1/(2(k-1)) + const
+    Int = np.zeros((N+2, N+1))
+    for k in range(1, N+2):
+        Int[k, k-1] = 2./(2*k) if k == 1 else 1./(2*k)
+        if k+1 <= N:
+            Int[k, k+1] = -1./(2*k)
+    Int[0] = -((-1.)**np.arange(N+2)) @ Int
+
+    return tau, V, Int @ A
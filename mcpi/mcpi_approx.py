@@ -0,0 +1,85 @@
+"""Created on Sat Oct 17 2026 08:06.
+
+@author: Nathan Budd
+"""
+import numpy as np
+import numpy.polynomial.chebyshev as npc
+
+
+class MCPIapprox():
+    """
+    Piecewise Chebyshev approximation of trajectories solved by MCPI.
+
+    Each segment [t0, tf] of the domain holds the Chebyshev coefficients of K
+    trajectories in the scaled time tau = (2t - tf - t0) / (tf - t0).
+
+    Members
+    -------
+    domains : ndarray
+        Segment boundaries [t0, t1, ..., tk] in increasing order.
+    coefficients : list of ndarray
+        Kx(N+2)xn Chebyshev coefficients of the states on each segment.
+    """
+
+    def __init__(self, domains=(), coefficients=()):
+        """."""
+        self.domains = np.array(domains, dtype=float)
+        self.coefficients = list(coefficients)
+
+    def append(self, t0, tf, B):
+        """Add the coefficients B, Kx(N+2)xn, of the segment [t0, tf]."""
+        if not self.coefficients:
+            self.domains = np.array([t0, tf], dtype=float)
+        else:
+            self.domains = np.append(self.domains, tf)
+        self.coefficients.append(B)
+
+    def __call__(self, T, der=0):
+        """Evaluate the trajectories at arbitrary times.
+
+        Times outside of the domain are evaluated on the first or last
+        segment.
+
+        Parameters
+        ----------
+        T : ndarray
+            An mx1 column array of times.
+        der : int, optional
+            Order of the time derivative to evaluate.
+
+        Returns
+        -------
+        X : ndarray
+            An mxn array of states, or KxMxn for K > 1 trajectories.
+        """
+        t = np.asarray(T, dtype=float).reshape(-1)
+        K, _, n = self.coefficients[0].shape
+        X = np.empty((K, t.size, n))
+
+        idx = np.searchsorted(self.domains[1:-1], t, side='right')
+        for s, B in enumerate(self.coefficients):
+            rows = np.nonzero(idx == s)[0]
+            if not rows.size:
+                continue
+            t0 = self.domains[s]
+            tf = self.domains[s+1]
+            tau = (2.*t[rows] - tf - t0) / (tf - t0)
+
+            C = B
+            for _ in range(der):
+                C = npc.chebder(C, scl=2./(tf - t0), axis=1)
+
+            # chebval returns Kxnxm for coefficients moved to the first axis
+            X[0:, rows] = npc.chebval(tau, np.moveaxis(C, 1, 0)).transpose(
+                (0, 2, 1))
+
+        return X[0] if K == 1 else X
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'MCPIapprox({}, {})'.format(self.domains, self.coefficients)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'MCPIapprox(domains={}, segments={})'.format(
+            self.domains, len(self.coefficients))
@@ -0,0 +1,102 @@
+"""Created on Sat Oct 17 2026 08:06.
+
+@author: Nathan Budd
+"""
+import unittest
+import numpy as np
+from ..mcpi import MCPI
+from ..mcpi import _chebyshev_operators
+from ..mcpi_approx import MCPIapprox
+from ..warm_start_approx import WarmStartApprox
+from ..warm_start_constant import WarmStartConstant
+from ...dynamics import SystemDynamics
+from ...dynamics import TwoBody
+
+
+class TestMCPI(unittest.TestCase):
+    """Test class for MCPI."""
+
+    def setUp(self):
+        """."""
+        self.sys = SystemDynamics(TwoBody(1., 'rv'))
+
+        # equatorial circular orbits of radius p
+        self.p = np.array([[1.], [1.5], [2.]])
+        self.X0 = np.concatenate((self.p, 0.*self.p, 0.*self.p, 0.*self.p,
+                                  self.p**-.5, 0.*self.p), 1)
+
+    def circular(self, T):
+        """Exact KxMx6 states of the circular orbits at times T."""
+        p = self.p.reshape((-1, 1, 1))
+        nt = p**-1.5 * T.reshape((1, -1, 1))
+        v = p**-.5
+        return np.concatenate((p*np.cos(nt), p*np.sin(nt), 0.*nt,
+                               -v*np.sin(nt), v*np.cos(nt), 0.*nt), 2)
+
+    def test_operators(self):
+        tol = 1e-14
+
+        tau, V, P = _chebyshev_operators(16)
+        F = np.stack((tau**0, tau**5, np.cos(tau)), 1)
+        integral = np.stack((tau + 1., (tau**6 - 1.)/6.,
+                             np.sin(tau) - np.sin(-1.)), 1)
+
+        self.assertTrue((np.fabs(V @ P @ F - integral) < tol).all())
+
+    def test_two_body(self):
+        tol = 1e-9
+
+        mcpi = MCPI(self.sys, np.linspace(0., 20., 11), 30,
+                    WarmStartConstant(), self.X0, 1e-12)
+        X_approx = mcpi.solve_serial()
+
+        T = np.linspace(0., 20., 101).reshape((101, 1))
+        X = X_approx(T)
+
+        self.assertIsInstance(X_approx, MCPIapprox)
+        self.assertEqual(len(mcpi.iterations), 10)
+        self.assertEqual(X.shape, (3, 101, 6))
+        self.assertTrue((np.fabs(X - self.circular(T)) < tol).all())
+
+    def test_single(self):
+        mcpi = MCPI(self.sys, (0., 5.), (20,), WarmStartConstant(),
+                    list(self.X0[1]), 1e-12)
+        X = mcpi.solve_serial()(np.array([[0.], [5.]]))
+
+        self.assertEqual(X.shape, (2, 6))
+        self.assertTrue((np.fabs(X[0] - self.X0[1]) < 1e-14).all())
+
+    def test_derivative(self):
+        tol = 1e-9
+
+        mcpi = MCPI(self.sys, np.linspace(0., 10., 6), 30,
+                    WarmStartConstant(), self.X0, 1e-12)
+        X_approx = mcpi.solve_serial()
+
+        T = np.linspace(0., 10., 31).reshape((31, 1))
+        Xdot = X_approx(T, der=1)
+        for k in range(3):
+            Xdot_k = self.sys(T, X_approx(T)[k])
+            self.assertTrue((np.fabs(Xdot[k] - Xdot_k) < tol).all())
+
+    def test_warm_start(self):
+        domains = np.linspace(0., 20., 11)
+
+        cold = MCPI(self.sys, domains, 30, WarmStartConstant(), self.X0,
+                    1e-12)
+        X_cold = cold.solve_serial()
+
+        previous = MCPI(self.sys, domains, 30, WarmStartApprox(), self.X0,
+                        1e-12)
+        previous.solve_serial()
+
+        warm = MCPI(self.sys, domains, 30, WarmStartApprox(X_cold), self.X0,
+                    1e-12)
+        warm.solve_serial()
+
+        self.assertLess(sum(previous.iterations), sum(cold.iterations))
+        self.assertLess(sum(warm.iterations), sum(previous.iterations))
+
+
+if __name__ == '__main__':
+    unittest.main()
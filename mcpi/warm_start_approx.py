@@ -0,0 +1,68 @@
+"""Created on Sat Oct 17 2026 08:06.
+
+@author: Nathan Budd
+"""
+import numpy as np
+
+
+class WarmStartApprox():
+    """
+    Initial MCPI guess from an existing approximation.
+
+    If an approximation is given, such as the solution of a neighbouring
+    problem, it is evaluated at the nodes and shifted to match the initial
+    states. Otherwise, the states are extrapolated linearly from the initial
+    states with the final rates of the preceding segment, and held constant on
+    the first segment.
+
+    Members
+    -------
+    approx : MCPIapprox or None
+        Approximation evaluated at the nodes.
+    """
+
+    def __init__(self, approx=None):
+        """."""
+        self.approx = approx
+
+    def __call__(self, T, X0, previous=None):
+        """Guess the states at the nodes of a segment.
+
+        Parameters
+        ----------
+        T : ndarray
+            An (N+1)x1 column array of node times.
+        X0 : ndarray
+            A Kxn array of initial states.
+        previous : MCPIapprox, optional
+            Solution of the preceding segments.
+
+        Returns
+        -------
+        X : ndarray
+            A Kx(N+1)xn array of states.
+        """
+        t = T[0:, 0]
+        if self.approx is not None:
+            X = self._evaluate(self.approx, t)
+            return X - X[0:, 0:1] + X0[0:, np.newaxis]
+
+        X = np.repeat(X0[0:, np.newaxis], t.size, axis=1)
+        if previous is not None:
+            Xdot = self._evaluate(previous, t[0:1], der=1)
+            X += Xdot * (t - t[0]).reshape((1, -1, 1))
+        return X
+
+    @staticmethod
+    def _evaluate(approx, t, der=0):
+        """Evaluate approx at times t as a Kxmxn array."""
+        X = approx(t.reshape((-1, 1)), der=der)
+        return X if X.ndim == 3 else X[np.newaxis]
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'WarmStartApprox({})'.format(self.approx)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'WarmStartApprox(approx={})'.format(self.approx)
@@ -0,0 +1,38 @@
+"""Created on Sat Oct 17 2026 08:06.
+
+@author: Nathan Budd
+"""
+import numpy as np
+
+
+class WarmStartConstant():
+    """
+    Initial MCPI guess holding the initial states constant over a segment.
+    """
+
+    def __call__(self, T, X0, previous=None):
+        """Guess the states at the nodes of a segment.
+
+        Parameters
+        ----------
+        T : ndarray
+            An (N+1)x1 column array of node times.
+        X0 : ndarray
+            A Kxn array of initial states.
+        previous : MCPIapprox, optional
+            Solution of the preceding segments. Ignored.
+
+        Returns
+        -------
+        X : ndarray
+            A Kx(N+1)xn array of states.
+        """
+        return np.repeat(X0[0:, np.newaxis], T.shape[0], axis=1)
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'WarmStartConstant()'
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'WarmStartConstant()'
@@ -6,7 +6,10 @@ import numpy as np
 
 
 def E2M(coe_E):
-    """Convert eccentric anomaly, E, to elliptic mean anomaly, M.
+    """Convert eccentric anomaly, E, to mean anomaly, M.
+
+    As returned by M2E, the last element is the hyperbolic anomaly H for
+    samples with e > 1 and the parabolic anomaly D for samples with e == 1.
 
     Input
     -----
@@ -20,9 +23,19 @@ def E2M(coe_E):
     mx6 array of classical orbital elements [p e i W w M]. m is the number
     of samples and 6 is the dimension of the element set.
     """
-    e = coe_E[0:, 1:2]
-    E = coe_E[0:, -1:]
+    M = _mean_anomaly(coe_E[0:, 1:2], coe_E[0:, -1:])
+    return np.concatenate((coe_E[0:, 0:-1], M), 1)
 
-    M = E - e*np.sin(E)
 
-    return np.concatenate((coe_E[0:, 0:-1], M), 1)
+def _mean_anomaly(e, E):
+    """The mx1 mean anomaly column of E2M from mx1 columns e and E."""
+    elliptic = e < 1.
+    hyperbolic = e > 1.
+    parabolic = e == 1.
+
+    dtype = np.promote_types(E.dtype, np.float32)
+    M = np.zeros(E.shape, dtype=dtype)
+    M[elliptic] = E[elliptic] - e[elliptic]*np.sin(E[elliptic])
+    M[hyperbolic] = e[hyperbolic]*np.sinh(E[hyperbolic]) - E[hyperbolic]
+    M[parabolic] = E[parabolic] + E[parabolic]**3/3.
+    return M
@@ -8,6 +8,10 @@ import numpy as np
 def E2f(coe_E):
     """Convert eccentric anomaly, E, to true anomaly, f.
 
+    As returned by M2E, the last element is the hyperbolic anomaly H for
+    samples with e > 1 and the parabolic anomaly D = tan(f/2) for samples with
+    e == 1.
+
     Input
     -----
     coe_E : ndarray
@@ -20,8 +24,21 @@ def E2f(coe_E):
     mx6 array of classical orbital elements [p e i W w f]. m is the number
     of samples and 6 is the dimension of the element set.
     """
-    e = coe_E[0:, 1:2]
-    E = coe_E[0:, -1:]
-    tan_f_by_2 = ((1.+e)/(1.-e))**.5 * np.tan(E/2)
-    f = 2 * np.arctan(tan_f_by_2)
+    f = _true_anomaly(coe_E[0:, 1:2], coe_E[0:, -1:])
     return np.concatenate((coe_E[0:, 0:-1], f), 1)
+
+
+def _true_anomaly(e, E):
+    """The mx1 true anomaly column of E2f from mx1 columns e and E."""
+    elliptic = e < 1.
+    hyperbolic = e > 1.
+    parabolic = e == 1.
+
+    dtype = np.promote_types(E.dtype, np.float32)
+    tan_f_by_2 = np.zeros(E.shape, dtype=dtype)
+    tan_f_by_2[elliptic] = (((1.+e[elliptic])/(1.-e[elliptic]))**.5 *
+                            np.tan(E[elliptic]/2))
+    tan_f_by_2[hyperbolic] = (((e[hyperbolic]+1.)/(e[hyperbolic]-1.))**.5 *
+                              np.tanh(E[hyperbolic]/2))
+    tan_f_by_2[parabolic] = E[parabolic]
+    return 2 * np.arctan(tan_f_by_2)
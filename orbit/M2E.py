@@ -2,11 +2,23 @@
 
 @author: Nathan Budd
 """
+import warnings
 import numpy as np
 
 
-def M2E(coe_M):
-    """Convert elliptic mean anomaly, M,  to eccentric anomaly, E.
+def M2E(coe_M, tol=1e-14, max_iter=20, E0=None):
+    """Convert mean anomaly, M,  to eccentric anomaly, E.
+
+    Kepler's equation is solved with Danby's quartic iteration on an active
+    set, so that only samples which have not yet converged are iterated.
+    Elliptic samples (e < 1) are started from Danby's M + .85e*sign(sin(M))
+    guess. Hyperbolic samples (e > 1) solve M = e*sinh(H) - H for the
+    hyperbolic anomaly H, which is returned in place of E. Parabolic samples
+    (e == 1) solve Barker's equation, M = D + D**3/3, in closed form for the
+    parabolic anomaly D = tan(f/2), which is returned in place of E.
+
+    The iteration always runs in float64, so single precision input is only
+    rounded once, on output, and tol keeps its meaning.
 
     Input
     -----
@@ -14,21 +26,106 @@ def M2E(coe_M):
     mx6 array of classical orbital elements [p e i W w M]. m is the number
     of samples and 6 is the dimension of the element set.
 
+    tol : float
+    Convergence tolerance on the size of the last anomaly correction.
+
+    max_iter : int
+    Maximum number of iterations. Samples that have not converged by then are
+    returned as is and a RuntimeWarning is issued.
+
+    E0 : ndarray, optional
+    mx1 array of initial guesses for the anomaly, e.g. the solution at the
+    previous time of a sequential time grid.
+
     Output
     ------
     coe_E : ndarray
     mx6 array of classical orbital elements [p e i W w E]. m is the number
     of samples and 6 is the dimension of the element set.
     """
-    tol = 1e-14
-    e = coe_M[0:, 1:2]
-    M = coe_M[0:, -1:]
-    E0 = M + np.sign(np.sin(M))*e
-    E1 = E0 + 1.
-
-    while np.max(np.absolute(E1 - E0)) > tol:
-        E0 = E1
-        E1 = E0 + (M - E0 + e*np.sin(E0)) / (1. - e*np.cos(E0))
-
-    coe_E = np.concatenate((coe_M[0:, 0:-1], E1), 1)
-    return coe_E
+    E = _solve_kepler(coe_M[0:, 1:2], coe_M[0:, -1:], tol, max_iter, E0)
+    dtype = np.promote_types(coe_M.dtype, np.float32)
+    return np.concatenate((coe_M[0:, 0:-1], E.astype(dtype, copy=False)), 1)
+
+
+def _solve_kepler(e, M, tol=1e-14, max_iter=20, E0=None):
+    """The mx1 float64 anomaly column of M2E from mx1 columns e and M."""
+    e = e.astype(np.float64, copy=False)
+    M = M.astype(np.float64, copy=False)
+    if E0 is not None:
+        E0 = np.asarray(E0, dtype=np.float64)
+    E = np.zeros(M.shape)
+
+    elliptic = e < 1.
+    hyperbolic = e > 1.
+    parabolic = e == 1.
+
+    # solve elliptic samples on the principal branch, then restore the
+    # revolutions
+    M_e = M[elliptic]
+    e_e = e[elliptic]
+    M_wrap = np.mod(M_e + np.pi, 2*np.pi) - np.pi
+    revs = M_e - M_wrap
+    if E0 is None:
+        E_e = M_wrap + .85*e_e*np.sign(np.sin(M_wrap))
+    else:
+        E_e = E0[elliptic] - revs
+    E_e, unconverged = _danby(_kepler_elliptic, M_wrap, e_e, E_e, tol,
+                              max_iter)
+    E[elliptic] = E_e + revs
+
+    M_h = M[hyperbolic]
+    e_h = e[hyperbolic]
+    if E0 is None:
+        H_h = np.sign(M_h) * np.log(2.*np.absolute(M_h)/e_h + 1.8)
+    else:
+        H_h = E0[hyperbolic]
+    H_h, unconverged_h = _danby(_kepler_hyperbolic, M_h, e_h, H_h, tol,
+                                max_iter)
+    E[hyperbolic] = H_h
+
+    # D**3 + 3D - 3M = 0 has the single real root 2sinh(asinh(3M/2)/3)
+    E[parabolic] = 2.*np.sinh(np.arcsinh(1.5*M[parabolic])/3.)
+
+    unconverged += unconverged_h
+    if unconverged:
+        warnings.warn('M2E: {} of {} samples did not converge in {} '
+                      'iterations'.format(unconverged, M.shape[0], max_iter),
+                      RuntimeWarning)
+
+    return E
+
+
+def _kepler_elliptic(E, e, M):
+    """Elliptic Kepler's equation and its first three derivatives in E."""
+    es = e*np.sin(E)
+    ec = e*np.cos(E)
+    return E - es - M, 1. - ec, es, ec
+
+
+def _kepler_hyperbolic(H, e, M):
+    """Hyperbolic Kepler's equation and its first three derivatives in H."""
+    es = e*np.sinh(H)
+    ec = e*np.cosh(H)
+    return es - H - M, ec - 1., es, ec
+
+
+def _danby(kepler, M, e, E, tol, max_iter):
+    """Iterate the active set of 1D arrays M, e, E with Danby's method.
+
+    Returns the anomalies and the number of samples that did not converge.
+    """
+    E = E.copy()
+    active = np.arange(E.size)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        Ea = E[active]
+        f0, f1, f2, f3 = kepler(Ea, e[active], M[active])
+        d1 = -f0 / f1
+        d2 = -f0 / (f1 + d1*f2/2.)
+        d3 = -f0 / (f1 + d2*f2/2. + d2**2*f3/6.)
+        E[active] = Ea + d3
+        active = active[~(np.absolute(d3) <= tol)]
+
+    return E, active.size
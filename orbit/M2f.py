@@ -3,13 +3,17 @@
 @author: Nathan Budd
 """
 import numpy as np
-from .M2E import M2E
-from .E2f import E2f
+from .M2E import _solve_kepler
+from .E2f import _true_anomaly
 
 
-def M2f(coe_M):
+def M2f(coe_M, tol=1e-14, max_iter=20):
     """Convert mean anomaly, M,  to true anomaly, f.
 
+    The eccentric anomaly is kept as a column rather than as a full element
+    array. See M2E for tol and max_iter. As in M2E, the Kepler iteration and
+    the true anomaly are computed in float64 whatever the input precision.
+
     Input
     -----
     coe_M : ndarray
@@ -22,6 +26,7 @@ def M2f(coe_M):
     mx6 array of classical orbital elements [p e i W w f]. m is the number
     of samples and 6 is the dimension of the element set.
     """
-    coe_E = M2E(coe_M)
-    coe_f = E2f(coe_E)
-    return coe_f
+    e = coe_M[0:, 1:2].astype(np.float64)
+    f = _true_anomaly(e, _solve_kepler(e, coe_M[0:, -1:], tol, max_iter))
+    dtype = np.promote_types(coe_M.dtype, np.float32)
+    return np.concatenate((coe_M[0:, 0:-1], f.astype(dtype, copy=False)), 1)
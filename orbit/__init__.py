@@ -1,8 +1,18 @@
+from .backend import get_backend
+from .backend import set_backend
 from .coe2mee import coe2mee
 from .coe2rv import coe2rv
+from .convert import convert
+from .convert import conversion_path
+from .convert import element_sets
+from .convert import register_conversion
+from .convert import register_element_set
+from .convert_npy import convert_npy
 from .diff_elements import diff_elements
 from .E2f import E2f
 from .E2M import E2M
+from .element_batch import ElementBatch
+from .euler_rotate import euler_rotate
 from .euler_sequence import euler_sequence
 from .f2E import f2E
 from .f2M import f2M
@@ -10,5 +20,6 @@ from .M2E import M2E
 from .M2f import M2f
 from .mee2coe import mee2coe
 from .mee2rv import mee2rv
+from .propagate_rv import propagate_rv
 from .rv2coe import rv2coe
 from .rv2mee import rv2mee
@@ -0,0 +1,54 @@
+"""Created on Sat Oct 17 2026 09:33.
+
+@author: Nathan Budd
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+backends = ('numpy', 'numba')
+
+# numba is used if it is installed, otherwise the NumPy code paths
+_backend = ['numpy' if numba is None else 'numba']
+
+
+def get_backend():
+    """Name of the active backend, numpy or numba."""
+    return _backend[0]
+
+
+def set_backend(name):
+    """
+    Select how the row-wise kernels are evaluated.
+
+    With the numba backend, rv2mee, mee2rv, euler_sequence and the Gauss
+    Variational Equations run compiled loops over the rows of float64 arrays,
+    without temporaries. Other inputs still take the NumPy code paths.
+
+    Parameters
+    ----------
+    name : string
+        numpy or numba. Raises ImportError if numba is not installed.
+    """
+    if name not in backends:
+        raise ValueError('backend: unknown backend {}'.format(name))
+    if name == 'numba' and numba is None:
+        raise ImportError('backend: numba is not installed')
+    _backend[0] = name
+
+
+def jit(func):
+    """Compile func with numba, or return None if numba is not installed."""
+    if numba is None:
+        return None
+    return numba.njit(nogil=True, error_model='numpy')(func)
+
+
+def use_jit(kernel, *arrays):
+    """Whether to run kernel, a result of jit, on float64 ndarrays."""
+    return (kernel is not None and _backend[0] == 'numba' and
+            all(type(A) is np.ndarray and A.dtype == np.float64
+                for A in arrays))
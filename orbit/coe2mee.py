@@ -9,6 +9,9 @@ def coe2mee(COE, mu=1.):
     """
     Convert classical orbital elements to modified equinoctial elements.
 
+    The precision of COE is kept, except that the true longitude is wrapped
+    in float64.
+
     Parameters
     ----------
     COE : ndarray
@@ -38,6 +41,6 @@ def coe2mee(COE, mu=1.):
     k = np.tan(i/2.) * np.sin(W)
 
     # true longitude
-    L = np.mod(W+w+nu, 2*np.pi)
+    L = np.mod(W.astype(np.float64) + w + nu, 2*np.pi).astype(f.dtype)
 
     return np.concatenate((p, f, g, h, k, L), 1)
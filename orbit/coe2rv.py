@@ -3,25 +3,61 @@
 @author: Nathan Budd
 """
 import numpy as np
-from .coe2mee import coe2mee
-from .mee2rv import mee2rv
 
 
-def coe2rv(COE, mu=1.):
+def coe2rv(COE, mu=1., out=None):
     """
     Convert classical orbital elements to inertial position and velocity.
 
+    The perifocal state is rotated into the inertial frame directly, using the
+    argument of latitude u = w + f, without an equinoctial intermediate.
+
     Parameters
     ----------
     COE : ndarray
         mx6 array of elements ordered as [p e i W w f].
     mu : float
         Standard gravitational parameter. Defaults to canonical units.
+    out : ndarray, optional
+        mx6 array in which to place the result.
 
     Returns
     -------
     RV : ndarray
         mx6 array of elements ordered as [r_x r_y r_z v_x v_y v_z].
     """
+    p = COE[0:, 0]
+    e = COE[0:, 1]
+    i = COE[0:, 2]
+    W = COE[0:, 3]
+    f = COE[0:, 5]
+
+    u = COE[0:, 4] + f
+    su = np.sin(u)
+    cu = np.cos(u)
+    sW = np.sin(W)
+    cW = np.cos(W)
+    si = np.sin(i)
+    ci = np.cos(i)
+    ecf = e*np.cos(f)
+
+    # radial, i_r, and transverse, i_t, directions in the inertial frame
+    sW_ci = sW*ci
+    cW_ci = cW*ci
+    i_r = (cW*cu - sW_ci*su, sW*cu + cW_ci*su, si*su)
+    i_t = (-cW*su - sW_ci*cu, -sW*su + cW_ci*cu, si*cu)
+
+    r = p / (1. + ecf)
+    rt_mu_p = (mu/p)**.5
+    v_r = rt_mu_p * e*np.sin(f)
+    v_t = rt_mu_p * (1. + ecf)
+
+    if out is None:
+        out = np.empty(COE.shape, dtype=np.promote_types(COE.dtype,
+                                                         np.float32))
+    for k in range(3):
+        np.multiply(r, i_r[k], out=out[0:, k])
+        np.multiply(v_r, i_r[k], out=out[0:, k+3])
+        out[0:, k+3] += v_t * i_t[k]
 
-    return mee2rv(coe2mee(COE))
+    return out
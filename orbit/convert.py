@@ -0,0 +1,174 @@
+"""Created on Sat Oct 17 2026 09:23.
+
+@author: Nathan Budd
+"""
+import heapq
+import numpy as np
+from .coe2mee import coe2mee
+from .coe2rv import coe2rv
+from .E2f import E2f
+from .E2M import E2M
+from .f2E import f2E
+from .f2M import f2M
+from .M2E import M2E
+from .M2f import M2f
+from .mee2coe import mee2coe
+from .mee2rv import mee2rv
+from .rv2mee import rv2mee
+
+# element set name: names of the elements in order
+element_sets = {'coe': ('p', 'e', 'i', 'W', 'w', 'f'),
+                'coe_E': ('p', 'e', 'i', 'W', 'w', 'E'),
+                'coe_M': ('p', 'e', 'i', 'W', 'w', 'M'),
+                'mee': ('p', 'f', 'g', 'h', 'k', 'L'),
+                'rv': ('r_x', 'r_y', 'r_z', 'v_x', 'v_y', 'v_z')}
+
+# src: {dst: (func, cost, accepts_out)}, costs roughly relative to mee2rv
+_conversions = {}
+_paths = {}
+
+
+def register_element_set(name, components):
+    """
+    Add or replace an element set.
+
+    Parameters
+    ----------
+    name : string
+        Element set name.
+    components : tuple of strings
+        Names of the elements in order.
+    """
+    element_sets[name] = tuple(components)
+    _paths.clear()
+
+
+def register_conversion(src, dst, func, cost=1., accepts_out=False):
+    """
+    Add or replace a direct conversion between two element sets.
+
+    Parameters
+    ----------
+    src, dst : string
+        Registered element set names.
+    func : callable
+        Takes an mx6 array of src elements and mu and returns the mx6 array
+        of dst elements.
+    cost : float
+        Relative cost used to choose between paths, roughly the run time
+        relative to mee2rv.
+    accepts_out : bool
+        Whether func also takes the keyword out, an mx6 array in which to
+        place the result.
+    """
+    for name in (src, dst):
+        if name not in element_sets:
+            raise ValueError('convert: unknown element set {}'.format(name))
+    _conversions.setdefault(src, {})[dst] = (func, cost, accepts_out)
+    _paths.clear()
+
+
+def conversion_path(src, dst):
+    """
+    List the element sets of the cheapest conversion path from src to dst.
+
+    Raises ValueError if either set is unknown or dst can not be reached.
+    """
+    for name in (src, dst):
+        if name not in element_sets:
+            raise ValueError('convert: unknown element set {}'.format(name))
+
+    if (src, dst) not in _paths:
+        # Dijkstra's algorithm over the conversion graph
+        heap = [(0., [src])]
+        done = set()
+        while heap:
+            cost, path = heapq.heappop(heap)
+            if path[-1] == dst:
+                _paths[src, dst] = path
+                break
+            if path[-1] in done:
+                continue
+            done.add(path[-1])
+            for node, edge in _conversions.get(path[-1], {}).items():
+                if node not in done:
+                    heapq.heappush(heap, (cost + edge[1], path + [node]))
+        else:
+            raise ValueError('convert: no conversion from {} to {}'.format(
+                src, dst))
+
+    return _paths[src, dst]
+
+
+def convert(X, src, dst, mu=1., out=None, dtype=None):
+    """
+    Convert elements between any two registered element sets.
+
+    The cheapest chain of registered conversions is used, so fused kernels
+    such as coe2rv are preferred over chains through other element sets.
+
+    The built in conversions preserve float32 input, halving memory traffic.
+    The Kepler iteration in M2E and the wrapping of longitudes with arctan2
+    and mod still run in float64. The largest float32 errors measured with
+    benchmarks/bench_precision.py over elliptic orbits with .05 < e < .9,
+    relative for p and for r and v, absolute in radians otherwise, are
+
+        coe -> mee   3e-5      mee -> coe   5e-7
+        mee -> rv    3e-6      rv -> mee    5e-4
+        coe -> rv    2e-6      rv -> coe    5e-6
+        f -> E       8e-7      E -> f       5e-7
+        f -> M       2e-6      M -> f       5e-7
+
+    rv -> mee loses the most, as h and k and the longitude are recovered
+    from cross products of single precision vectors.
+
+    Parameters
+    ----------
+    X : ndarray
+        mx6 array of src elements, ordered as given in element_sets.
+    src, dst : string
+        Element set names, e.g. coe, coe_E, coe_M, mee, rv.
+    mu : float
+        Standard gravitational parameter. Defaults to canonical units.
+    out : ndarray, optional
+        mx6 array in which to place the result. The last conversion writes
+        into it directly if it is able to.
+    dtype : data-type, optional
+        Cast X to this type once before converting, e.g. np.float32.
+
+    Returns
+    -------
+    Y : ndarray
+        mx6 array of dst elements. X itself if src and dst are the same and
+        out is not given.
+    """
+    if dtype is not None:
+        X = np.asarray(X, dtype=dtype)
+    path = conversion_path(src, dst)
+    hops = list(zip(path[0:-1], path[1:]))
+    for k, (a, b) in enumerate(hops):
+        func, cost, accepts_out = _conversions[a][b]
+        if out is not None and accepts_out and k == len(hops) - 1:
+            return func(X, mu, out=out)
+        X = func(X, mu)
+
+    if out is None:
+        return X
+    np.copyto(out, X)
+    return out
+
+
+for _src, _dst, _func, _cost in [
+        ('coe', 'mee', lambda X, mu: coe2mee(X, mu), .5),
+        ('mee', 'coe', lambda X, mu: mee2coe(X, mu), .55),
+        ('mee', 'rv', mee2rv, 1.),
+        ('rv', 'mee', lambda X, mu: rv2mee(X, mu), 1.35),
+        ('coe', 'rv', coe2rv, 1.1),
+        ('coe', 'coe_E', lambda X, mu: f2E(X), .12),
+        ('coe_E', 'coe', lambda X, mu: E2f(X), .14),
+        ('coe_E', 'coe_M', lambda X, mu: E2M(X), .2),
+        ('coe_M', 'coe_E', lambda X, mu: M2E(X), .85),
+        ('coe', 'coe_M', lambda X, mu: f2M(X), .24),
+        ('coe_M', 'coe', lambda X, mu: M2f(X), .95)]:
+    register_conversion(_src, _dst, _func, _cost,
+                        accepts_out=_func in (coe2rv, mee2rv))
@@ -0,0 +1,69 @@
+"""Created on Sat Oct 17 2026 09:35.
+
+@author: Nathan Budd
+"""
+import numpy as np
+from .convert import conversion_path
+from .convert import convert
+from .convert import element_sets
+
+
+def convert_npy(src_path, dst_path, src, dst, mu=1., chunk_rows=65536,
+                dtype=None, progress=None):
+    """
+    Convert a .npy file of elements into another .npy file, chunk by chunk.
+
+    The input is memory-mapped read-only and the output is created as a
+    memory-mapped .npy file, so the catalog never has to fit in memory. Each
+    chunk of rows is converted with convert and written straight into the
+    output, so the temporaries of the conversion, and so the peak memory use,
+    scale with chunk_rows rather than with the catalog. Mapped pages of the
+    files are flushed after every chunk and can be reclaimed by the OS.
+
+    Raises ValueError, before dst_path is touched, if there is no conversion
+    from src to dst or the input is not an array of src elements.
+
+    Parameters
+    ----------
+    src_path, dst_path : string
+        Paths of the input .npy file, an mx6 array of src elements, and of
+        the output .npy file, which is overwritten.
+    src, dst : string
+        Element set names, see convert and element_sets.
+    mu : float
+        Standard gravitational parameter. Defaults to canonical units.
+    chunk_rows : int
+        Number of rows converted at a time.
+    dtype : data-type, optional
+        Data type of the output and of the computation. Defaults to the
+        input type, promoted to at least float32.
+    progress : callable, optional
+        Called as progress(rows_done, rows_total) after every chunk.
+
+    Returns
+    -------
+    Y : memmap
+        mx6 memory-mapped array of dst elements, backed by dst_path.
+    """
+    conversion_path(src, dst)
+    X = np.load(src_path, mmap_mode='r')
+    n = len(element_sets[src])
+    if X.ndim != 2 or X.shape[1] != n:
+        raise ValueError('convert_npy: {} holds a {} array, not mx{}'.format(
+            src_path, X.shape, n))
+    if dtype is None:
+        dtype = np.promote_types(X.dtype, np.float32)
+
+    m = X.shape[0]
+    Y = np.lib.format.open_memmap(
+        dst_path, mode='w+', dtype=dtype,
+        shape=(m, len(element_sets[dst])))
+    for start in range(0, m, chunk_rows):
+        stop = min(start + chunk_rows, m)
+        convert(np.asarray(X[start:stop], dtype=dtype), src, dst, mu,
+                out=np.asarray(Y[start:stop]))
+        Y.flush()
+        if progress is not None:
+            progress(stop, m)
+
+    return Y
@@ -0,0 +1,150 @@
+"""Created on Sat Oct 17 2026 09:25.
+
+@author: Nathan Budd
+"""
+import numpy as np
+from .convert import convert
+from .convert import element_sets
+
+
+class ElementBatch():
+    """
+    A batch of orbital elements stored component by component.
+
+    The elements are held as a 6xm array, so that each named component, e.g.
+    batch.e or batch['e'], is a contiguous zero-copy view. The batch also
+    behaves as the usual mxn array, the transposed view batch.X, so it can be
+    passed to every orbit and dynamics function in place of an ndarray. Their
+    column slices X[0:, j:j+1] then read contiguous memory.
+
+    Members
+    -------
+    data : ndarray
+        6xm array of elements, one component per row.
+    element_set : string
+        Name of a set registered in orbit.element_sets, e.g. coe or rv.
+    """
+
+    def __init__(self, data, element_set):
+        """.
+
+        Parameters
+        ----------
+        data : ndarray
+            6xm array of elements, one component per row. Used as is.
+        element_set : string
+            See orbit.element_sets.
+        """
+        if element_set not in element_sets:
+            raise ValueError('ElementBatch: unknown element set {}'.format(
+                element_set))
+        self.data = data
+        self.element_set = element_set
+
+    @classmethod
+    def from_array(cls, X, element_set):
+        """Copy an mxn array of elements into a new ElementBatch."""
+        X = np.asarray(X)
+        data = np.empty(X.shape[::-1],
+                        dtype=np.promote_types(X.dtype, np.float32))
+        np.copyto(data.T, X)
+        return cls(data, element_set)
+
+    @classmethod
+    def empty(cls, m, element_set, dtype=float):
+        """An uninitialized ElementBatch of m samples."""
+        return cls(np.empty((len(element_sets[element_set]), m), dtype=dtype),
+                   element_set)
+
+    @property
+    def components(self):
+        """Names of the components in order."""
+        return element_sets[self.element_set]
+
+    @property
+    def X(self):
+        """The mxn array view of the elements."""
+        return self.data.T
+
+    @property
+    def shape(self):
+        """Shape of the mxn array view."""
+        return self.data.T.shape
+
+    @property
+    def dtype(self):
+        """Data type of the elements."""
+        return self.data.dtype
+
+    def __len__(self):
+        """Number of samples."""
+        return self.data.shape[1]
+
+    def __array__(self, dtype=None, copy=None):
+        """The mxn array view, for np.asarray and friends.
+
+        Follows the NumPy 2 protocol: copy=True always copies, copy=False
+        raises ValueError if the dtype requires a copy.
+        """
+        if dtype is None or np.dtype(dtype) == self.data.dtype:
+            return self.data.T.copy() if copy else self.data.T
+        if copy is False:
+            raise ValueError('ElementBatch: a {} array of {} elements needs a '
+                             'copy'.format(np.dtype(dtype), self.data.dtype))
+        return self.data.T.astype(dtype)
+
+    def __getitem__(self, key):
+        """A component view by name, otherwise index the mxn array view."""
+        if isinstance(key, str):
+            return self.data[self.components.index(key)]
+        return self.data.T[key]
+
+    def __setitem__(self, key, value):
+        """Assign a component by name, otherwise into the mxn array view."""
+        if isinstance(key, str):
+            self.data[self.components.index(key)] = value
+        else:
+            self.data.T[key] = value
+
+    def __getattr__(self, name):
+        """A component view by name."""
+        try:
+            components = element_sets[self.__dict__['element_set']]
+            return self.__dict__['data'][components.index(name)]
+        except (KeyError, ValueError):
+            raise AttributeError(name) from None
+
+    def convert(self, element_set, mu=1., out=None):
+        """
+        Convert to another element set with orbit.convert.
+
+        Parameters
+        ----------
+        element_set : string
+            See orbit.element_sets.
+        mu : float
+            Standard gravitational parameter. Defaults to canonical units.
+        out : ElementBatch, optional
+            Batch in which to place the result, written through its mxn view.
+
+        Returns
+        -------
+        ElementBatch
+        """
+        if out is None:
+            out = ElementBatch.empty(len(self), element_set,
+                                     dtype=self.data.dtype)
+        elif out.element_set != element_set:
+            raise ValueError('ElementBatch: out holds {}, not {}'.format(
+                out.element_set, element_set))
+        convert(self.X, self.element_set, element_set, mu, out=out.X)
+        return out
+
+    def __repr__(self):
+        """Printable represenation of the object."""
+        return 'ElementBatch({}, {})'.format(self.data, self.element_set)
+
+    def __str__(self):
+        """Human readable represenation of the object."""
+        return 'ElementBatch(m={}, element_set={})'.format(
+            len(self), self.element_set)
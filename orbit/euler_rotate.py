@@ -0,0 +1,43 @@
+"""Created on Sat Oct 17 2026 07:44.
+
+@author: Nathan Budd
+"""
+import numpy as np
+from .euler_sequence import _principal_rotate
+
+
+def euler_rotate(axes, V, *args, out=None):
+    """
+    Rotate vectors through any number of principal rotations.
+
+    Equivalent to C @ v for every row, where C = euler_sequence(axes, *args),
+    but the principal rotations are applied to the vectors directly and the
+    DCMs are never formed.
+
+    Parameters
+    ----------
+    axes : list of ints
+        Ordered list of the axis of each principal rotation.
+        Allowable values: (1, 2, 3)
+    V : ndarray
+        mx3 array of vectors.
+    args : list of ndarrays
+        Each ndarray is a 2D column of angles.
+    out : ndarray, optional
+        mx3 array in which to place the result. May be V itself.
+
+    Returns
+    -------
+    V_rot : ndarray
+        mx3 array of rotated vectors.
+    """
+    if out is None:
+        out = np.array(V, dtype=float)
+    elif out is not V:
+        out[...] = V
+
+    m = V.shape[0]
+    for axis, angle in zip(axes, args):
+        _principal_rotate(axis, angle.reshape(m), out)
+
+    return out
@@ -2,12 +2,13 @@
 
 @author: Nathan Budd
 """
+import math
 import numpy as np
-from math import cos
-from math import sin
+from .backend import jit
+from .backend import use_jit
 
 
-def euler_sequence(axes, *args):
+def euler_sequence(axes, *args, output='dcm'):
     """
     Create direction cosine matrices from any number of principal roations.
 
@@ -19,6 +20,13 @@ def euler_sequence(axes, *args):
     result of a 1-axis rotation through a followed by a 2-axis rotation through
     b: C = C_2(b) @ C_1(a)
 
+    Every principal rotation is applied to the whole stack at once, mixing two
+    rows of the accumulated DCMs in closed form. With the numba backend,
+    float64 angles are composed row by row by a compiled loop instead.
+
+    Raises ValueError, on either backend, unless there is one axis of 1, 2 or
+    3 per array of angles.
+
     Parameters
     ----------
     axes : list of ints
@@ -26,48 +34,147 @@ def euler_sequence(axes, *args):
         Allowable values: (1, 2, 3)
     args : list of ndarrays
         Each ndarray is a 2D column of angles.
+    output : string
+        'dcm' for mx3x3 direction cosine matrices, or 'quaternion' for mx4
+        quaternions [q0 q1 q2 q3], scalar first, such that
+        C = (q0**2 - q.q) I + 2 q q^T - 2 q0 [q x].
 
     Returns
     -------
     DCM : ndarray
         A 3D ndarray. Each entry along the first index is a 3x3 DCM
-        corresponding to the input angles.
+        corresponding to the input angles. An mx4 array of quaternions if
+        output is 'quaternion'.
     """
+    if len(axes) != len(args) or any(axis not in (1, 2, 3) for axis in axes):
+        raise ValueError('euler_sequence: {} is not a sequence of one axis, '
+                         '1, 2 or 3, per angle array'.format(list(axes)))
+    m = args[0].shape[0]
+
+    if use_jit(_dcm_rows, *args):
+        angles = np.concatenate([angle.reshape((m, 1)) for angle in args], 1)
+        axes = np.array(axes, dtype=np.int64)
+        if output == 'quaternion':
+            return _quaternion_rows(axes, angles, np.empty((m, 4)))
+        return _dcm_rows(axes, angles, np.empty((m, 3, 3)))
+
+    if output == 'quaternion':
+        Q = np.zeros((m, 4))
+        Q[0:, 0] = 1.
+        for axis, angle in zip(axes, args):
+            Q = _principal_quaternion(axis, angle.reshape(m), Q)
+        return Q
 
-    def C(i, x):
-        """
-        Create an i-axis DCM through x.
-
-        Parameters
-        ----------
-        i : int
-            Axis number.
-        x : float
-            Angle of rotation.
-
-        Returns
-        -------
-        DCM : ndarray
-            A 3x3 direction principal axis DCM.
-        """
-        if i == 1:
-            return np.array([[1., 0., 0.],
-                             [0., cos(x), sin(x)],
-                             [0., -sin(x), cos(x)]])
-        elif i == 2:
-            return np.array([[cos(x), 0., -sin(x)],
-                             [0., 1., 0.],
-                             [sin(x), 0., cos(x)]])
-        elif i == 3:
-            return np.array([[cos(x), sin(x), 0.],
-                             [-sin(x), cos(x), 0.],
-                             [0., 0., 1.]])
-
-    m, n = args[0].shape
-    DCM = np.tile(np.eye(3), (m, 1, 1))
-
-    for i in range(m):
-        for j, axis in enumerate(axes):
-            DCM[i] = C(axis, args[j][i, 0]) @ DCM[i]
+    DCM = np.zeros((m, 3, 3))
+    DCM[0:, 0, 0] = 1.
+    DCM[0:, 1, 1] = 1.
+    DCM[0:, 2, 2] = 1.
+    for axis, angle in zip(axes, args):
+        _principal_rotate(axis, angle.reshape(m), DCM)
 
     return DCM
+
+
+def _principal_rotate(axis, x, A):
+    """
+    Left-multiply an axis DCM through angles x into A, in place.
+
+    Parameters
+    ----------
+    axis : int
+        Axis number.
+    x : ndarray
+        1D array of m angles of rotation.
+    A : ndarray
+        Array whose first index runs over the m samples and whose second
+        index is the vector component, e.g. an mx3 array of vectors or an
+        mx3x3 array of DCMs.
+    """
+    j, k = {1: (1, 2), 2: (2, 0), 3: (0, 1)}[axis]
+    shape = x.shape + (1,)*(A.ndim - 2)
+    c = np.cos(x).reshape(shape)
+    s = np.sin(x).reshape(shape)
+
+    A_j = A[0:, j].copy()
+    A[0:, j] *= c
+    A[0:, j] += s * A[0:, k]
+    A[0:, k] *= c
+    A[0:, k] -= s * A_j
+
+
+def _principal_quaternion(axis, x, Q):
+    """
+    Compose an axis rotation through angles x after the mx4 quaternions Q.
+
+    Parameters
+    ----------
+    axis : int
+        Axis number.
+    x : ndarray
+        1D array of m angles of rotation.
+    Q : ndarray
+        mx4 array of quaternions [q0 q1 q2 q3].
+
+    Returns
+    -------
+    Q : ndarray
+        mx4 array of composed quaternions.
+    """
+    j, k = {1: (1, 2), 2: (2, 0), 3: (0, 1)}[axis]
+    c = np.cos(x/2.)
+    s = np.sin(x/2.)
+
+    # product of the principal quaternion [c, s e_axis] with Q
+    Q_out = c.reshape((-1, 1)) * Q
+    Q_out[0:, 0] -= s * Q[0:, axis]
+    Q_out[0:, axis] += s * Q[0:, 0]
+    Q_out[0:, 1+j] += s * Q[0:, 1+k]
+    Q_out[0:, 1+k] -= s * Q[0:, 1+j]
+    return Q_out
+
+
+@jit
+def _dcm_rows(axes, angles, DCM):
+    """Compiled euler_sequence DCMs, one row at a time, placed in DCM."""
+    for i in range(angles.shape[0]):
+        DCM[i] = 0.
+        DCM[i, 0, 0] = 1.
+        DCM[i, 1, 1] = 1.
+        DCM[i, 2, 2] = 1.
+        for n in range(axes.shape[0]):
+            j = axes[n] % 3
+            k = (axes[n] + 1) % 3
+            c = math.cos(angles[i, n])
+            s = math.sin(angles[i, n])
+            for col in range(3):
+                A_j = DCM[i, j, col]
+                A_k = DCM[i, k, col]
+                DCM[i, j, col] = A_j*c + s*A_k
+                DCM[i, k, col] = A_k*c - s*A_j
+
+    return DCM
+
+
+@jit
+def _quaternion_rows(axes, angles, Q):
+    """Compiled euler_sequence quaternions, one row at a time, placed in Q."""
+    q = np.empty(4)
+    for i in range(angles.shape[0]):
+        Q[i] = 0.
+        Q[i, 0] = 1.
+        for n in range(axes.shape[0]):
+            axis = axes[n]
+            j = axis % 3
+            k = (axis + 1) % 3
+            c = math.cos(angles[i, n]/2.)
+            s = math.sin(angles[i, n]/2.)
+
+            # product of the principal quaternion [c, s e_axis] with Q
+            q[0:] = Q[i]
+            Q[i] *= c
+            Q[i, 0] -= s * q[axis]
+            Q[i, axis] += s * q[0]
+            Q[i, 1+j] += s * q[1+k]
+            Q[i, 1+k] -= s * q[1+j]
+
+    return Q
@@ -8,6 +8,9 @@ import numpy as np
 def f2E(coe_f):
     """Convert true anomaly, f, to eccentric anomaly, E.
 
+    As for M2E, the hyperbolic anomaly H is returned for samples with e > 1
+    and the parabolic anomaly D = tan(f/2) for samples with e == 1.
+
     Input
     -----
     coe_f : ndarray
@@ -20,8 +23,22 @@ def f2E(coe_f):
     mx6 array of classical orbital elements [p e i W w E ]. m is the number
     of samples and 6 is the dimension of the element set.
     """
-    e = coe_f[0:, 1:2]
-    f = coe_f[0:, -1:]
-    tan_E_by_2 = ((1.-e)/(1.+e))**.5 * np.tan(f/2)
-    E = 2 * np.arctan(tan_E_by_2)
+    E = _eccentric_anomaly(coe_f[0:, 1:2], coe_f[0:, -1:])
     return np.concatenate((coe_f[0:, 0:-1], E), 1)
+
+
+def _eccentric_anomaly(e, f):
+    """The mx1 anomaly column of f2E from mx1 columns e and f."""
+    elliptic = e < 1.
+    hyperbolic = e > 1.
+    parabolic = e == 1.
+
+    tan_f_by_2 = np.tan(f/2)
+    dtype = np.promote_types(f.dtype, np.float32)
+    E = np.zeros(f.shape, dtype=dtype)
+    E[elliptic] = 2 * np.arctan(((1.-e[elliptic])/(1.+e[elliptic]))**.5 *
+                                tan_f_by_2[elliptic])
+    E[hyperbolic] = 2 * np.arctanh(((e[hyperbolic]-1.)/(e[hyperbolic]+1.))**.5
+                                   * tan_f_by_2[hyperbolic])
+    E[parabolic] = tan_f_by_2[parabolic]
+    return E
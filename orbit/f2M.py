@@ -3,13 +3,16 @@
 @author: Nathan Budd
 """
 import numpy as np
-from .M2E import M2E
-from .E2f import E2f
+from .E2M import _mean_anomaly
+from .f2E import _eccentric_anomaly
 
 
 def f2M(coe_f):
     """Convert true anomaly, f, to mean anomaly, M.
 
+    The eccentric anomaly is kept as a column rather than as a full element
+    array.
+
     Input
     -----
     coe_f : ndarray
@@ -22,5 +25,6 @@ def f2M(coe_f):
     mx6 array of classical orbital elements [p e i W w M]. m is the number
     of samples and 6 is the dimension of the element set.
     """
-    coe_E = f2E(coe_f)
-    return E2m(coe_E)
+    e = coe_f[0:, 1:2]
+    M = _mean_anomaly(e, _eccentric_anomaly(e, coe_f[0:, -1:]))
+    return np.concatenate((coe_f[0:, 0:-1], M), 1)
@@ -9,6 +9,9 @@ def mee2coe(MEE, mu=1.):
     """
     Convert modified equinoctial elements to classical orbital elements.
 
+    The precision of MEE is kept, except that the angles are found and
+    wrapped in float64.
+
     Parameters
     ----------
     MEE : ndarray
@@ -22,12 +25,13 @@ def mee2coe(MEE, mu=1.):
         mx6 array of elements ordered as [p e i W w f].
     """
 
+    dtype = np.promote_types(MEE.dtype, np.float32)
     p = MEE[0:, 0:1]
-    f = MEE[0:, 1:2]
-    g = MEE[0:, 2:3]
-    h = MEE[0:, 3:4]
-    k = MEE[0:, 4:5]
-    L = MEE[0:, 5:6]
+    f = MEE[0:, 1:2].astype(np.float64)
+    g = MEE[0:, 2:3].astype(np.float64)
+    h = MEE[0:, 3:4].astype(np.float64)
+    k = MEE[0:, 4:5].astype(np.float64)
+    L = MEE[0:, 5:6].astype(np.float64)
 
     # inclination
     i = 2. * np.arctan((h**2 + k**2)**.5)
@@ -46,4 +50,4 @@ def mee2coe(MEE, mu=1.):
     # true anomaly
     f = np.mod(L - w_bar, 2*np.pi)
 
-    return np.concatenate((p, e, i, W, w, f), 1)
+    return np.concatenate((p, e, i, W, w, f), 1, dtype=dtype)
@@ -2,27 +2,39 @@
 
 @author: Nathan Budd
 """
+import math
 import numpy as np
-import numpy.linalg as npl
-import scipy.linalg as spl
+from .backend import jit
+from .backend import use_jit
 
 
-def mee2rv(MEE, mu=1.):
+def mee2rv(MEE, mu=1., out=None):
     """
     Convert modified equinoctial elements to inertial position and velocity.
 
+    The equinoctial to inertial rotation is applied to the whole batch at once
+    using the closed-form columns of the rotation matrix. With the numba
+    backend, float64 batches are converted row by row by a compiled loop.
+
     Parameters
     ----------
     MEE : ndarray
         mx6 array of elements ordered as [p f g h k L].
     mu : float
         Standard gravitational parameter. Defaults to canonical units.
+    out : ndarray, optional
+        mx6 array in which to place the result.
 
     Returns
     -------
     RV : ndarray
         mx6 array of elements ordered as [r_x r_y r_z v_x v_y v_z].
     """
+    if out is None:
+        out = np.empty(MEE.shape, dtype=np.promote_types(MEE.dtype,
+                                                         np.float32))
+    if use_jit(_mee2rv_rows, MEE, out):
+        return _mee2rv_rows(MEE, mu, out)
 
     p = MEE[0:, 0:1]
     f = MEE[0:, 1:2]
@@ -33,36 +45,77 @@ def mee2rv(MEE, mu=1.):
 
     cL = np.cos(L)
     sL = np.sin(L)
-
-    r = p / (1. + f*cL + g*sL)
+    w = 1. + f*cL + g*sL
 
     # r in equinoctial frame
-    zero = np.zeros(p.shape)
-    r_equ = r * np.concatenate((cL, sL, zero), 1)
-
-    # v in equinoctial frame
-    r_dot = (mu/p)**(.5) * (f*sL - g*cL)
-    rL_dot = (mu/p)**(.5) * (1. + f*cL + g*sL)
-    v_equ = np.concatenate((r_dot*cL - rL_dot*sL,
-                            r_dot*sL + rL_dot*cL,
-                            zero), 1)
-
-    RV_equ = np.concatenate((r_equ, v_equ), 1)
-    RV = np.zeros(RV_equ.shape)
-
-    for i, rv_equ in enumerate(RV_equ):
-        # rotation matrix from equinoctial to earth-centered inertial frame
-        h1 = h[i, 0]
-        k1 = k[i, 0]
-        h2 = h1**2
-        k2 = k1**2
+    r = p / w
+    r_f = r * cL
+    r_g = r * sL
+
+    # v in equinoctial frame, from the radial and transverse components so
+    # that r*v_transverse = sqrt(mu*p) holds to roundoff even when w is small
+    rt_mu_p = (mu/p)**(.5)
+    r_dot = rt_mu_p * (f*sL - g*cL)
+    rL_dot = rt_mu_p * w
+    v_f = r_dot*cL - rL_dot*sL
+    v_g = r_dot*sL + rL_dot*cL
+
+    # equinoctial x,y directions in ECI frame, i.e. the first two columns of
+    # the rotation matrix from the equinoctial to the earth-centered inertial
+    # frame
+    h2 = h**2
+    k2 = k**2
+    hk2 = 2.*h*k
+    den = 1. / (1. + h2 + k2)
+    f_eci = den * np.concatenate((1.+h2-k2, hk2, -2.*k), 1)
+    g_eci = den * np.concatenate((hk2, 1.-h2+k2, 2.*h), 1)
+
+    # rotate r,v into ECI frame
+    np.multiply(f_eci, r_f, out=out[0:, 0:3])
+    out[0:, 0:3] += g_eci * r_g
+    np.multiply(f_eci, v_f, out=out[0:, 3:6])
+    out[0:, 3:6] += g_eci * v_g
+
+    return out
+
+
+@jit
+def _mee2rv_rows(MEE, mu, RV):
+    """Compiled mee2rv, one row at a time, placing the result in RV."""
+    for j in range(MEE.shape[0]):
+        p, f, g = MEE[j, 0], MEE[j, 1], MEE[j, 2]
+        h, k, L = MEE[j, 3], MEE[j, 4], MEE[j, 5]
+
+        cL = math.cos(L)
+        sL = math.sin(L)
+        w = 1. + f*cL + g*sL
+
+        # r in equinoctial frame
+        r = p / w
+        r_f = r * cL
+        r_g = r * sL
+
+        # v in equinoctial frame
+        rt_mu_p = (mu/p)**(.5)
+        r_dot = rt_mu_p * (f*sL - g*cL)
+        rL_dot = rt_mu_p * w
+        v_f = r_dot*cL - rL_dot*sL
+        v_g = r_dot*sL + rL_dot*cL
+
+        # equinoctial x,y directions in ECI frame
+        h2 = h**2
+        k2 = k**2
+        hk2 = 2.*h*k
         den = 1. / (1. + h2 + k2)
-        eci_C_equ = den * np.array([[1.+h2-k2, 2.*h1*k1, 2.*k1],
-                                    [2.*h1*k1, 1.-h2+k2, -2.*h1],
-                                    [-2.*k1, 2.*h1, 1.-h2-k2]])
-        C_rv = spl.block_diag(eci_C_equ, eci_C_equ)
+        f_x, f_y, f_z = den*(1.+h2-k2), den*hk2, den*(-2.*k)
+        g_x, g_y, g_z = den*hk2, den*(1.-h2+k2), den*(2.*h)
 
         # rotate r,v into ECI frame
-        RV[i:i+1] = (C_rv @ rv_equ.reshape((6, 1))).T
+        RV[j, 0] = f_x*r_f + g_x*r_g
+        RV[j, 1] = f_y*r_f + g_y*r_g
+        RV[j, 2] = f_z*r_f + g_z*r_g
+        RV[j, 3] = f_x*v_f + g_x*v_g
+        RV[j, 4] = f_y*v_f + g_y*v_g
+        RV[j, 5] = f_z*v_f + g_z*v_g
 
     return RV
@@ -0,0 +1,147 @@
+"""Created on Sat Oct 17 2026 08:12.
+
+@author: Nathan Budd
+"""
+import warnings
+import numpy as np
+import numpy.linalg as npl
+
+
+def propagate_rv(RV0, dT, mu=1., tol=1e-13, max_iter=50):
+    """Propagate inertial position and velocity along two-body conics.
+
+    Kepler's problem is solved in the universal variable, chi, with the
+    Laguerre-Conway iteration on an active set, so elliptic, parabolic and
+    hyperbolic samples are handled together in one batch. Elliptic samples
+    are first reduced to less than one period.
+
+    Parameters
+    ----------
+    RV0 : ndarray
+        mx6 array of initial states ordered as [r_x r_y r_z v_x v_y v_z].
+    dT : ndarray
+        mx1 array of times since the initial states, or a scalar.
+    mu : float
+        Standard gravitational parameter. Defaults to canonical units.
+    tol : float
+        Convergence tolerance on the last correction to chi, relative to chi
+        when it exceeds one.
+    max_iter : int
+        Maximum number of iterations. Samples that have not converged by then
+        are returned as is and a RuntimeWarning is issued.
+
+    Returns
+    -------
+    RV : ndarray
+        mx6 array of states at the propagated times.
+    """
+    R0 = RV0[0:, 0:3]
+    V0 = RV0[0:, 3:6]
+    m = RV0.shape[0]
+    dT = np.array(np.broadcast_to(dT, (m, 1)), dtype=float)
+    rt_mu = mu**.5
+
+    r0 = npl.norm(R0, ord=2, axis=1).reshape((m, 1))
+    rv0 = np.einsum('ij,ij->i', R0, V0).reshape((m, 1)) / rt_mu
+    alpha = 2./r0 - np.einsum('ij,ij->i', V0, V0).reshape((m, 1)) / mu
+
+    # remove whole periods of elliptic samples
+    elliptic = alpha > 1e-12
+    period = 2.*np.pi / rt_mu / np.where(elliptic, alpha, 1.)**1.5
+    dT = np.where(elliptic, np.fmod(dT, period), dT)
+
+    # initial guesses
+    chi = rt_mu * dT / r0
+    chi = np.where(elliptic, rt_mu * dT * alpha, chi)
+    hyperbolic = alpha < -1e-12
+    a_h = 1. / np.where(hyperbolic, alpha, -1.)
+    s = np.where(dT < 0., -1., 1.)
+    arg = (-2.*mu*alpha*dT) / (rv0*rt_mu + s*(-mu*a_h)**.5*(1. - r0*alpha))
+    chi_h = s*(-a_h)**.5*np.log(np.where(arg > 0., arg, 1.))
+    chi = np.where(hyperbolic & (arg > 0.), chi_h, chi)
+
+    chi, unconverged = _laguerre(chi[0:, 0], r0[0:, 0], rv0[0:, 0],
+                                 alpha[0:, 0], rt_mu*dT[0:, 0], tol,
+                                 max_iter)
+    if unconverged:
+        warnings.warn('propagate_rv: {} of {} samples did not converge in {} '
+                      'iterations'.format(unconverged, m, max_iter),
+                      RuntimeWarning)
+    chi = chi.reshape((m, 1))
+
+    # Lagrange coefficients
+    chi2 = chi**2
+    C, S = _stumpff(alpha*chi2)
+    f = 1. - chi2/r0*C
+    g = dT - chi2*chi/rt_mu*S
+    R = f*R0 + g*V0
+    r = npl.norm(R, ord=2, axis=1).reshape((m, 1))
+    f_dot = rt_mu/(r*r0) * chi*(alpha*chi2*S - 1.)
+    g_dot = 1. - chi2/r*C
+    V = f_dot*R0 + g_dot*V0
+
+    return np.concatenate((R, V), 1)
+
+
+def _stumpff(z):
+    """Stumpff functions C(z) and S(z), by series near z = 0."""
+    small = np.absolute(z) < 1e-2
+    zs = np.where(small, 0., z)
+    y = np.absolute(zs)**.5
+    y3 = np.where(small, 1., y**3)
+
+    # circular functions for z > 0 and hyperbolic ones for z < 0
+    positive = zs > 0.
+    c = np.where(positive, np.cos(y), np.cosh(y))
+    s = np.where(positive, np.sin(y), np.sinh(y))
+    C = (1. - c) / np.where(small, 1., zs)
+    S = np.where(positive, y - s, s - y) / y3
+
+    z = np.where(small, z, 0.)
+    C_series = 1./2 - z/24 + z**2/720 - z**3/40320 + z**4/3628800
+    S_series = 1./6 - z/120 + z**2/5040 - z**3/362880 + z**4/39916800
+
+    return np.where(small, C_series, C), np.where(small, S_series, S)
+
+
+def _kepler_universal(chi, r0, rv0, alpha, rt_mu_dT):
+    """Universal Kepler's equation, its first two derivatives in chi and the
+    magnitude of its terms."""
+    chi2 = chi**2
+    z = alpha*chi2
+    C, S = _stumpff(z)
+    k = 1. - alpha*r0
+    terms = (rv0*chi2*C, k*chi2*chi*S, r0*chi, -rt_mu_dT)
+    F = terms[0] + terms[1] + terms[2] + terms[3]
+    dF = rv0*chi*(1. - z*S) + k*chi2*C + r0
+    ddF = rv0*(1. - z*C) + k*chi*(1. - z*S)
+    scale = sum(np.absolute(term) for term in terms)
+    return F, dF, ddF, scale
+
+
+def _laguerre(chi, r0, rv0, alpha, rt_mu_dT, tol, max_iter, n=5.):
+    """Iterate the active set of 1D arrays with the Laguerre-Conway method.
+
+    Samples converge when the last correction is within tol, or when the
+    residual is at the roundoff level of the terms of Kepler's equation.
+
+    Returns chi and the number of samples that did not converge.
+    """
+    eps = 8.*np.finfo(float).eps
+    chi = chi.copy()
+    active = np.arange(chi.size)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        x = chi[active]
+        F, dF, ddF, scale = _kepler_universal(
+            x, r0[active], rv0[active], alpha[active], rt_mu_dT[active])
+        root = np.absolute((n - 1.)**2*dF**2 - n*(n - 1.)*F*ddF)**.5
+        den = dF + np.where(dF < 0., -root, root)
+        d = -n*F / np.where(den != 0., den, 1.)
+        chi[active] = x + d
+        converged = ((np.absolute(d) <= tol*np.maximum(1., np.absolute(x))) |
+                     (np.absolute(F) <= eps*scale))
+        active = active[~converged]
+
+    return chi, active.size
@@ -24,4 +24,4 @@ def rv2coe(RV, mu=1.):
         mx6 array of elements ordered as [p e i W w f].
     """
 
-    return mee2coe(rv2mee(RV))
+    return mee2coe(rv2mee(RV, mu))
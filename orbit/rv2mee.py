@@ -2,14 +2,22 @@
 
 @author: Nathan Budd
 """
+import math
 import numpy as np
 import numpy.linalg as npl
+from .backend import jit
+from .backend import use_jit
 
 
 def rv2mee(RV, mu=1.):
     """
     Convert inertial position and velocity to modified equinoctial elements.
 
+    All operations act on whole columns of the batch, so memory use is linear
+    in the number of samples. The precision of RV is kept, except that the
+    true longitude is found and wrapped in float64. With the numba backend,
+    float64 batches are converted row by row by a compiled loop instead.
+
     Parameters
     ----------
     RV : ndarray
@@ -24,6 +32,9 @@ def rv2mee(RV, mu=1.):
     """
     tol = 1e-14
 
+    if use_jit(_rv2mee_rows, RV):
+        return _rv2mee_rows(RV, mu, tol, np.empty(RV.shape))
+
     R = RV[0:, 0:3]
     V = RV[0:, 3:6]
     m, n = RV.shape
@@ -39,48 +50,87 @@ def rv2mee(RV, mu=1.):
     energy = (v**2)/2 - mu/r
 
     # semilatus rectum
-    p = np.zeros((m, 1))
-    for i, en in enumerate(energy):
-        is_parabola = -tol <= en <= tol
-        p[i, 0] = (-H_norm[i, 0]**2 / mu if is_parabola
-                   else H_norm[i, 0]**2 / mu)
+    is_parabola = np.absolute(energy) <= tol
+    p = np.where(is_parabola, -H_norm**2 / mu, H_norm**2 / mu)
 
     # equinocital x,y components of ascending node vector
     h = -H_hat[0:, 1:2] / (1. + H_hat[0:, 2:3])
     k = H_hat[0:, 0:1] / (1. + H_hat[0:, 2:3])
 
-    # equinoctial x,y directions in equinoctial frame
-    f_equ = np.array([[1., 0., 0.]]).T
-    g_equ = np.array([[0., 1., 0.]]).T
-
-    # equinoctial x,y directions in ECI frame
-    f_eci = np.zeros((m, 3))
-    g_eci = np.zeros((m, 3))
-
-    for i in range(h.shape[0]):
-        # rotation matrix from equinoctial to earth-centered inertial frame
-        h1 = h[i, 0]
-        k1 = k[i, 0]
-        h2 = h1**2
-        k2 = k1**2
-        den = 1. / (1. + h2 + k2)
-        eci_C_equ = den * np.array([[1.+h2-k2, 2.*h1*k1, 2.*k1],
-                                    [2.*h1*k1, 1.-h2+k2, -2.*h1],
-                                    [-2.*k1, 2.*h1, 1.-h2-k2]])
-
-        f_eci[i:i+1] = (eci_C_equ @ f_equ).T
-        g_eci[i:i+1] = (eci_C_equ @ g_equ).T
+    # equinoctial x,y directions in ECI frame, i.e. the first two columns of
+    # the rotation matrix from the equinoctial to the earth-centered inertial
+    # frame
+    h2 = h**2
+    k2 = k**2
+    hk2 = 2.*h*k
+    den = 1. / (1. + h2 + k2)
+    f_eci = den * np.concatenate((1.+h2-k2, hk2, -2.*k), 1)
+    g_eci = den * np.concatenate((hk2, 1.-h2+k2, 2.*h), 1)
 
     # eccentricity vectors
     e = np.cross(V, H)/mu - R/r
 
     # equinoctial x,y components of eccentricity vector
-    f = np.diagonal(e @ f_eci.T).reshape((m, 1))
-    g = np.diagonal(e @ g_eci.T).reshape((m, 1))
+    f = np.einsum('ij,ij->i', e, f_eci).reshape((m, 1))
+    g = np.einsum('ij,ij->i', e, g_eci).reshape((m, 1))
 
     # true longitude
-    cL = np.diagonal(f_eci @ R.T)
-    sL = np.diagonal(g_eci @ R.T)
+    cL = np.einsum('ij,ij->i', f_eci, R).astype(np.float64)
+    sL = np.einsum('ij,ij->i', g_eci, R).astype(np.float64)
     L = np.mod(np.arctan2(sL, cL), 2*np.pi).reshape((m, 1))
+    L = L.astype(np.promote_types(RV.dtype, np.float32), copy=False)
 
     return np.concatenate((p, f, g, h, k, L), 1)
+
+
+@jit
+def _rv2mee_rows(RV, mu, tol, MEE):
+    """Compiled rv2mee, one row at a time, placing the result in MEE."""
+    for j in range(RV.shape[0]):
+        r_x, r_y, r_z = RV[j, 0], RV[j, 1], RV[j, 2]
+        v_x, v_y, v_z = RV[j, 3], RV[j, 4], RV[j, 5]
+        r = math.sqrt(r_x**2 + r_y**2 + r_z**2)
+        v = math.sqrt(v_x**2 + v_y**2 + v_z**2)
+
+        # angular momentum
+        H_x = r_y*v_z - r_z*v_y
+        H_y = r_z*v_x - r_x*v_z
+        H_z = r_x*v_y - r_y*v_x
+        H_norm = math.sqrt(H_x**2 + H_y**2 + H_z**2)
+
+        energy = (v**2)/2 - mu/r
+
+        # semilatus rectum
+        p = H_norm**2 / mu
+        if abs(energy) <= tol:
+            p = -p
+
+        # equinocital x,y components of ascending node vector
+        h = -(H_y/H_norm) / (1. + H_z/H_norm)
+        k = (H_x/H_norm) / (1. + H_z/H_norm)
+
+        # equinoctial x,y directions in ECI frame
+        h2 = h**2
+        k2 = k**2
+        hk2 = 2.*h*k
+        den = 1. / (1. + h2 + k2)
+        f_x, f_y, f_z = den*(1.+h2-k2), den*hk2, den*(-2.*k)
+        g_x, g_y, g_z = den*hk2, den*(1.-h2+k2), den*(2.*h)
+
+        # eccentricity vector
+        e_x = (v_y*H_z - v_z*H_y)/mu - r_x/r
+        e_y = (v_z*H_x - v_x*H_z)/mu - r_y/r
+        e_z = (v_x*H_y - v_y*H_x)/mu - r_z/r
+
+        MEE[j, 0] = p
+        MEE[j, 1] = e_x*f_x + e_y*f_y + e_z*f_z
+        MEE[j, 2] = e_x*g_x + e_y*g_y + e_z*g_z
+        MEE[j, 3] = h
+        MEE[j, 4] = k
+
+        # true longitude
+        L = math.atan2(g_x*r_x + g_y*r_y + g_z*r_z,
+                       f_x*r_x + f_y*r_y + f_z*r_z)
+        MEE[j, 5] = L % (2*math.pi)
+
+    return MEE
@@ -2,19 +2,29 @@
 
 @author: Nathan Budd
 """
+import os
+import tempfile
 import unittest
+import warnings
 from math import pi
 import numpy as np
 import numpy.random as npr
 from .. import orbit as orb
+from .backend import numba
 from .diff_elements import diff_elements
 
 
 class TestOrbit(unittest.TestCase):
     """Test class for Orbit."""
 
+    backend = 'numpy'
+
     def setUp(self):
-        pass
+        self.saved_backend = orb.get_backend()
+        orb.set_backend(self.backend)
+
+    def tearDown(self):
+        orb.set_backend(self.saved_backend)
 
     def test_rv2mee2rv(self):
         tol = 1e-9
@@ -59,6 +69,41 @@ class TestOrbit(unittest.TestCase):
 
         self.assertTrue((np.fabs(MEE_diff) < tol).all())
 
+    def test_rv2mee_rows_independent(self):
+        tol = 1e-14
+
+        m = 100
+        p = npr.rand(m, 1) * 10
+        e = npr.rand(m, 1)
+        i = npr.rand(m, 1) * np.pi*.95
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        COE = np.concatenate((p, e, i, W, w, f), 1)
+        RV = orb.coe2rv(COE)
+
+        MEE_batch = orb.rv2mee(RV)
+        MEE_rows = np.concatenate([orb.rv2mee(RV[j:j+1]) for j in range(m)])
+
+        MEE_diff = diff_elements(MEE_batch, MEE_rows, angle_idx=[5])
+        self.assertTrue((np.fabs(MEE_diff) < tol).all())
+
+    def test_mee2rv_out(self):
+        m = 100
+        p = npr.rand(m, 1) * 10
+        e = npr.rand(m, 1)
+        i = npr.rand(m, 1) * np.pi
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        MEE = orb.coe2mee(np.concatenate((p, e, i, W, w, f), 1))
+
+        RV = np.zeros((m, 6))
+        RV_out = orb.mee2rv(MEE, out=RV)
+
+        self.assertIs(RV_out, RV)
+        self.assertTrue((RV == orb.mee2rv(MEE)).all())
+
     def test_mee2coe2mee(self):
         tol = 1e-12
 
@@ -208,3 +253,414 @@ class TestOrbit(unittest.TestCase):
         print(RV_diff)
 
         self.assertTrue((np.fabs(RV_diff) < tol).all())
+
+    def test_M2E_hyperbolic(self):
+        tol = 1e-12
+
+        m = 10000
+        p = npr.rand(m, 1) * 10
+        e = 1. + npr.rand(m, 1) * 5
+        i = npr.rand(m, 1) * np.pi
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        M = (npr.rand(m, 1) - .5) * 100
+        COE_M = np.concatenate((p, e, i, W, w, M), 1)
+
+        H = orb.M2E(COE_M)[0:, 5:6]
+
+        M_diff = (e*np.sinh(H) - H - M) / (1. + np.fabs(M))
+        self.assertTrue((np.fabs(M_diff) < tol).all())
+
+    def test_M2E_parabolic(self):
+        tol = 1e-12
+
+        m = 1000
+        M = (npr.rand(m, 1) - .5) * 100
+        M[0] = 0.
+        COE_M = np.concatenate((npr.rand(m, 1), np.ones((m, 1)),
+                                np.zeros((m, 3)), M), 1)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            D = orb.M2E(COE_M)[0:, 5:6]
+
+        M_diff = (D + D**3/3. - M) / (1. + np.fabs(M))
+        self.assertTrue((np.fabs(M_diff) < tol).all())
+        self.assertEqual(D[0, 0], 0.)
+
+    def test_M2f_conics(self):
+        tol = 1e-10
+
+        m = 1000
+        e = np.concatenate((np.ones((m//2, 1)),
+                            1. + npr.rand(m - m//2, 1) * 5))
+        M = (npr.rand(m, 1) - .5) * 20
+        COE_M = np.concatenate((npr.rand(m, 1), e, np.zeros((m, 3)), M), 1)
+
+        f = orb.M2f(COE_M)[0:, 5:6]
+        self.assertTrue((np.fabs(f) < np.arccos(-1./e) + tol).all())
+
+        D = np.tan(f/2)
+        H = 2*np.arctanh(((e-1.)/(e+1.))**.5 * D)
+        M_f = np.where(e == 1., D + D**3/3., e*np.sinh(H) - H)
+        self.assertTrue((np.fabs(M_f - M) < tol*(1. + np.fabs(M))).all())
+
+    def test_M2E_warm_start(self):
+        tol = 1e-12
+
+        m = 10000
+        p = npr.rand(m, 1) * 10
+        e = npr.rand(m, 1)
+        i = npr.rand(m, 1) * np.pi
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        M = npr.rand(m, 1) * 2*np.pi
+        COE_M0 = np.concatenate((p, e, i, W, w, M), 1)
+        COE_M1 = COE_M0.copy()
+        COE_M1[0:, 5:6] += 1e-3
+
+        E0 = orb.M2E(COE_M0)[0:, 5:6]
+        COE_E1 = orb.M2E(COE_M1, E0=E0)
+
+        E_diff = COE_E1 - orb.M2E(COE_M1)
+        self.assertTrue((np.fabs(E_diff) < tol).all())
+
+    def test_M2E_max_iter(self):
+        COE_M = np.array([[1., .99, 0., 0., 0., .1]])
+
+        with self.assertWarns(RuntimeWarning):
+            orb.M2E(COE_M, max_iter=1)
+
+    def test_euler_sequence_quaternion(self):
+        tol = 1e-14
+
+        m = 1000
+        axes = [3, 1, 3]
+        args = [npr.rand(m, 1) * 2*np.pi for axis in axes]
+
+        C = orb.euler_sequence(axes, *args)
+        Q = orb.euler_sequence(axes, *args, output='quaternion')
+
+        q0 = Q[0:, 0:1, np.newaxis]
+        q = Q[0:, 1:4, np.newaxis]
+        q_cross = np.zeros((m, 3, 3))
+        q_cross[0:, 0, 1] = -Q[0:, 3]
+        q_cross[0:, 0, 2] = Q[0:, 2]
+        q_cross[0:, 1, 2] = -Q[0:, 1]
+        q_cross = q_cross - q_cross.transpose((0, 2, 1))
+        C_Q = ((q0**2 - q.transpose((0, 2, 1)) @ q) * np.eye(3) +
+               2. * q @ q.transpose((0, 2, 1)) - 2. * q0 * q_cross)
+
+        self.assertTrue((np.fabs(C - C_Q) < tol).all())
+
+    def test_euler_sequence_axes(self):
+        args = [npr.rand(10, 1) for k in range(3)]
+
+        for axes in [[1, 2, 4], [0, 1, 2], [3, -1, 3], [1, 2]]:
+            for output in ['dcm', 'quaternion']:
+                with self.assertRaises(ValueError):
+                    orb.euler_sequence(axes, *args, output=output)
+
+    def test_euler_rotate(self):
+        tol = 1e-14
+
+        m = 1000
+        axes = [1, 2, 3]
+        args = [npr.rand(m, 1) * 2*np.pi for axis in axes]
+        V = npr.rand(m, 3)
+
+        C = orb.euler_sequence(axes, *args)
+        V_rot = orb.euler_rotate(axes, V, *args)
+
+        V_diff = V_rot - (C @ V[0:, 0:, np.newaxis])[0:, 0:, 0]
+        self.assertTrue((np.fabs(V_diff) < tol).all())
+
+    def test_propagate_rv_elliptic(self):
+        tol = 1e-10
+
+        m = 1000
+        p = npr.rand(m, 1) * 10 + .5
+        e = npr.rand(m, 1) * .9
+        i = npr.rand(m, 1) * np.pi
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = npr.rand(m, 1) * 2*np.pi
+        COE = np.concatenate((p, e, i, W, w, f), 1)
+        dT = (npr.rand(m, 1) - .5) * 200
+
+        n = ((1. - e**2) / p)**1.5
+        COE_M = orb.E2M(orb.f2E(COE))
+        COE_M[0:, 5:6] += n*dT
+        RV_kepler = orb.coe2rv(orb.E2f(orb.M2E(COE_M)))
+
+        RV = orb.propagate_rv(orb.coe2rv(COE), dT)
+
+        scale = np.fabs(RV_kepler).max(axis=1, keepdims=True)
+        self.assertTrue((np.fabs(RV - RV_kepler) < tol*scale).all())
+
+    def test_propagate_rv_conics(self):
+        tol = 1e-10
+
+        m = 3000
+        p = npr.rand(m, 1) * 10 + .5
+        e = np.concatenate((npr.rand(m//3, 1), np.ones((m//3, 1)),
+                            1. + npr.rand(m//3, 1) * 2))
+        i = npr.rand(m, 1) * np.pi
+        W = npr.rand(m, 1) * 2*np.pi
+        w = npr.rand(m, 1) * 2*np.pi
+        f = (npr.rand(m, 1) - .5) * 1.8*np.arccos(-1./np.maximum(e, 1.))
+        RV0 = orb.coe2rv(np.concatenate((p, e, i, W, w, f), 1))
+        dT = (npr.rand(m, 1) - .5) * 20
+
+        RV = orb.propagate_rv(RV0, dT)
+        RV_back = orb.propagate_rv(RV, -dT)
+
+        def invariants(RV):
+            H = np.cross(RV[0:, 0:3], RV[0:, 3:6])
+            energy = (.5*np.sum(RV[0:, 3:6]**2, 1, keepdims=True) -
+                      1./np.linalg.norm(RV[0:, 0:3], axis=1, keepdims=True))
+            return np.concatenate((H, energy), 1)
+
+        scale = np.fabs(RV0).max(axis=1, keepdims=True)
+        self.assertTrue((np.fabs(RV_back - RV0) < tol*scale).all())
+        self.assertTrue((np.fabs(invariants(RV) - invariants(RV0)) <
+                         tol*scale**2).all())
+
+    def sample_coe(self, m, e_max=.9):
+        """Random COE away from the MEE and COE singularities."""
+        p = npr.rand(m, 1) * 10 + .5
+        e = npr.rand(m, 1) * (e_max - .05) + .05
+        i = npr.rand(m, 1) * (np.pi - .2) + .1
+        angles = npr.rand(m, 3) * 2*np.pi
+        return np.concatenate((p, e, i, angles), 1)
+
+    def test_coe2rv_fused(self):
+        tol = 1e-12
+
+        COE = self.sample_coe(10000)
+        RV = orb.coe2rv(COE, 2.)
+        RV_chain = orb.mee2rv(orb.coe2mee(COE), 2.)
+
+        scale = np.fabs(RV_chain).max(axis=1, keepdims=True)
+        self.assertTrue((np.fabs(RV - RV_chain) < tol*scale).all())
+
+    def test_f2M2f(self):
+        tol = 1e-10
+
+        COE = self.sample_coe(10000)
+        COE[0:, 5] = np.mod(COE[0:, 5], 2*np.pi) - np.pi
+        COE[0:10, 1] = 1.
+        COE[10:5000, 1] += 1.
+        COE[10:, 5] *= np.arccos(-1./np.maximum(COE[10:, 1], 1.)) / np.pi
+
+        COE_M = orb.f2M(COE)
+        np.testing.assert_array_equal(COE_M, orb.E2M(orb.f2E(COE)))
+
+        COE_f = orb.M2f(COE_M)
+        self.assertTrue((np.fabs(COE_f - COE) < tol).all())
+
+    def test_convert(self):
+        tol = 1e-9
+
+        COE = self.sample_coe(1000)
+        for element_set in orb.element_sets:
+            X = orb.convert(COE, 'coe', element_set, mu=2.)
+            COE_back = orb.convert(X, element_set, 'coe', mu=2.)
+
+            COE_diff = COE_back - COE
+            COE_diff[0:, 2:] = np.mod(COE_diff[0:, 2:] + pi, 2*pi) - pi
+            self.assertTrue((np.fabs(COE_diff) < tol).all())
+
+        self.assertIs(orb.convert(COE, 'coe', 'coe'), COE)
+        self.assertEqual(orb.conversion_path('coe', 'rv'), ['coe', 'rv'])
+        self.assertEqual(orb.conversion_path('coe_M', 'rv'),
+                         ['coe_M', 'coe', 'rv'])
+        with self.assertRaises(ValueError):
+            orb.convert(COE, 'coe', 'cartesian')
+
+    def test_register_conversion(self):
+        tol = 1e-12
+
+        # one name per backend, as the registry outlives the test
+        rv_km = 'rv_km_' + self.backend
+        COE = self.sample_coe(100)
+        with self.assertRaises(ValueError):
+            orb.register_conversion('rv', rv_km, lambda X, mu: X)
+        orb.register_element_set(rv_km, orb.element_sets['rv'])
+        orb.register_conversion('rv', rv_km, lambda X, mu: X * 6378.137,
+                                cost=.1)
+        orb.register_conversion(rv_km, 'rv', lambda X, mu: X / 6378.137,
+                                cost=.1)
+        RV_km = orb.convert(COE, 'coe', rv_km)
+
+        self.assertEqual(orb.conversion_path('coe', rv_km),
+                         ['coe', 'rv', rv_km])
+        self.assertTrue((np.fabs(RV_km/6378.137 - orb.coe2rv(COE)) <
+                         tol).all())
+
+    def test_convert_out(self):
+        COE = self.sample_coe(100)
+        for element_set in ['mee', 'rv', 'coe']:
+            out = np.empty(COE.shape)
+            Y = orb.convert(COE, 'coe', element_set, out=out)
+            self.assertIs(Y, out)
+            np.testing.assert_array_equal(
+                out, orb.convert(COE, 'coe', element_set))
+
+    def test_element_batch(self):
+        COE = self.sample_coe(100)
+        batch = orb.ElementBatch.from_array(COE, 'coe')
+
+        self.assertEqual(batch.shape, COE.shape)
+        np.testing.assert_array_equal(np.asarray(batch), COE)
+        np.testing.assert_array_equal(batch.e, COE[0:, 1])
+        self.assertTrue(batch.e.flags.c_contiguous)
+        self.assertTrue(np.shares_memory(batch['W'], batch.data))
+        self.assertTrue(np.shares_memory(np.asarray(batch), batch.data))
+        with self.assertRaises(AttributeError):
+            batch.L
+
+        batch['p'] = 2.
+        self.assertTrue((batch.X[0:, 0] == 2.).all())
+
+    def test_element_batch_copy(self):
+        COE = self.sample_coe(100)
+        batch = orb.ElementBatch.from_array(COE, 'coe')
+
+        self.assertTrue(np.shares_memory(batch.__array__(copy=False),
+                                         batch.data))
+        self.assertFalse(np.shares_memory(np.array(batch, copy=True),
+                                          batch.data))
+        X = batch.__array__(np.float32)
+        self.assertEqual(X.dtype, np.float32)
+        np.testing.assert_array_equal(X, COE.astype(np.float32))
+        with self.assertRaises(ValueError):
+            batch.__array__(np.float32, copy=False)
+
+    def test_element_batch_interop(self):
+        COE = self.sample_coe(100)
+        batch = orb.ElementBatch.from_array(COE, 'coe')
+
+        np.testing.assert_array_equal(orb.coe2mee(batch), orb.coe2mee(COE))
+        np.testing.assert_array_equal(orb.M2E(batch), orb.M2E(COE))
+
+    def test_element_batch_convert(self):
+        COE = self.sample_coe(100)
+        batch = orb.ElementBatch.from_array(COE, 'coe')
+
+        for element_set in ['mee', 'rv', 'coe_M']:
+            out = orb.ElementBatch.empty(100, element_set)
+            Y = batch.convert(element_set, mu=2., out=out)
+
+            self.assertIs(Y, out)
+            self.assertEqual(Y.components, orb.element_sets[element_set])
+            np.testing.assert_array_equal(
+                Y.X, orb.convert(COE, 'coe', element_set, mu=2.))
+
+        with self.assertRaises(ValueError):
+            batch.convert('rv', out=orb.ElementBatch.empty(100, 'mee'))
+
+    def test_float32_preserved(self):
+        COE = self.sample_coe(100).astype(np.float32)
+        MEE = orb.coe2mee(COE)
+        RV = orb.coe2rv(COE)
+        for func, X in [(orb.coe2mee, COE), (orb.coe2rv, COE),
+                        (orb.mee2coe, MEE), (orb.mee2rv, MEE),
+                        (orb.rv2mee, RV), (orb.rv2coe, RV),
+                        (orb.f2E, COE), (orb.E2f, COE), (orb.E2M, COE),
+                        (orb.M2E, COE), (orb.f2M, COE), (orb.M2f, COE)]:
+            self.assertEqual(func(X).dtype, np.float32, func.__name__)
+
+        for element_set in orb.element_sets:
+            X = orb.convert(COE, 'coe', element_set)
+            self.assertEqual(X.dtype, np.float32)
+        X = orb.convert(COE.astype(float), 'coe', 'rv', dtype=np.float32)
+        self.assertEqual(X.dtype, np.float32)
+
+    def test_float32_accuracy(self):
+        tol = 2e-3
+
+        COE = self.sample_coe(10000)
+        for element_set in orb.element_sets:
+            X = orb.convert(COE, 'coe', element_set)
+            X32 = orb.convert(X, element_set, 'coe', dtype=np.float32)
+
+            COE_diff = X32 - COE
+            COE_diff[0:, 0] /= COE[0:, 0]
+            COE_diff[0:, 2:] = np.mod(COE_diff[0:, 2:] + pi, 2*pi) - pi
+            self.assertTrue((np.fabs(COE_diff) < tol).all(), element_set)
+
+    def test_M2E_float32(self):
+        tol = 1e-5
+
+        COE = self.sample_coe(10000, e_max=.99)
+        COE[0:, 5] = np.mod(COE[0:, 5], 2*np.pi) - np.pi
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            COE_E = orb.M2E(COE.astype(np.float32))
+
+        self.assertEqual(COE_E.dtype, np.float32)
+        self.assertTrue((np.fabs(COE_E - orb.M2E(COE)) < tol).all())
+
+    def test_convert_npy(self):
+        COE = self.sample_coe(1000)
+        calls = []
+        with tempfile.TemporaryDirectory() as tmp:
+            src_path = os.path.join(tmp, 'coe.npy')
+            dst_path = os.path.join(tmp, 'rv.npy')
+            np.save(src_path, COE)
+
+            RV = orb.convert_npy(src_path, dst_path, 'coe', 'rv', mu=2.,
+                                 chunk_rows=128,
+                                 progress=lambda *args: calls.append(args))
+            np.testing.assert_array_equal(RV, orb.coe2rv(COE, 2.))
+            np.testing.assert_array_equal(np.load(dst_path), RV)
+            self.assertEqual(calls[0], (128, 1000))
+            self.assertEqual(calls[-1], (1000, 1000))
+            self.assertEqual(len(calls), 8)
+
+            MEE = orb.convert_npy(src_path, dst_path, 'coe', 'mee',
+                                  dtype=np.float32)
+            self.assertEqual(MEE.dtype, np.float32)
+            np.testing.assert_array_equal(
+                MEE, orb.coe2mee(COE.astype(np.float32)))
+            del RV, MEE
+
+            with self.assertRaises(ValueError):
+                orb.convert_npy(src_path, dst_path, 'coe', 'rv_2d')
+            np.save(src_path, COE[0:, 0:5])
+            with self.assertRaises(ValueError):
+                orb.convert_npy(src_path, dst_path, 'coe', 'rv')
+
+
+@unittest.skipIf(numba is None, 'numba is not installed')
+class TestOrbitNumba(TestOrbit):
+    """Test class for Orbit, with the numba backend."""
+
+    backend = 'numba'
+
+    def test_backends_agree(self):
+        tol = 1e-12
+
+        COE = self.sample_coe(1000)
+        MEE = orb.coe2mee(COE)
+        RV = orb.coe2rv(COE)
+        angles = [COE[0:, 3:4], COE[0:, 2:3], COE[0:, 4:5]]
+        calls = [lambda: orb.rv2mee(RV, 2.),
+                 lambda: orb.mee2rv(MEE, 2.),
+                 lambda: orb.euler_sequence([3, 1, 3], *angles),
+                 lambda: orb.euler_sequence([3, 1, 3], *angles,
+                                            output='quaternion')]
+        for call in calls:
+            Y = call()
+            orb.set_backend('numpy')
+            Y_numpy = call()
+            orb.set_backend('numba')
+
+            scale = np.fabs(Y_numpy).max() + 1.
+            self.assertTrue((np.fabs(Y - Y_numpy) < tol*scale).all())
+
+    def test_set_backend(self):
+        with self.assertRaises(ValueError):
+            orb.set_backend('cuda')
+        self.assertEqual(orb.get_backend(), 'numba')